@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+########################################################################
+# Copyright 2019 Bernd Breitenbach
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>
+#
+########################################################################
+
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from io import BytesIO
+
+import PIL
+from PIL import Image
+
+from engraver import Logger,EngraverData,VERSION,imageTrf,contrastBrightnessValue
+
+########################################################################
+
+MODES=['RGB','RGBA','P','L']
+
+OPTIONS={
+    'plain':{},
+    'enhance':{'contrast':contrastBrightnessValue(5),'brightness':contrastBrightnessValue(2)},
+    'transform':{'trf':[imageTrf('cw'),imageTrf('lr')]},
+    'invert':{'invert':True}
+    }
+
+def makeArgs(lim,**kw):
+    args=argparse.Namespace(size=None,trf=None,contrast=None,brightness=None,invert=False,
+                            dummy=None,stream=None,savejob=None,skipblank=None,dither='floyd',
+                            lim=lim,depth=10,power=100,checker=None,text=None,font=None)
+    for k,v in kw.items():
+        setattr(args,k,v)
+    return args
+
+def makeImage(size,mode):
+    # a deterministic test image with fine details and a transparent border
+    im=Image.effect_mandelbrot(size,(-2.,-1.2,0.8,1.2),64).convert('RGB')
+    if mode in ('RGBA','P'):
+        alpha=Image.radial_gradient('L').resize(size)
+        im.putalpha(Image.eval(alpha,lambda v: 255-v))
+        if mode=='P':
+            im=im.convert('P')
+    else:
+        im=im.convert(mode)
+    return im
+
+def stages(im,args,font):
+    # every stage is (name, setup, run); only run is timed and gets the result of setup
+    pre=EngraverData.preprocessImage(im.copy(),args)
+    tone=EngraverData._enhanceImage(pre,args)
+    small=tone.copy()
+    small.thumbnail(args.size)
+    bitmap=EngraverData._ditherImage(small,args)
+    res=[
+        ('preprocessImage',lambda: im.copy(),lambda i: EngraverData.preprocessImage(i,args)),
+        ('_enhanceImage',lambda: pre,lambda i: EngraverData._enhanceImage(i,args)),
+        ('thumbnail',lambda: tone.copy(),lambda i: i.thumbnail(args.size)),
+        ('floydsteinberg',lambda: small,lambda i: EngraverData._ditherImage(i,args)),
+        ('bayer',lambda: small,lambda i: EngraverData._ditherImage(i,makeArgs(args.lim,dither='bayer'))),
+        ('bluenoise',lambda: small,lambda i: EngraverData._ditherImage(i,makeArgs(args.lim,dither='bluenoise'))),
+        ('threshold',lambda: small,lambda i: EngraverData._ditherImage(i,makeArgs(args.lim,dither='threshold'))),
+        ('_trfImage',lambda: bitmap,lambda i: EngraverData._trfImage(i,args)),
+        ('pngPreview',lambda: bitmap,lambda i: i.save(BytesIO(),'png')),
+        ('pngFastPreview',lambda: bitmap,lambda i: i.save(BytesIO(),'png',compress_level=1)),
+        ('_imageToData',lambda: small.copy(),lambda i: EngraverData._imageToData(i,args))
+        ]
+    if pre.mode=='RGBA':
+        rgba=im.convert('RGBA')
+        res.insert(1,('_removeAlpha',lambda: rgba.copy(),lambda i: EngraverData._removeAlpha(i)))
+    return res
+
+def globalStages(args,font):
+    res=[('checkerboard',lambda: makeArgs(args.lim,checker=(15,args.lim//15),invert=args.invert),
+          lambda a: EngraverData.checkerboard(a))]
+    if font:
+        res.append(('imageFromText',lambda: makeArgs(args.lim,size=args.size,text="Hello\nworld!",font=font),
+                    lambda a: EngraverData.imageFromText(a)))
+    return res
+
+def measure(setup,run,repeat):
+    best=None
+    for i in range(repeat):
+        inp=setup()
+        start=time.perf_counter()
+        run(inp)
+        secs=time.perf_counter()-start
+        best=secs if best==None else min(best,secs)
+    inp=setup()
+    tracemalloc.start()
+    run(inp)
+    peak=tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best,peak
+
+def runStage(results,key,setup,run,repeat):
+    try:
+        secs,peak=measure(setup,run,repeat)
+        results[key]={'secs':secs,'pymem_peak':peak}
+        sys.stderr.write("%-50s %9.4f s %10d B\n"%(key,secs,peak))
+    except Exception as ex:
+        results[key]={'error':str(ex)}
+        sys.stderr.write("%-50s failed: %s\n"%(key,ex))
+
+def benchmark(opts):
+    results={}
+    bed=(opts.limit,opts.limit)
+    for option in opts.options:
+        for size in opts.sizes:
+            for mode in opts.modes:
+                im=makeImage((size,size*3//4),mode)
+                args=makeArgs(opts.limit,size=bed,**OPTIONS[option])
+                for name,setup,run in stages(im,args,opts.font):
+                    runStage(results,"%s/%s/%dx%d/%s"%(name,mode,im.width,im.height,option),setup,run,opts.repeat)
+        args=makeArgs(opts.limit,size=bed,**OPTIONS[option])
+        for name,setup,run in globalStages(args,opts.font):
+            runStage(results,"%s/%s"%(name,option),setup,run,opts.repeat)
+    return {'version':VERSION,
+            'python':platform.python_version(),
+            'pillow':PIL.__version__,
+            'machine':platform.machine(),
+            'results':results}
+
+def compare(current,baseline,tolerance,mindiff):
+    # returns the keys of all stages being slower than tolerance times the baseline;
+    # differences below mindiff seconds are considered to be noise
+    regressions=[]
+    sys.stdout.write("%-50s %10s %10s %7s\n"%("stage","baseline","current","ratio"))
+    for key,res in sorted(current['results'].items()):
+        base=baseline['results'].get(key)
+        if not base or 'secs' not in base or 'secs' not in res:
+            continue
+        ratio=res['secs']/max(base['secs'],1e-9)
+        flag=''
+        if ratio>tolerance and res['secs']-base['secs']>mindiff:
+            flag=' !'
+            regressions.append(key)
+        sys.stdout.write("%-50s %10.4f %10.4f %7.2f%s\n"%(key,base['secs'],res['secs'],ratio,flag))
+    return regressions
+
+DESCRIPTION="""
+Benchmark of the image processing pipeline of the KKMoon engraver program
+V{} (c) 2019 by Bernd Breitenbach
+This program comes with ABSOLUTELY NO WARRANTY.
+This is free software, and you are welcome to redistribute it
+under certain conditions; See COPYING for details.
+""".format(VERSION)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=DESCRIPTION,
+                                     formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument('--sizes',metavar='width',help='widths of the test images (the height is 3/4 of the width)',
+                        type=int,nargs='+',default=[500,1575,4000])
+    parser.add_argument('--modes',metavar='mode',help='image modes to test',choices=MODES,nargs='+',default=MODES)
+    parser.add_argument('--options',metavar='option',help='option sets to test',choices=list(OPTIONS.keys()),
+                        nargs='+',default=list(OPTIONS.keys()))
+    parser.add_argument('--font',metavar='font',help='the truetype/opentype font used for the text stage')
+    parser.add_argument('--limit',metavar='steps',help='maximum no. of steps in x/y direction',type=int,default=1575)
+    parser.add_argument('-r','--repeat',metavar='number',help='number of runs per stage; the fastest one is taken',type=int,default=3)
+    parser.add_argument('-o','--output',metavar='jsonfile',help='save the results to the given file')
+    parser.add_argument('-b','--baseline',metavar='jsonfile',help='compare the results with a saved baseline')
+    parser.add_argument('-t','--tolerance',metavar='ratio',help='slowdown against the baseline reported as regression',
+                        type=float,default=1.25)
+    parser.add_argument('--min-diff',metavar='secs',help='slowdowns below this time are ignored',
+                        dest='mindiff',type=float,default=0.002)
+    opts=parser.parse_args()
+
+    Logger.set(Logger(-1))
+    current=benchmark(opts)
+    if opts.output:
+        with open(opts.output,'w') as fd:
+            json.dump(current,fd,indent=1,sort_keys=True)
+    if opts.baseline:
+        with open(opts.baseline) as fd:
+            baseline=json.load(fd)
+        if compare(current,baseline,opts.tolerance,opts.mindiff):
+            sys.exit(1)
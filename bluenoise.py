@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+########################################################################
+# Copyright 2019 Bernd Breitenbach
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>
+#
+########################################################################
+
+import argparse
+import base64
+import math
+import random
+import sys
+
+from engraver import EngraverData,VERSION
+
+########################################################################
+
+def blueNoiseRanks(side,sigma=1.5,radius=4,seed=0):
+    # void-and-cluster: the pixels are ranked by repeatedly taking the tightest cluster
+    # of an evenly spread pattern (rank < ones) resp. filling its largest void (rank >= ones);
+    # set pixels carry an offset, so both are found by max() resp. min() of the same list
+    n=side*side
+    SET=1e6
+    kernel=[(dx,dy,math.exp(-(dx*dx+dy*dy)/(2*sigma*sigma)))
+            for dy in range(-radius,radius+1) for dx in range(-radius,radius+1)]
+    def toggle(energy,i,sign):
+        x,y=i%side,i//side
+        for dx,dy,w in kernel:
+            energy[(x+dx)%side+((y+dy)%side)*side]+=sign*w
+        energy[i]+=sign*SET
+    energy=[0.]*n
+    for i in random.Random(seed).sample(range(n),n//10):
+        toggle(energy,i,1)
+    while True: # spread the initial points evenly
+        i=energy.index(max(energy))
+        toggle(energy,i,-1)
+        j=energy.index(min(energy))
+        toggle(energy,j,1)
+        if i==j:
+            break
+    ranks=[0]*n
+    ones=sum(1 for e in energy if e>=SET/2)
+    work=energy[:]
+    for rank in range(ones-1,-1,-1):
+        i=work.index(max(work))
+        toggle(work,i,-1)
+        ranks[i]=rank
+    for rank in range(ones,n):
+        j=energy.index(min(energy))
+        toggle(energy,j,1)
+        ranks[j]=rank
+    return ranks
+
+def thresholds(side):
+    # the thresholds of the tile as stored in EngraverData.BLUENOISE
+    ranks=blueNoiseRanks(side)
+    return bytes(r*256//len(ranks) for r in ranks)
+
+def source(data,width=96):
+    # the BLUENOISE attribute of engraver.py
+    text=base64.b64encode(data).decode()
+    lines=['        "%s"'%text[i:i+width] for i in range(0,len(text),width)]
+    return "    BLUENOISE=(\n%s\n        )\n"%"\n".join(lines)
+
+DESCRIPTION="""
+Generator of the blue noise threshold tile of the KKMoon engraver program
+V{} (c) 2019 by Bernd Breitenbach
+This program comes with ABSOLUTELY NO WARRANTY.
+This is free software, and you are welcome to redistribute it
+under certain conditions; See COPYING for details.
+""".format(VERSION)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=DESCRIPTION,
+                                     formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+                                     epilog='''Without --check the table is printed for pasting into engraver.py''')
+    parser.add_argument('--check',help='compare the generated table with the one of engraver.py; the exit code is 1 if they differ',
+                        default=False,action='store_true')
+    args=parser.parse_args()
+
+    data=thresholds(64)
+    if args.check:
+        if base64.b64decode(EngraverData.BLUENOISE)!=data:
+            print("the blue noise table of engraver.py differs from the generated one")
+            sys.exit(1)
+        print("the blue noise table of engraver.py is up to date")
+    else:
+        sys.stdout.write(source(data))
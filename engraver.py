@@ -21,7 +21,21 @@ import sys
 import time
 import re
 import os
-from PIL import Image,ImageDraw,ImageFont,ImageEnhance
+import copy
+import contextlib
+import queue
+import threading
+import hashlib
+import json
+import struct
+import mmap
+import functools
+import math
+import base64
+import concurrent.futures
+from array import array
+from io import BytesIO
+from PIL import Image,ImageDraw,ImageFont,ImageEnhance,ImageChops
 
 VER = sys.version_info
 if VER[0]<3:
@@ -89,6 +103,77 @@ class Logger(object):
     def set(cls,logger):
         cls.LOGGER=logger
 
+class Progress(object):
+    # progress of the phases of a job (sending, engraving); updates are
+    # delivered at most once per interval, only the latest state counts
+    INTERVAL=0.5
+    PROGRESS=None
+
+    def __init__(self,interval=INTERVAL):
+        self.interval=interval
+        self.phase=None
+        self.total=0
+        self.done=0
+        self.nbytes=0
+        self.started=0.
+        self.last=0.
+        self.width=0
+
+    def start(self,phase,total):
+        self.phase=phase
+        self.total=total
+        self.done=0
+        self.nbytes=0
+        self.started=self.last=time.time()
+        self.emit(self.event())
+
+    def update(self,done,nbytes=0):
+        self.done=done
+        self.nbytes=nbytes
+        now=time.time()
+        if now-self.last>=self.interval:
+            self.last=now
+            self.emit(self.event())
+
+    def finish(self,state='completed'):
+        if state=='completed':
+            self.done=self.total
+        self.emit(self.event(state))
+
+    def event(self,state=None):
+        secs=time.time()-self.started
+        eta=None
+        if 0<self.done<self.total and state==None:
+            eta=secs*(self.total-self.done)/self.done
+        return {'phase':self.phase,
+                'state':state,
+                'done':self.done,
+                'total':self.total,
+                'percent':self.done*100//max(self.total,1),
+                'rate':self.nbytes/secs if self.nbytes and secs>0 else None,
+                'eta':eta}
+
+    def emit(self,event):
+        if not Logger.LOGGER.logging("INFO"):
+            return
+        line="%s: %3d%% done"%(event['phase'],event['percent'])
+        if event['rate']!=None:
+            line+=", %.1f kB/s"%(event['rate']/1000)
+        if event['eta']!=None:
+            line+=", %d:%02d left"%divmod(int(event['eta']),60)
+        STDOUT.write("\r"+line.ljust(self.width))
+        self.width=len(line)
+        if event['state']:
+            STDOUT.write("\n")
+            self.width=0
+        STDOUT.flush()
+
+    @classmethod
+    def set(cls,progress):
+        cls.PROGRESS=progress
+
+Progress.set(Progress())
+
 ########################################################################
 
 class Base(object):
@@ -151,38 +236,106 @@ class EngraverData(Base):
         self.setValue(self.header,self.POW_IDX,self.limit(args.power,100,0)*10)
         #self.setValue(self.header,self.EXT1_IDX,self.limit(args.ext,2048,0))
         #self.setValue(self.header,self.EXT2_IDX,self.limit(args.ext,2048,0))
-        self.rows=[]
+        # all rows are stored in wire format in one buffer; identical rows share their storage
+        self.data=bytearray()
+        self.offsets=array('I')
+        self.lengths=array('I')
+        self._shared={}
 
     def size(self):
         return self._size
-    
-    def addRow(self,data):
-        row=[0x22,0,0]+data
+
+    def parts(self):
+        return [(0,0,self)]
+
+    def rowCount(self):
+        return len(self.offsets)
+
+    def iterRows(self):
+        data=memoryview(self.data)
+        for off,length in zip(self.offsets,self.lengths):
+            yield data[off:off+length]
+
+    def _encodeRow(self,data):
+        row=bytearray([0x22,0,0])
+        row.extend(data)
         self.setValue(row,1,len(row)+1)
         cbyte=sum(row)
-        if cbyte>256:
+        if cbyte>=256:
             cbyte=(0x100-(cbyte&0xff))&0xff
         row.append(cbyte) #checkbyte
         if self.logging("DEBUG"):
-            ldata=row[:3]+[format(r,"#010b")[2:] for r in row[3:-1]]+row[-1:]
+            ldata=list(row[:3])+[format(r,"#010b")[2:] for r in row[3:-1]]+[row[-1]]
             self.debug("rowdata: %s\n",ldata)
-        self.rows.append(row)
+        return bytes(row)
+
+    def _appendRow(self,row):
+        key=hash(row)
+        off=self._shared.get(key)
+        if off==None or self.data[off:off+len(row)]!=row:
+            off=len(self.data)
+            self.data+=row
+            self._shared[key]=off
+        self.offsets.append(off)
+        self.lengths.append(len(row))
+
+    def addRow(self,data):
+        self._appendRow(self._encodeRow(data))
+
+    def _part(self,start,end):
+        # the rows start..end-1 as engraver data of their own; the row buffer is shared
+        part=copy.copy(self)
+        part.header=self.header[:]
+        part._size=(self._size[0],end-start)
+        part.setValue(part.header,self.Y_IDX,end-start)
+        part.offsets=self.offsets[start:end]
+        part.lengths=self.lengths[start:end]
+        part._shared={}
+        return part
+
+    def splitBlank(self,minrows):
+        # returns a job without the bands of at least minrows blank rows; the laser
+        # is moved over the bands instead of sweeping over them row by row
+        if not self.rowCount() or self._size[1]>self.lim:
+            return self
+        blank=self._encodeRow(bytes([0xff])*(self.lengths[0]-4))
+        off=self._shared.get(hash(blank))
+        if off==None or self.data[off:off+len(blank)]!=blank:
+            return self
+        segments=[]
+        start=0
+        i=0
+        while i<len(self.offsets):
+            if self.offsets[i]!=off:
+                i+=1
+                continue
+            j=i
+            while j<len(self.offsets) and self.offsets[j]==off:
+                j+=1
+            if j-i>=minrows:
+                if i>start:
+                    segments.append((start,i))
+                start=j
+            i=j
+        if start==0:
+            return self
+        if start<len(self.offsets):
+            segments.append((start,len(self.offsets)))
+        self.info("skipping %d blank rows\n",len(self.offsets)-sum(e-s for s,e in segments))
+        job=EngraverJob(*self._size)
+        for s,e in segments:
+            job.add(0,s,self._part(s,e))
+        return job
         
     def sendData(self,engraver):
         self.info("waiting for engraver\n")
         engraver.send(self.header,self.HEADER_ACK)
-        total=len(self.rows)
+        total=self.rowCount()
         self.info("sending data (%d rows) ...\n"%total)
-        per=0
-        ri=0
-        for row in self.rows:
-            engraver.send(row)
-            ri+=100
-            cper=ri//total
-            if per!=cper:
-                per=cper
-                self.info("\rsending: % 2d%% done",per)
-        self.info("\n")
+        progress=Progress.PROGRESS
+        progress.start('sending',total)
+        engraver.sendRows(self.iterRows(),progress.update)
+        progress.finish()
                 
         engraver.send(self.EPILOG1)
         engraver.send(self.EPILOG2,None)
@@ -199,78 +352,206 @@ class EngraverData(Base):
                 im=im.transpose(t[1])
         return im
 
+    @staticmethod
+    def _trfSize(size,args):
+        if args.trf:
+            for t in args.trf:
+                if t[1] in (Image.ROTATE_90,Image.ROTATE_270,Image.TRANSPOSE,Image.TRANSVERSE):
+                    size=(size[1],size[0])
+        return size
+
     @staticmethod
     def _removeAlpha(img):
-        for i,px in enumerate(img.getdata()):
-            width,height=img.size
-            if px[3]<255:
-                y=i/width
-                w1=(255-px[3])
-                w2=px[3]/255.
-                img.putpixel((i%width,i//width),(int(px[0]*w2)+w1,int(px[1]*w2)+w1,int(px[2]*w2)+w1,255))
+        # blend onto white: c*a/255+(255-a) for every color channel
+        a=img.getchannel('A')
+        alpha=Image.merge('RGB',(a,a,a))
+        white=ImageChops.invert(alpha)
+        rgb=ImageChops.add(ImageChops.multiply(img.convert('RGB'),alpha),white)
+        rgb.putalpha(255)
+        return rgb
 
     @staticmethod
     def _imageToData(im,args):
-        data=True
         if args.size and args.size!=im.size:
             im.thumbnail(args.size)
             Logger.LOGGER.info("image resized to width:%s height:%s\n",formatUnit(im.width),formatUnit(im.height))
         Logger.LOGGER.info("preparing image data width:%s height:%s\n",formatUnit(im.width),formatUnit(im.height))
-        im=im.convert('1',dither=Image.FLOYDSTEINBERG) # to black and white        
+        if args.stream!=None and not args.dummy and not args.savejob:
+            return StreamingEngraverData(im,args,args.stream)
+        im=EngraverData._ditherImage(im,args)
         im=EngraverData._trfImage(im,args)
-        if args.dummy:
-            if args.dummy!=".":
-                im.save(args.dummy)
-        else:
+        return EngraverData._bitmapToData(im,args)
+
+    @staticmethod
+    def _bitmapToData(im,args):
+        # im is the final black and white image
+        data=True
+        if args.dummy and args.dummy!=".":
+            im.save(args.dummy)
+        if not args.dummy or args.savejob:
             data=EngraverData(im.width,im.height,args)
-            inv=args.invert
-            bytesInRow=(im.width+7)>>3
-            for i in range(im.height):
-                row=bytesInRow*[0xff]
-                for j in range(im.width):
-                    bitno=7-(j&7)
-                    bitval=inv ^ (im.getpixel((j,i))!=0)
-                    idx=j>>3
-                    row[idx]=(row[idx]&~(1<<bitno))|(bitval<<bitno)
+            for row in EngraverData._packRows(im,args.invert):
                 data.addRow(row)
+            if args.skipblank:
+                data=data.splitBlank(args.skipblank)
         return data
 
+    INVERT_TABLE=bytes(0xff^i for i in range(256))
+
+    @staticmethod
+    def _packRows(im,inv):
+        # the packed buffer of a mode '1' image is already in wire format:
+        # MSB first, 8 pixels per byte, each row padded to a full byte
+        buf=im.tobytes()
+        if inv:
+            buf=buf.translate(EngraverData.INVERT_TABLE)
+        bytesInRow=(im.width+7)>>3
+        if im.width&7:
+            buf=bytearray(buf)
+            padding=(0x100>>(im.width&7))-1
+            for i in range(bytesInRow-1,len(buf),bytesInRow):
+                buf[i]|=padding # unused bits are always set
+        buf=memoryview(buf)
+        return [buf[i:i+bytesInRow] for i in range(0,len(buf),bytesInRow)]
+
     @staticmethod
     def _crop(img):
-        bbox=(img.width-1,img.height-1,0,0)
-        for i,px in enumerate(img.getdata()):
-            if px!=(255,255,255):
-                x=i%img.width
-                y=i//img.width
-                bbox=(min(bbox[0],x-1),min(bbox[1],y-1),max(bbox[2],x+1),max(bbox[3],y+1))
+        bbox=ImageChops.invert(img).getbbox()
+        if bbox:
+            bbox=(bbox[0]-1,bbox[1]-1,bbox[2],bbox[3]) # 1 pixel margin on the top left
+        else:
+            bbox=(img.width-1,img.height-1,0,0)
         return img.crop(bbox)
 
     @staticmethod
     def imageFrame(args):
-        im=Image.open(args.image)
-        im.load()
+        # only the header of the image is read
+        im=EngraverData.openImage(args.image,args.size)
+        size=im.size
         if args.size:
-            im.thumbnail(args.size)
-        im=EngraverData._trfImage(im,args)
-        return im.size
+            size=EngraverData._reduction(im,args.size)[1]
+            size=EngraverData._thumbnailSize(size,args.size)
+        return EngraverData._trfSize(size,args)
+
+    @staticmethod
+    def _thumbnailSize(size,maxsize):
+        # the size Image.thumbnail computes for an image of the given size
+        x,y=maxsize
+        if x>=size[0] and y>=size[1]:
+            return size
+        aspect=size[0]/size[1]
+        def roundAspect(number,key):
+            return max(min(math.floor(number),math.ceil(number),key=key),1)
+        if x/y>=aspect:
+            x=roundAspect(y*aspect,lambda n: abs(aspect-n/y))
+        else:
+            y=roundAspect(x/aspect,lambda n: 0 if n==0 else abs(aspect-x/n))
+        return (x,y)
+
+    REDUCE_MODES=('L','LA','RGB','RGBA','CMYK')
+
+    @staticmethod
+    def _reduction(im,size):
+        # factor and resulting size of Image.reduce keeping the image not smaller than size
+        factor=1
+        if size and min(size)>0 and im.mode in EngraverData.REDUCE_MODES and hasattr(im,'reduce'):
+            factor=max(min(im.width//size[0],im.height//size[1]),1)
+        return factor,(-(-im.width//factor),-(-im.height//factor))
+
+    @staticmethod
+    def openImage(fp,size=None):
+        # opens the image without decoding it; a jpeg is set up to be decoded
+        # directly at the smallest scale not below size
+        im=Image.open(fp)
+        if size and min(size)>0:
+            im.draft(None,size)
+        return im
+
+    @staticmethod
+    def loadImage(fp,size=None):
+        # decodes the image at a resolution not far above size
+        im=EngraverData.openImage(fp,size)
+        im.load()
+        factor=EngraverData._reduction(im,size)[0]
+        if factor>1:
+            im=im.reduce(factor)
+        return im
     
+    @staticmethod
+    def _patternRow(width,key,pixel,inv):
+        row=((width+7)>>3)*[0xff]
+        for j in range(width):
+            if pixel(key,j)^inv: # burn
+                row[j>>3]&=~(0x80>>(j&7))
+        return row
+
+    @staticmethod
+    def fromPattern(width,height,rowKey,pixel,args,cache=None):
+        # patterns consist of only a few distinct rows; rowKey maps a row number to
+        # its kind and pixel(key,column) tells whether the pixel is burned. Every kind
+        # of row is built and encoded only once
+        data=EngraverData(width,height,args)
+        if cache==None:
+            cache={}
+        for i in range(height):
+            key=rowKey(i)
+            row=cache.get(key)
+            if row==None:
+                row=data._encodeRow(EngraverData._patternRow(width,key,pixel,args.invert))
+                cache[key]=row
+            data._appendRow(row)
+        return data
+
     @staticmethod
     def checkerboard(args):
         size=args.checker[0]
         number=args.checker[1]
-        inv=args.invert
         tsize=size*number
-        data=EngraverData(tsize,tsize,args)
-        bytesInRow=(tsize+7)>>3
-        for i in range(tsize): #rows
-            row=bytesInRow*[0xff]
-            for j in range(tsize):
-                bitno=7-(j&7)
-                bitval=inv ^ (((i//size)+(j//size))&1)
-                idx=j>>3
-                row[idx]=(row[idx]&~(1<<bitno))|(bitval<<bitno)
-            data.addRow(row)
-        return data
+        return EngraverData.fromPattern(tsize,tsize,lambda i: (i//size)&1,
+                                        lambda key,j: ((key+j//size)&1)==0,args)
+
+    @staticmethod
+    def ladder(args):
+        # vertical lines of 1..number steps width separated by gaps of the same width
+        length=args.ladder[0]
+        number=args.ladder[1]
+        line=[]
+        for w in range(1,number+1):
+            line+=w*[True]+w*[False]
+        line=line[:-number]
+        return EngraverData.fromPattern(len(line),length,lambda i: None,
+                                        lambda key,j: line[j],args)
+
+    @staticmethod
+    def dotField(args):
+        # tiles of single dots; the dot pitch grows from 2 steps by one step per tile
+        size=args.dots[0]
+        number=args.dots[1]
+        pitches=[k+2 for k in range(number)]
+        return EngraverData.fromPattern(size*number,size,lambda i: tuple(i%p==0 for p in pitches),
+                                        lambda key,j: key[j//size] and (j%size)%pitches[j//size]==0,args)
+
+    @staticmethod
+    def powerGrid(args):
+        # number x number solid tiles; the power increases from left to right
+        # and the depth from top to bottom
+        size=args.powergrid[0]
+        number=args.powergrid[1]
+        pitch=size+size//2
+        tsize=pitch*(number-1)+size
+        if tsize>args.lim: # the laser could not be moved to the outer tiles
+            Logger.LOGGER.fatal("the power grid needs %s but the limit is %s\n",formatUnit(tsize),formatUnit(args.lim))
+        job=EngraverJob(tsize,tsize)
+        cache={}
+        for r in range(number):
+            for c in range(number):
+                targs=copy.copy(args)
+                targs.power=100*(c+1)//number
+                targs.depth=100*(r+1)//number
+                Logger.LOGGER.debug("power grid tile x:%d y:%d power:%d depth:%d\n",c,r,targs.power,targs.depth)
+                job.add(c*pitch,r*pitch,EngraverData.fromPattern(size,size,lambda i: None,
+                                                                 lambda key,j: True,targs,cache))
+        return job
 
     @staticmethod
     def _enhanceImage(im,args):
@@ -287,12 +568,155 @@ class EngraverData(Base):
         return im
     
     @staticmethod
-    def processImage(im,args):
-        im=EngraverData._enhanceImage(im,args)
-        if args.size:
-            im.thumbnail(args.size)
-        im=im.convert('1',dither=Image.FLOYDSTEINBERG) # to black and white        
-        im=EngraverData._trfImage(im,args)
+    def _resizeImage(im,size):
+        if size:
+            im=im.copy()
+            im.thumbnail(size)
+        return im
+
+    DITHERS=['floyd','bayer','bluenoise','threshold']
+    DITHER_STRIP=256 # rows compared by one task of the dither pool
+    # thresholds of a 64x64 blue noise tile (rank*256//4096) ranked by void-and-cluster;
+    # generated and checked by bluenoise.py
+    BLUENOISE=(
+        "DufQoAJ8xR/kNPx0VjuIbjLXA4cgbziOUYKzSKBc9dAU4Hnoh0MrtE2DwBWPvH3yQ+YJe6JfF4An9xrHe9dC8KxSGUK+UKNv"
+        "lEoQybUj07CRWuM+/LLTJxDPLmfLCalpwFinImSe3HbsBqVZ7zogYcmUtE0g3Zm81UBi4xKcJIMtl2/xhyv1DNWwimHxfUgR"
+        "9SirZ5YSXe2tcfwa53hCKYMD1zv0E1SUI2vkKHbSpYcTNGb1xENvA6N2sIxV+mzTX9/CILFizT9ZJdw1A5ffZMB/DchK3oGb"
+        "PVmXuDaS3bP5SY7FcK7LOLfORZe2B1D/udmCDZIr+1sz8Asuvz0Et0ULfTvqFpG2fPdtplPCH6MxTuyMIro0A77fC4RRxw1d"
+        "nhy4WiyFA/9chhDbMmfeP3Akqlnnea/MjlDF3nKn647G/KlRnXUv5geeGM7tc0PxcJrWO3f4a9J9Syr0qB9v6DN84Avs0UR3"
+        "HaDyVYDCkxGhTuA4uxhHD+Igml4WglEimTBm4ALRSGjITIg+J4+1GckEX64VnVQl7qbLYHvYRI3MVqc/lGKo5Lw1bq8a6Sp5"
+        "8b8IlmvXiqVkfj+y9DPhbteGG72JrPqWI7LaX6oK4lSJ/izE5T6yixdyORG9LviiEyj8d74YKY5MzAfYSqVa0DNjgvonU/M1"
+        "ue7UBpDOrg65VvBEKF0RO+F1D/1/zGg6q3hIj2kH8sdb3Zfrh04EeLtp0w9T9NZpE/eaOo37BLWYF8RBrsgdcAtULHNMHmQ8"
+        "egigy37Zc7tVozG/TC2e6iTXEqbPg0ouogFHsWTVq1rtQJkxg6E8soZdeMgmaINE2VPrbgSbgOXNlab9u4mi9knebDSvGe6O"
+        "BfBllBvVdQW5YPUzVx/XbL5+/igXkznbGoiy6cNuA+YwuRzpVb7gInCmK43fXEatOWYXyTdZ4hbFliH+V5lHLtJ8QuiuWvSN"
+        "Tpl9vOmUq/UaU8px5Lx8K8dQCGAgSMuVVNJFng+qOZL3Ers7yhX7JYrbSYABzyuDOF62hgvjwmSsIsgShDcVxT3TJwlDZQ87"
+        "hpwypEMM8Gub/Xbck/B8JfsKim72ehfNXIDjUnmeacMK7LFe8ZtqrdIE50XUbxyD+lKYa7rdoWga62yd1nvH4mDsCdSMW6hH"
+        "FbcoQagTWK1podwvxU3mpUIIriDzM7ZRdC+PHrdFEfh6KmimMrOSPQnXMvMBRXz6tYZSr/ssUaUmuExq+SPE4YlX0n7INbzf"
+        "PiG7YQGZZiGIyWqR1AOJ79ClQNVu5pBRnu3Hfg9a6syhYLKBVscfWTIBzTcSir0DlHfIE647fgE28Z0GZ/aIDHjpS4XyNdax"
+        "+SzoPl6qSSkRYv4IgjQfvT4WTpb+vR9LcxbiJaDnktSm5pR2TOxj30X2MoLWm2TPsm4g4EgjnVDOlROpw3IQSnVXohTAduHH"
+        "nXu7Tcmm22aLstYnZTh8rvaOR79tOBBzQ2YctNOZFXEiqFjpHU30LJRPv4Wr2XDBMP5cJkKO7b+WBduF+zUbhlQz3ySVWgv+"
+        "L2ABpNyP5QQt0WUI/4ez7ifD+VwkPa/Lh8AIlXG/EHrlCjr/WxA/pQlpsePNYx0x0UC3J02ba/GnFLFo8TzNdOO/9HNFFcZr"
+        "nDyw2k8kzVuAnwuL3nv4L0zlaDiv3ECmV8iadi3H837bjzh8A5uugV3neGTUsgHLQeeNA3y4F5ggT4IwuV2mT/GAH5N3oz8B"
+        "10o1u0+iBF/XGZ3yJ1+M+SZn4RexkWIlUcgb9lPePP8LpR6UE+lZLIFhwzXWValG2KEUz4v/Js8Mv1zsFcP1jK/nePIUa8aP"
+        "rXpIu4EGzhi2hTfUTugGu+VDn7dtIrxxykjywTaLdPi1GUz6kyrvhG61W+wGPXqTRt40tEprKl8XaSSWzkDmHzn5DdNT7Gyf"
+        "SewDpHA+hqJyFIIx0ZRNFJkugFLZqUULl96kcg9qwAX6I0CXa63kF2WZdAbPneO6QdGrWC+wdlPBZo4jmTzELnW+XYvEG/sw"
+        "V/LYYQn0f+hf3LMJZSO90Wg7J8yy4l02ynfjxSvVVLn3JqvzhToOkf1/Bt6E/Qig6i204HKrE+WSHfgu22Ot0Ay5jUmxKqQ6"
+        "xxtz+qDkexaM61uCHEeli0+eCYVLEZ81f8lTHl3ddFUuo0+6GmGT0hd+QVkD/k5j0kKoUg6TR3ebOx7nes9nA4qmRimQOlf0"
+        "SLsB2JYt7hSyLmC2/3KL6QE/2o/BJam+5h1t6z/GLUltvPSgwoEls3kI4Gy15yTwXMpqnxRAt/dS4r5ezwHGrC6dc/9Swnvb"
+        "a8zrPKQe2Fitb6IMevhGAYvJM5h2p+mL3QyPHTbQl+81xpqANsWFBNsptPtU4ZUfdzQPhPBslhxk0xU6rmUKPo0dfg3CZy+9"
+        "Gf1M4zmba9VaevkJ1hVYIq07XuVKbAtUjCBM8xJkQq+VToEGjixf2cOY6LAlR+CB90y4jiDRnfmsWNxNkvVEmXzHI2a0Fu0r"
+        "qkG0ZEu8f/5owdZ5tfig2WrjuSrTkf1tGe031MFzsQo/ZR1TeLk0wwl63mHxfU0pAfCcLc6AB+dgN5HUg1W8khHhIoruMaNE"
+        "BJkqEIcwG0CpAV18q1Ukz7x4p2Qa80uE/qzSj/gOnFqqPiikBzflxXZBum0aWLHRE6nzBC7fP27MU53DcBLixYrzVKrrYrjN"
+        "d/mZQesMnzlZC+VHmjPJniR0Aj3LZ+Mhz+yMx1i6h2PVihDap+8ocUm/VnXEjQr7gDPoBUKbWSRzOdFwQtqPVhQ21hnEcOGE"
+        "9ZMpuX/qFV3cT+ynK4JEknJQGGzhEqEjrzT+UIY/l+GJHpw67qxioxy1X3z6zYLbrg28H50FKeqDvGONTy+3SxvGYNsCbY2w"
+        "Nb2MYcEW9bgEp/8vlkX3VOWXaSbCAWTGMvvRahVOKNNJk9gjqzUXSGTrjlr7fsmlRPEmr/t/AtincjakUtBA8A55Hkbmn1ct"
+        "3D2B07R3yRZfCsytdfafElp7CLaH3bp59RO/T2uUuveeJkDXqTZQaguadQ/RnWc+i+QQ+5Ilv2Of1fuVBnXQjGjDVgpgJTqB"
+        "vEntORzaSrflo0joXjOXAmc8iO8M5F0EdsWEC20Y5LPUM+BGWinJ9iNUtkd14wiESjBsyDm0Rw7uI5rnivSn2St5jKJXgyeM"
+        "OswqkxryR83nrCpzxSeJ1TbmVrbvwpIihmG/qO6GEatu0IIbyzmo9bkSrFPhIfmoerlFG8BOBZX9Gd0Fus5v8xhidq7KbqQj"
+        "VJLcTKA+tE+oEpUlSnk7V+gAehs3ZL1Jlwfxq2OWUSZ43I8YhWeYWTThY6R132pBcbJNZ/lADZqz1gD8UA2Fw3cMtxr8f+Ae"
+        "cf9l26IH/qrFSPaS0KHqMuFdQCzeGOtmwjxe7b8u1RTFjwLvNiK20qExzZcsq1/dTn4/iTC06j32MV7OaghZvY1DwzWFy2wX"
+        "ljG3bU0FfB6Fx5x4uInKDpf9BaFDeelMcim0gcycUhFchOwde+aIMxzuxKHfWBxmr5zkiDid8THTAq4b6Vop335cDt0s/V/a"
+        "sxL8VQI3cUetL3LOHrUKn9D4WEIN9onjxAZEwFUIy7CRaygRcdKNyAB8RiLHsRWBYu6Xdki6n0HK6qWFwq2TOE1vJsDiovbU"
+        "WovkTpDzXoc9GKnEcmE6JvxopZH3b0YV5Lpc80ObLE7gGfiRUW3NRaohVtgN9YwHbyVRFT1zDcui7I5DgF8pGbYPwSpqqDDA"
+        "4mmU7R3Zkq93MNUZNqjbfVE1pX+8Cv11o1241QbpK5PWbzS1fzdhqf2+mO3PVvIpXAfUrRDGmH7aPHr5AtlVHH0MTzF6t0wU"
+        "3VG2gFvGJ5v7ANEe3mWrOM4gcDCApVj6C8DzmyPI3RlLMntlIZ6Is+F9MmX0OlDvZp9WsIRCyJr8td+h0ADvoByQ7QDkiRBl"
+        "wXSQVzyGGeyLSpvyQcIcdT6GE0jqVHO3iMwAqtlGEWo9mL0heM+nBS/mINEY7XQtYTyJIV5ChWLKQShwRq3xTDraK6/pxFC5"
+        "BN+xDmbjj7fgXrBsjwSgLORh8DmC9r7WG/9T3ZETb7iLwkqYXpAQr9QHxm/4vS+ubPqfvdIwd6G4F+9sCJcpaHszW8qEKUoA"
+        "nC3M4jnD90YUnU+1DHEuUKNxAKw36Er7PRRy9De74kSD8k2pEpDpCk6EDlqQHd4Gh2GcSX/X/KTQ8I4Y/qTZbvJQFqQkgWOz"
+        "etogkcpZqYPrQ8mEX8EknH3erMkbcFWjJmeYLNlGd9Myxec79mtRyPwtu84hO1sRRSKqUjtixB66iXH/WNMKlTS+Zv4q5hrS"
+        "DZUr9RakaNhSAmIuidUF7sIT5Hm5WyOisxxzqRO6mT55VxH0krR4wZxnxuJ9DJZHNN0HkkC4507zDohCeJq4Omm94k160Aw0"
+        "iu2iSP+cPHuQSaw4D/+L41WVRNt8MewhsNiGRmUA3zHpggAws9b3g6hhyq8dfS1yzVes2AZjS/l9IFyxPI/4sMobvn4PtFvO"
+        "KvZi16DEaQDwy2UJx4xgzweeNOWmxVCNGkv0kW4kVhTrJ0rwZtipEpwl7zajzooQ2aiIAtwoVXVFZirobDLmF3G3AIFPH0F/"
+        "MyCf81IYp0Nt7l0Zeyb8bKu+XtJEqstwwH6eDow7+ki9fmnBHesqnlMzzO9pvqYO8ZvXVJjIg6VB0pgw8pHauVvfhj244nb8"
+        "vyWVs80+nwrWNyGhCeoymQY+1ljAGpVc6AJAkFt5QsT0cxxDmBZ/4DCCArofSwf6VyHjX8pxDad5BbFwKJY1DYhR1AVp54dZ"
+        "7XaL/WqFTd5e/7Iq7XTOL4jXqvIP2rFiB5S4W8b8OWHArUBz69Nov5N7sRJDoCn+OdVL+BHPVtm1Onj4SxjAKEezEMYtrha6"
+        "kB5uh0SmDbhrGFPHN5sihOU82YUoUZPUHFb/kKgtiTkN6jRtveBPjrYflGO7gaNpHuGnL5OrbtCWYOJCWdTvdDbRoQDbYOVN"
+        "96ImcYr6R7waqmoP6q8FcKDcDDZeEfGwyk+a+YcbZMlt6aoy20UA941cE8ZX2jgE9x+neJ4ijAlX8knGMY0hmDiAvuQLYNJ1"
+        "Vvgxo3fKRO4rgcRvt9hGdmIk0wM+rO4PQYJVF3TqLL4/nu6ADPN3toM8wQf5ZkXLrH8WaPqwcskD2Fg/si2iAsOHS99cHYq0"
+        "Y0ma6CJ/nxXhqn1Zw3Qumv0G4MiQsFp7zyRts0SQJVLlZdqKNbLelivmuphUDkTqYqgakO992j3oH7YKlP031w/3GD/MU/ov"
+        "kUHrIZXcUM6jW7UoSxSZ8AhS3TDRY8KkFponVeoOeRlgP3Qmw9x9tSv8b81QHWqRXZ1y0CysUnTBhq5ojQWtbcsKu2r1CYkh"
+        "dDaKZ/nYOGO2hKYWmugI/Um7dcykTsL2ptoA74g3Ho5MnDgJwKn+EM0x9UZn3QKgJ1jVL/DBPeZWiKFLMrBgwQ=="
+        )
+
+    @staticmethod
+    def _ditherImage(im,args):
+        if args.dither in (None,'floyd'): # error diffusion is sequential by nature
+            return im.convert('1',dither=Image.FLOYDSTEINBERG) # to black and white
+        return EngraverData._thresholdImage(im.convert('L'),args.dither)
+
+    @staticmethod
+    def _bayerRanks(side):
+        ranks=[0]
+        n=1
+        while n<side:
+            ranks=[4*ranks[(y%n)*n+x%n]+(0,2,3,1)[(y//n)*2+x//n] for y in range(2*n) for x in range(2*n)]
+            n*=2
+        return ranks
+
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def _thresholdTile(method):
+        # a pixel becomes white if its gray value is above the threshold
+        if method=='threshold':
+            return Image.new('L',(1,1),127)
+        if method=='bluenoise':
+            return Image.frombytes('L',(64,64),base64.b64decode(EngraverData.BLUENOISE))
+        ranks=EngraverData._bayerRanks(8)
+        tile=Image.new('L',(8,8))
+        tile.putdata([r*256//len(ranks) for r in ranks])
+        return tile
+
+    @staticmethod
+    @functools.lru_cache(maxsize=8)
+    def _thresholdMap(method,width,height):
+        # the tile repeated over the image
+        res=EngraverData._thresholdTile(method)
+        while res.width<width or res.height<height: # doubling needs only a few pastes
+            w=res.width*2 if res.width<width else res.width
+            h=res.height*2 if res.height<height else res.height
+            larger=Image.new('L',(w,h))
+            for y in range(0,h,res.height):
+                for x in range(0,w,res.width):
+                    larger.paste(res,(x,y))
+            res=larger
+        return res.crop((0,0,width,height))
+
+    @staticmethod
+    @functools.lru_cache(maxsize=1)
+    def _ditherPool():
+        return concurrent.futures.ThreadPoolExecutor(os.cpu_count())
+
+    WHITE=[0]+[255]*255
+
+    @staticmethod
+    def _thresholdImage(im,method):
+        # the strips are independent of each other; point() runs without the GIL
+        # (ImageChops does not), so they are mapped over a pool on several cores
+        tile=EngraverData._thresholdTile(method)
+        step=max(EngraverData.DITHER_STRIP//tile.height,1)*tile.height
+        thresholds=EngraverData._thresholdMap(method,im.width,min(step,im.height))
+        def strip(y):
+            part=im.crop((0,y,im.width,min(y+step,im.height)))
+            th=thresholds if part.height==thresholds.height else thresholds.crop((0,0,part.width,part.height))
+            return ImageChops.subtract(part,th).point(EngraverData.WHITE,'1')
+        starts=range(0,im.height,step)
+        if len(starts)>1 and (os.cpu_count() or 1)>1:
+            parts=EngraverData._ditherPool().map(strip,starts)
+        else:
+            parts=map(strip,starts)
+        res=Image.new('1',im.size)
+        for y,part in zip(starts,parts):
+            res.paste(part,(0,y))
+        return res
+
+    @staticmethod
+    def processImage(im,args,stage=lambda name,func: func()):
+        # resizing first makes the tone stage cheaper and independent of it;
+        # stage(name,func) returns the result of func, the GUI takes it from a cache
+        im=stage('resize',lambda im=im: EngraverData._resizeImage(im,args.size))
+        im=stage('tone',lambda im=im: EngraverData._enhanceImage(im,args))
+        im=stage('dither',lambda im=im: EngraverData._ditherImage(im,args))
+        im=stage('transform',lambda im=im: EngraverData._trfImage(im,args))
         return im
 
     @staticmethod
@@ -300,47 +724,81 @@ class EngraverData(Base):
         if im.mode=='P': # convert file with color palette (e.g. gif with transparency)
             im=im.convert('RGBA')
         if im.mode=='RGBA': # replace transparent pixels with white
-            EngraverData._removeAlpha(im)
+            im=EngraverData._removeAlpha(im)
         return im
 
     @staticmethod
     def fromImage(args):
-        im=Image.open(args.image)
-        im.load()
-        im=EngraverData.preprocessImage(im,args)
-        return EngraverData._imageToData(im,args)
+        def build():
+            im=EngraverData.loadImage(args.image,args.size)
+            im=EngraverData.preprocessImage(im,args)
+            return EngraverData._imageToData(im,args)
+        return EngraverData.cached(fileDigest(args.image),args,build)
+
+    @staticmethod
+    def cached(digest,args,build):
+        # take the encoded job from the job cache or build and store it
+        cache=JobCache.fromArgs(args)
+        if cache==None or args.dummy or args.stream!=None:
+            return build()
+        key=cache.key(digest,args)
+        data=cache.load(key,args)
+        if data==None:
+            data=build()
+            if data:
+                cache.store(key,data)
+        else:
+            Logger.LOGGER.info("using cached job %s\n",key)
+        return data
 
     @staticmethod
-    def _textSize(font,text):
-        w,h=(0,0)
-        for l in text.split('\n'):
-            sz=font.getsize(l)
-            h+=sz[1]*1.2
-            w=max(w,sz[0])
-        return (w,h)
+    @functools.lru_cache(maxsize=8)
+    def _fontData(fname,stamp):
+        with open(fname,'rb') as fd:
+            return fd.read()
+
+    @staticmethod
+    @functools.lru_cache(maxsize=64)
+    def _font(fname,stamp,size):
+        # the font file is read only once per modification; parsed fonts are kept per size
+        return ImageFont.truetype(BytesIO(EngraverData._fontData(fname,stamp)),size)
+
+    @staticmethod
+    def _fontStamp(fname):
+        st=os.stat(fname)
+        return (st.st_mtime_ns,st.st_size)
+
+    DRAW=ImageDraw.Draw(Image.new('1',(1,1)))
+
+    @staticmethod
+    def _textBBox(font,text):
+        if hasattr(EngraverData.DRAW,'multiline_textbbox'):
+            return EngraverData.DRAW.multiline_textbbox((0,0),text,font=font)
+        w,h=EngraverData.DRAW.multiline_textsize(text,font=font) # Pillow<8
+        return (0,0,w,h)
 
     @staticmethod
     def imageFromText(args):
         size=tuple(max(s,args.lim) if s==0 else s for s in args.size or (args.lim,args.lim))
-        mside=max(size)
-        maxw=min(mside*2,3072)
-        maxh=min(mside*2,3072)
-        im=Image.new("RGB",(maxw,maxh),(255,255,255))
-        fsz=12
-        text=" %s "%args.text
-        while True:
-            nfsz=(fsz*12)//10
-            font=ImageFont.truetype(args.font,nfsz)
-            sz=EngraverData._textSize(font,text)
-            if sz[0]>maxw or sz[1]>maxh:
-                font=ImageFont.truetype(args.font,fsz)
-                Logger.LOGGER.info("using font:%s\n",font.getname())
-                sz=EngraverData._textSize(font,text)
-                pos=((maxw-sz[0])//2,(maxh-sz[1])//2)
-                break
-            fsz=nfsz
+        stamp=EngraverData._fontStamp(args.font)
+        def fits(fsz):
+            bbox=EngraverData._textBBox(EngraverData._font(args.font,stamp,fsz),args.text)
+            return bbox[2]-bbox[0]<=size[0] and bbox[3]-bbox[1]<=size[1]
+        # bisection for the largest font size fitting into the given size
+        low,high=(1,2*max(size)+1)
+        while high-low>1:
+            fsz=(low+high)//2
+            if fits(fsz):
+                low=fsz
+            else:
+                high=fsz
+        font=EngraverData._font(args.font,stamp,low)
+        Logger.LOGGER.info("using font:%s\n",font.getname())
+        bbox=EngraverData._textBBox(font,args.text)
+        margin=low//2+1 # room for glyphs exceeding their bounding box
+        im=Image.new("RGB",(bbox[2]-bbox[0]+2*margin,bbox[3]-bbox[1]+2*margin),(255,255,255))
         draw=ImageDraw.Draw(im)
-        draw.text(pos,text,(0,0,0),font)
+        draw.text((margin-bbox[0],margin-bbox[1]),args.text,(0,0,0),font)
         im=EngraverData._crop(im)
         im.thumbnail(size)
         Logger.LOGGER.info("text image resized to width:%s height:%s\n",formatUnit(im.width),formatUnit(im.height))
@@ -349,9 +807,269 @@ class EngraverData(Base):
                 
     @staticmethod
     def fromText(args):
-        return EngraverData._imageToData(imageFromText(args),args)
+        digest=hashlib.sha256(bytes(args.text,'utf-8'))
+        digest.update(bytes.fromhex(fileDigest(args.font)))
+        return EngraverData.cached(digest.hexdigest(),args,
+                                   lambda: EngraverData._imageToData(EngraverData.imageFromText(args),args))
     
 
+
+class StreamingEngraverData(EngraverData):
+    # the image is dithered when the first row is requested and the rows are packed
+    # and encoded not before they are sent; the header only needs the size of the
+    # final image. With ahead>0 a producer thread prepares up to ahead rows in
+    # advance while the rows are transmitted
+    BAND=64
+
+    def __init__(self,im,args,ahead=0):
+        sizex,sizey=EngraverData._trfSize(im.size,args)
+        EngraverData.__init__(self,sizex,sizey,args)
+        self.image=im
+        self.args=args
+        self.ahead=ahead
+
+    def rowCount(self):
+        return self._size[1]
+
+    def _produceRows(self):
+        im=EngraverData._ditherImage(self.image,self.args)
+        im=EngraverData._trfImage(im,self.args)
+        for y in range(0,im.height,self.BAND):
+            band=im.crop((0,y,im.width,min(y+self.BAND,im.height)))
+            for row in EngraverData._packRows(band,self.args.invert):
+                yield self._encodeRow(row)
+
+    def _producer(self,rows,stop):
+        # gives up as soon as the consumer stopped reading the rows
+        def put(item):
+            while not stop.is_set():
+                try:
+                    rows.put(item,timeout=0.5)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+        try:
+            for row in self._produceRows():
+                if not put(row):
+                    return
+            put(None)
+        except Exception as ex:
+            put(ex)
+
+    def iterRows(self):
+        if self.ahead<=0:
+            yield from self._produceRows()
+            return
+        rows=queue.Queue(self.ahead)
+        stop=threading.Event()
+        producer=threading.Thread(target=self._producer,args=(rows,stop))
+        producer.daemon=True
+        producer.start()
+        try:
+            while True:
+                row=rows.get()
+                if row==None:
+                    break
+                if isinstance(row,Exception):
+                    raise row
+                yield row
+        finally:
+            stop.set()
+            with contextlib.suppress(queue.Empty):
+                while True:
+                    rows.get_nowait()
+
+
+class EngraverJob(object):
+    # several engraver data blocks burned one after another; the laser is moved
+    # to the top left position of a part (relative to the job) before burning it
+    def __init__(self,sizex,sizey):
+        self._size=(sizex,sizey)
+        self._parts=[]
+
+    def size(self):
+        return self._size
+
+    def add(self,x,y,data):
+        self._parts.append((x,y,data))
+
+    def parts(self):
+        return self._parts
+
+
+
+class JobFile(object):
+    # binary file of fully encoded jobs:
+    #   magic, length of the metadata (32 bit), metadata (JSON), padding to 8 bytes, body
+    # the body holds for every part the row offsets and lengths (32 bit each) and the
+    # row buffer; parts sharing a row buffer (see EngraverData.splitBlank) refer to
+    # the same copy. The metadata describes the parts and holds the sha256 of the body
+    MAGIC=b'KKJOB\x00\x00\x01'
+    ALIGN=8
+
+    @staticmethod
+    def _pad(length):
+        return -length%JobFile.ALIGN
+
+    @staticmethod
+    def write(fd,job,meta=None):
+        body=bytearray()
+        parts=[]
+        buffers={}
+        for x,y,data in job.parts():
+            offsets=array('I',data.offsets)
+            lengths=array('I',data.lengths)
+            if sys.byteorder!='little':
+                offsets.byteswap()
+                lengths.byteswap()
+            part={'x':x,'y':y,'size':data.size(),'header':list(data.header),'rows':data.rowCount(),'index':len(body)}
+            body+=offsets.tobytes()
+            body+=lengths.tobytes()
+            shared=buffers.get(id(data.data))
+            if shared==None:
+                shared=buffers[id(data.data)]=(len(body),len(data.data))
+                body+=data.data
+                body+=bytes(JobFile._pad(len(body)))
+            part['data'],part['datalen']=shared
+            parts.append(part)
+        meta=dict(meta or {},size=job.size(),parts=parts,digest=hashlib.sha256(body).hexdigest(),
+                  epilog=[EngraverData.EPILOG1,EngraverData.EPILOG2])
+        meta=bytes(json.dumps(meta),'utf-8')
+        fd.write(JobFile.MAGIC)
+        fd.write(struct.pack('<I',len(meta)))
+        fd.write(meta)
+        fd.write(bytes(JobFile._pad(len(JobFile.MAGIC)+4+len(meta))))
+        fd.write(body)
+
+    @staticmethod
+    def read(buf,args,verify=True):
+        # returns the job and its metadata; the rows refer to buf without copying it
+        buf=memoryview(buf)
+        if buf[:len(JobFile.MAGIC)]!=JobFile.MAGIC:
+            raise ValueError("not a job file")
+        start=len(JobFile.MAGIC)+4
+        length=struct.unpack_from('<I',buf,len(JobFile.MAGIC))[0]
+        meta=json.loads(str(buf[start:start+length],'utf-8'))
+        body=buf[start+length+JobFile._pad(start+length):]
+        if verify and hashlib.sha256(body).hexdigest()!=meta['digest']:
+            raise ValueError("job file is corrupted")
+        parts=[]
+        for part in meta['parts']:
+            data=EngraverData(part['size'][0],part['size'][1],args)
+            data.header=part['header']
+            rows=part['rows']
+            index=part['index']
+            # a cheap structural check against truncated files if the digest is not verified
+            if len(body)<index+8*rows or len(body)<part['data']+part['datalen']:
+                raise ValueError("job file is truncated")
+            if sys.byteorder=='little':
+                data.offsets=body[index:index+4*rows].cast('I')
+                data.lengths=body[index+4*rows:index+8*rows].cast('I')
+            else:
+                data.offsets=array('I')
+                data.offsets.frombytes(body[index:index+4*rows])
+                data.offsets.byteswap()
+                data.lengths=array('I')
+                data.lengths.frombytes(body[index+4*rows:index+8*rows])
+                data.lengths.byteswap()
+            if rows and data.offsets[-1]+data.lengths[-1]>part['datalen']:
+                raise ValueError("job file is corrupted")
+            data.data=body[part['data']:part['data']+part['datalen']]
+            data.EPILOG1,data.EPILOG2=meta['epilog']
+            parts.append((part['x'],part['y'],data))
+        if len(parts)==1 and parts[0][:2]==(0,0):
+            return parts[0][2],meta
+        job=EngraverJob(*meta['size'])
+        for part in parts:
+            job.add(*part)
+        return job,meta
+
+    @staticmethod
+    def save(fname,job,meta=None):
+        with open(fname,'wb') as fd:
+            JobFile.write(fd,job,meta)
+
+    @staticmethod
+    def open(fname,args):
+        # the file is memory mapped; rows are read from the map while they are sent
+        with open(fname,'rb') as fd:
+            buf=mmap.mmap(fd.fileno(),0,access=mmap.ACCESS_READ)
+        return JobFile.read(buf,args,verify=False)
+
+
+class JobCache(object):
+    # directory of job files keyed by the digest of the source (image/text) and
+    # every parameter changing the encoded job; the least recently used files
+    # are removed when the cache grows beyond maxsize bytes
+    PARAMS=['size','trf','contrast','brightness','invert','power','depth','lim','skipblank','dither']
+    SUFFIX='.job'
+    PIPELINE=2 # increase whenever the same parameters give another encoded job
+
+    def __init__(self,directory,maxsize):
+        self.directory=directory
+        self.maxsize=maxsize
+
+    @staticmethod
+    def fromArgs(args):
+        if not args.cachedir:
+            return None
+        return JobCache(os.path.expanduser(args.cachedir),args.cachesize*1024*1024)
+
+    def key(self,digest,args):
+        params={p:getattr(args,p,None) for p in self.PARAMS}
+        if params['trf']:
+            params['trf']=[t[0] for t in params['trf']]
+        params['version']=(VERSION,self.PIPELINE)
+        return hashlib.sha256(bytes(digest+json.dumps(params,sort_keys=True),'utf-8')).hexdigest()
+
+    def _path(self,key):
+        return os.path.join(self.directory,key+self.SUFFIX)
+
+    def load(self,key,args):
+        path=self._path(key)
+        try:
+            with open(path,'rb') as fd:
+                buf=fd.read()
+        except OSError:
+            return None
+        try:
+            data,meta=JobFile.read(buf,args)
+            os.utime(path)
+            return data
+        except Exception as ex:
+            Logger.LOGGER.warn("removing cached job %s: %s\n",key,ex)
+            os.remove(path)
+            return None
+
+    def store(self,key,data):
+        try:
+            os.makedirs(self.directory,exist_ok=True)
+            path=self._path(key)
+            tmp="%s.%d"%(path,os.getpid())
+            with open(tmp,'wb') as fd:
+                JobFile.write(fd,data)
+            os.replace(tmp,path)
+            self.evict()
+        except OSError as ex:
+            Logger.LOGGER.warn("cannot store job in cache: %s\n",ex)
+
+    def evict(self):
+        files=[]
+        for f in os.listdir(self.directory):
+            if f.endswith(self.SUFFIX):
+                st=os.stat(os.path.join(self.directory,f))
+                files.append((st.st_mtime,st.st_size,f))
+        files.sort()
+        total=sum(f[1] for f in files)
+        for mtime,size,f in files:
+            if total<=self.maxsize:
+                break
+            Logger.LOGGER.debug("removing cached job %s\n",f)
+            os.remove(os.path.join(self.directory,f))
+            total-=size
+
+
 ########################################################################
 
 class Engraver(Base):
@@ -386,6 +1104,7 @@ class Engraver(Base):
         self.connected=False
         self.firmware="unknown"
         self.fanOn=True
+        self.batched=None
         
     def open(self):
         self.debug("opening device %s\n",self.device)
@@ -415,12 +1134,21 @@ class Engraver(Base):
         if not self.connected:
             self.fatal("connection failed! Could not detect engraver!")
         
-    def send(self,data,exp=Base.ACK):
+    def _readStale(self):
         if self.ser.in_waiting>0:
             stale=self.ser.read(self.ser.in_waiting)
             self.warn("read stale bytes from device: %s\n",stale)
+
+    def send(self,data,exp=Base.ACK,done=None):
+        # done is called after the command was acknowledged
+        if self.batched!=None:
+            self.batched.append((data,exp,done))
+            return
+        self._readStale()
         self.debug("sending:%s\n",data)
-        self.ser.write(bytes(data))
+        if not isinstance(data,(bytes,bytearray,memoryview)):
+            data=bytes(data)
+        self.ser.write(data)
         if exp!=None:
             ack=self.ser.read(len(exp))
             if ack==exp:
@@ -429,6 +1157,50 @@ class Engraver(Base):
                 self.fatal("didn't got acknowledge; got:%s\n",ack)
         else:
             self.debug("no acknowledge expected!\n")
+        if done:
+            done()
+
+    @contextlib.contextmanager
+    def batch(self):
+        # commands sent within the block are written at once at its end; the
+        # acknowledges are read one after another, each with its own timeout
+        self.batched=[]
+        try:
+            yield self
+        finally:
+            cmds,self.batched=(self.batched,None)
+        if cmds:
+            self._readStale()
+            self.debug("sending batch:%s\n",[d for d,e,f in cmds])
+            self.ser.write(b''.join(bytes(d) for d,e,f in cmds))
+            for data,exp,done in cmds:
+                if exp!=None:
+                    ack=self.ser.read(len(exp))
+                    if ack!=exp:
+                        self.fatal("didn't got acknowledge for %s; got:%s\n",data,ack)
+                if done:
+                    done()
+            self.debug("got acknowledges\n")
+
+    def sendRows(self,rows,progress=None):
+        # fast path for the image rows: they are already encoded and each of
+        # them is acknowledged by a single ACK byte
+        self._readStale()
+        write=self.ser.write
+        read=self.ser.read
+        ack=self.ACK
+        count=0
+        nbytes=0
+        for row in rows:
+            write(row)
+            resp=read(1)
+            if resp!=ack:
+                self.fatal("didn't got acknowledge for row %d; got:%s\n",count,resp)
+            count+=1
+            nbytes+=len(row)
+            if progress: # it limits the rate of its updates itself
+                progress(count,nbytes)
+        return count
 
     def fan(self,on):
         if on!=None:
@@ -473,9 +1245,10 @@ class Engraver(Base):
         data=self.MOVE_XY[:]
         self.setValue(data,self.X_IDX,dx)
         self.setValue(data,self.Y_IDX,dy)
-        self.send(data)
-        self.debug("move finished\n")
-        self.info("laser moved x:%s y:%s\n",formatUnit(dx),formatUnit(dy))
+        def done():
+            self.debug("move finished\n")
+            self.info("laser moved x:%s y:%s\n",formatUnit(dx),formatUnit(dy))
+        self.send(data,done=done)
         
     def calcFrame(self,fx,fy,useCenter,centerAxis):
         if useCenter:
@@ -496,20 +1269,22 @@ class Engraver(Base):
     
     def frameStart(self,fx,fy,useCenter,centerAxis):
         m=self.calcFrame(fx,fy,useCenter,centerAxis)
-        self.move(m[2],m[3])
-        self.info("showing frame x:%s y:%s\n",formatUnit(m[0]),formatUnit(m[1]))
-        data=self.FRAME_XY[:]
-        self.setValue(data,self.FX_IDX,m[0])
-        self.setValue(data,self.FY_IDX,m[1])
-        #self.setValue(data,self.MX_IDX,mx) # don't work with negative values
-        #self.setValue(data,self.MY_IDX,my)
-        self.send(data)
+        with self.batch():
+            self.move(m[2],m[3])
+            self.info("showing frame x:%s y:%s\n",formatUnit(m[0]),formatUnit(m[1]))
+            data=self.FRAME_XY[:]
+            self.setValue(data,self.FX_IDX,m[0])
+            self.setValue(data,self.FY_IDX,m[1])
+            #self.setValue(data,self.MX_IDX,mx) # don't work with negative values
+            #self.setValue(data,self.MY_IDX,my)
+            self.send(data)
 
     def frameStop(self,fx,fy,useCenter,centerAxis):
         self.debug("stop showing frame\n")
-        self.send(self.FRAME_STOP)
-        m=self.calcFrame(fx,fy,useCenter,centerAxis)
-        self.move(-m[2],-m[3])
+        with self.batch():
+            self.send(self.FRAME_STOP)
+            m=self.calcFrame(fx,fy,useCenter,centerAxis)
+            self.move(-m[2],-m[3])
 
     def frame(self,fx,fy,useCenter,centerAxis):
         try:
@@ -520,42 +1295,52 @@ class Engraver(Base):
         finally:
             engraver.frameStop(fx,fy,useCenter,centerAxis)
     
+    def _burnData(self,data):
+        data.sendData(self)
+        state="completed"
+        self.info("engraving...\n")
+        if self.logging("DEBUG"):
+            start=time.time()
+        progress=Progress.PROGRESS
+        progress.start('engraving',100)
+        while True:
+            try:
+                resp=self.ser.read(4)
+                if resp==self.COMPLETED:
+                    break
+                progress.update(resp[3])
+            except KeyboardInterrupt:
+                self.pause()
+                time.sleep(5)
+                if UI.ASK("Paused! Do you want to cancel the process?"):
+                    self.stop()
+                    state="canceled"
+                    break
+                self.cont()
+        progress.finish(state)
+        if self.logging("DEBUG"):
+            self.debug("engraving time: %.1f secs\n",time.time()-start)
+        self.info("%s!\n",state)
+        return state=="completed"
+
     def burn(self,data,useCenter):
+        ox,oy=(0,0)
+        if useCenter:
+            dx,dy=data.size()
+            ox,oy=(-dx//2,-dy//2)
+        x,y=(0,0)
         try:
-            if useCenter:
-                dx,dy=data.size()
-                self.move(-dx//2,-dy//2)
-            data.sendData(self)
-            msg="\rcompleted!\n"
-            self.info("engraving...\n")
-            if self.logging("DEBUG"):
-                start=time.time()
-            perc=None
-            while True:
-                try:
-                    resp=self.ser.read(4)
-                    if resp==self.COMPLETED:
-                        self.info("\r100%% done")
-                        break
-                    if perc!=resp[3]:
-                        perc=resp[3]
-                        self.info("\r% 2d%% done",perc)
-                except KeyboardInterrupt:
-                    self.pause()
-                    time.sleep(5)
-                    if UI.ASK("Paused! Do you want to cancel the process?"):
-                        self.stop()
-                        msg="\rcanceled!\n"
-                        break
-                    self.cont()
-            if self.logging("DEBUG"):
-                self.debug("engraving time: %.1f secs\n",time.time()-start)
-            self.info(msg)
+            for px,py,part in data.parts():
+                if (ox+px,oy+py)!=(x,y):
+                    self.move(ox+px-x,oy+py-y)
+                    x,y=(ox+px,oy+py)
+                if not self._burnData(part):
+                    break
         except KeyboardInterrupt:
             self.stop()
         finally:
-            if useCenter:
-                self.move(dx//2,dy//2)
+            if (x,y)!=(0,0):
+                self.move(-x,-y)
 
 
 
@@ -574,6 +1359,13 @@ def unitValue(para):
         return int(float(m.group(1))*STEPS_PER_MM)
     return int(para or '0')
 
+def fileDigest(fname):
+    digest=hashlib.sha256()
+    with open(fname,'rb') as fd:
+        for chunk in iter(lambda: fd.read(1<<20),b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
 def formatUnit(val):
     return "%dpx (%.1fmm)"%(val,val/STEPS_PER_MM)
 
@@ -599,6 +1391,7 @@ def contrastBrightnessValue(para):
 
     
 VERSION="0.10"    
+CACHEDIR=os.path.join(os.environ.get('XDG_CACHE_HOME','~/.cache'),'kkengraver')
     
 
 DESCRIPTION="""
@@ -628,10 +1421,16 @@ if __name__ == '__main__':
     
     parser.add_argument('-H','--home',help='move the laser to pos 0/0',dest='home',default=False,action='store_true')
     parser.add_argument('-C','--center-reference',help='use the current laser postion as reference point for the center of the image or text to engrave; usually it will be the top-left of the image',dest='centerref',default=False,action='store_true')
-    parser.add_argument('-D','--depth',metavar="depth",help='set the burn depth of the laser (0-100)',dest='depth',default=10,type=int)
-    parser.add_argument('-P','--power',metavar="power",help='set the laser power (0-100)',dest='power',default=100,type=int)
+    parser.add_argument('-D','--depth',metavar="depth",help='set the burn depth of the laser (0-100); 10 if not given',dest='depth',default=None,type=int)
+    parser.add_argument('-P','--power',metavar="power",help='set the laser power (0-100); 100 if not given',dest='power',default=None,type=int)
     parser.add_argument('--checkerboard',help='engrave a quadratic checkerboard pattern of given tile size and number',
                         metavar=('tile_size','number'),type=unitValue,dest='checker',nargs=2,default=None)
+    parser.add_argument('--ladder',help='engrave vertical lines of 1..number steps width (separated by gaps of the same width) for calibrating the line width',
+                        metavar=('length','number'),type=unitValue,dest='ladder',nargs=2,default=None)
+    parser.add_argument('--dot-field',help='engrave number tiles of single dots with a dot pitch growing from 2 steps by one step per tile',
+                        metavar=('tile_size','number'),type=unitValue,dest='dots',nargs=2,default=None)
+    parser.add_argument('--power-grid',help='engrave a grid of number x number solid tiles with increasing power (left to right) and depth (top to bottom)',
+                        metavar=('tile_size','number'),type=unitValue,dest='powergrid',nargs=2,default=None)
     parser.add_argument('-i','--image',metavar='imagefile', help='the image file to engrave')
     parser.add_argument('--contrast',metavar='number', help='adjust the contrast of the image (-10..10)',
                         type=contrastBrightnessValue,default=None)
@@ -645,24 +1444,44 @@ if __name__ == '__main__':
                                                     turn - rotate 180 degrees ; tb - flip top-bottom ; lr - flip left-right ''',type=imageTrf,dest='trf',nargs='+')
     parser.add_argument('-S','--maxsize',help='scale the image down to match maximal width and height; the aspect ratio is kept',
                         metavar='w:h',dest='size',type=valuePair,default=None)    
+    parser.add_argument('--dither', help='''the algorithm converting the image to black and white:
+                                                    floyd - Floyd-Steinberg error diffusion; bayer - ordered 8x8 Bayer matrix;
+                                                    bluenoise - blue noise threshold matrix; threshold - plain threshold at 50%% gray''',
+                        choices=EngraverData.DITHERS,default='floyd')
     parser.add_argument('--invert', help='invert the image/text before engraving',default=False,action='store_true')
     parser.add_argument('--limit', help='set maximum no. of steps in x/y direction',metavar=('steps'),dest='lim',type=int,default=1575)
+    parser.add_argument('--skip-blank', help='do not sweep over blank bands of the image or text; the laser is moved over bands of at least the given number of blank rows',
+                        metavar=('rows'),dest='skipblank',type=int,const=20,default=None,nargs='?')
+    parser.add_argument('--stream', help='prepare the image rows while sending them instead of before; the optional number of rows is prepared in advance by a separate thread',
+                        metavar=('rows'),dest='stream',type=int,const=64,default=None,nargs='?')
+    parser.add_argument('--save-job', help='save the encoded job to the given file for replaying it later; can be combined with --dry-run',
+                        metavar=('jobfile'),dest='savejob',default=None)
+    parser.add_argument('--replay', help='engrave a job saved with --save-job',metavar=('jobfile'),dest='replay',default=None)
+    parser.add_argument('--cache-dir', help='directory for caching encoded jobs',metavar=('dir'),dest='cachedir',default=CACHEDIR)
+    parser.add_argument('--cache-size', help='maximum size of the job cache in MB',metavar=('MB'),dest='cachesize',type=int,default=256)
+    parser.add_argument('--no-cache', help='do not use the job cache',dest='cachedir',action='store_const',const=None)
     parser.add_argument('--dry-run', help='do not engrave anything; you can specify an optional file for saving engraving data'
                         ,metavar=('imagefile'),dest='dummy',const=".",default=None,nargs='?')
     
     args = parser.parse_args()
+    if args.replay and (args.depth!=None or args.power!=None):
+        parser.error("the depth and power of a replayed job are stored in the job file")
+    args.depth=10 if args.depth==None else args.depth
+    args.power=100 if args.power==None else args.power
     Logger.set(Logger(args.verbosity))
     engraver=Engraver(args)
     if not args.dummy:
         engraver.open()
         engraver.connect()
-        engraver.fan(args.fan)
     data=None
     
-    if args.home:
-        engraver.home()
-    if args.move:
-        engraver.move(*args.move)
+    with engraver.batch():
+        if not args.dummy:
+            engraver.fan(args.fan)
+        if args.home:
+            engraver.home()
+        if args.move:
+            engraver.move(*args.move)
     if args.image_frame:
         args.image=args.image_frame
         args.frame=EngraverData.imageFrame(args)
@@ -670,6 +1489,12 @@ if __name__ == '__main__':
         engraver.frame(*args.frame,args.centerref,args.center)
     elif args.checker:
         data=EngraverData.checkerboard(args)
+    elif args.ladder:
+        data=EngraverData.ladder(args)
+    elif args.dots:
+        data=EngraverData.dotField(args)
+    elif args.powergrid:
+        data=EngraverData.powerGrid(args)
     elif args.image:
         data=EngraverData.fromImage(args)
     elif args.text:
@@ -677,11 +1502,17 @@ if __name__ == '__main__':
             data=EngraverData.fromText(args)
         else:
             Logger.LOGGER.error("no font is given; please use --font to specify a truetype/opentype font\n\n")
+    elif args.replay:
+        data,meta=JobFile.open(args.replay,args)
+        args.centerref=args.centerref or meta.get('centerref',False)
+    if args.savejob and data:
+        JobFile.save(args.savejob,data,{'version':VERSION,'centerref':args.centerref})
+        Logger.LOGGER.info("job saved to %s\n",args.savejob)
     if not args.dummy:
         if data:
             if args.fan==None: # switch on while engraving
                 engraver.fan(True)
             engraver.burn(data,args.centerref)
         engraver.close()
-    if not (args.home or args.move or args.frame or data or args.verbosity or args.fan!=None or args.dummy):
+    if not (args.home or args.move or args.frame or data or args.verbosity or args.fan!=None or args.dummy or args.replay):
         parser.print_help()
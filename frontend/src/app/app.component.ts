@@ -67,6 +67,11 @@ export class AppComponent implements OnInit, AfterViewInit {
 
     private selectedFont: string = "";
 
+    private dithers = [{value: "floyd", name: "Floyd-Steinberg"}, {value: "bayer", name: "Bayer"},
+                       {value: "bluenoise", name: "Blue noise"}, {value: "threshold", name: "Threshold"}];
+
+    private dither: string = "floyd";
+
     private progressPat = /^\r(sending:)? *(1?[0-9]?[0-9])% done$/;
 
     pxPerMm: number = 500. / 25.4;
@@ -172,10 +177,10 @@ export class AppComponent implements OnInit, AfterViewInit {
     updateImage() {
         var src;
         if (this.mode == 'image') {
-            src = `/image?width=${this.width}&height=${this.height}&trf=${this.transformation()}&contrast=${this.contrast}&brightness=${this.brightness}`;
+            src = `/image?width=${this.width}&height=${this.height}&trf=${this.transformation()}&contrast=${this.contrast}&brightness=${this.brightness}&dither=${this.dither}`;
         } else {
             let txt = encodeURIComponent(this.text);
-            src = `/textimage?text=${txt}&width=${this.width}&height=${this.height}&font=${this.selectedFont}&trf=${this.transformation()}`;
+            src = `/textimage?text=${txt}&width=${this.width}&height=${this.height}&font=${this.selectedFont}&trf=${this.transformation()}&dither=${this.dither}`;
         }
         console.log("src=" + src)
         this.imageDisplay.loadImage(src);
@@ -185,6 +190,10 @@ export class AppComponent implements OnInit, AfterViewInit {
         this.updateImage();
     }
 
+    ditherChanged() {
+        this.updateImage();
+    }
+
     transformation() {
         return `${this.rotationArray[this.rotation]} ${this.mirrorArray[this.mirror]}`.trim();
     }
@@ -25,21 +25,28 @@ import traceback
 import codecs
 import threading
 import queue
+import collections
+import itertools
+import selectors
+import heapq
+import copy
+import concurrent.futures
+import tempfile
+import email.message
 import argparse
-import cgi
 import webbrowser
 import socket
 import time
 import re
 import ctypes
 
-from select import select
+
 from http.server import SimpleHTTPRequestHandler,HTTPServer
 from PIL import Image,ImageDraw,ImageFont
 from urllib.parse import parse_qs
 from io import BytesIO
 
-from engraver import Logger,Engraver,EngraverData,DESCRIPTION,VERSION,unitValue,imageTrf,UI,contrastBrightnessValue
+from engraver import Logger,Progress,Engraver,EngraverData,DESCRIPTION,VERSION,unitValue,imageTrf,UI,contrastBrightnessValue,fileDigest,CACHEDIR
 
 ##############################################################################
 FONTDIR='fonts'
@@ -51,99 +58,414 @@ CLOSE = 0x8
 PING = 0x9
 PONG = 0xA
 
-HEADERB1 = 1
-HEADERB2 = 3
-LENGTHSHORT = 4
-LENGTHLONG = 5
-MASK = 6
-PAYLOAD = 7
-
 STATUS_CODES = [1000, 1001, 1002, 1003, 1007, 1008, 1009, 1010, 1011, 3000, 3999, 4000, 4999]
 
 # key value store
 STORAGE={}
 
+class LRUCache(object):
+    # a thread safe cache dropping the least recently used entries if more than
+    # maxsize units (as computed by sizeof) are stored
+    def __init__(self,maxsize,sizeof=lambda v: 1):
+        self.maxsize=maxsize
+        self.sizeof=sizeof
+        self.entries=collections.OrderedDict()
+        self.size=0
+        self.lock=threading.Lock()
+
+    def get(self,key,default=None):
+        with self.lock:
+            if key not in self.entries:
+                return default
+            self.entries.move_to_end(key)
+            return self.entries[key][0]
+
+    def put(self,key,value):
+        sz=self.sizeof(value)
+        with self.lock:
+            if key in self.entries:
+                self.size-=self.entries.pop(key)[1]
+            if sz>self.maxsize:
+                return
+            self.entries[key]=(value,sz)
+            self.size+=sz
+            while self.size>self.maxsize:
+                self.size-=self.entries.popitem(last=False)[1][1]
+
+    def __len__(self):
+        return len(self.entries)
+
+class FontIndex(threading.Thread):
+    # names of the fonts in fontdir; they are parsed in the background and kept in
+    # indexfile keyed by path, mtime and size, so only new or changed files are parsed
+    PATTERN=re.compile(r"\.(ttf|pfb)$",re.I)
+
+    def __init__(self,fontdir,indexfile=None):
+        threading.Thread.__init__(self)
+        self.daemon=True
+        self.fontdir=fontdir
+        self.indexfile=indexfile
+        self.entries={}
+        self.fonts=[]
+        self.lock=threading.Lock()
+        self.event=threading.Event()
+        self.scanned=threading.Event()
+        self.load()
+        self.refresh()
+
+    def load(self):
+        try:
+            with open(self.indexfile) as fd:
+                entries=json.load(fd)
+            fontdir=os.path.abspath(self.fontdir)
+            self.entries={p:e for p,e in entries.items() if os.path.dirname(p)==fontdir}
+        except Exception:
+            self.entries={}
+        self.fonts=self._fontList(self.entries)
+
+    def save(self):
+        if not self.indexfile:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.indexfile),exist_ok=True)
+            tmp="%s.%d.tmp"%(self.indexfile,os.getpid())
+            with open(tmp,'w') as fd:
+                json.dump(self.entries,fd)
+            os.replace(tmp,self.indexfile)
+        except OSError as ex:
+            Logger.LOGGER.warn("cannot save font index '%s': %s\n",self.indexfile,ex)
+
+    def _fontList(self,entries):
+        res=[]
+        for path,entry in entries.items():
+            if entry['name']!=None:
+                res.append({'name':entry['name'],'file':os.path.basename(path)})
+        res.sort(key=lambda f: f['file'])
+        return res
+
+    def scan(self):
+        entries={}
+        for f in filter(lambda f: self.PATTERN.search(f)!=None,os.listdir(self.fontdir)):
+            path=os.path.abspath(os.path.join(self.fontdir,f))
+            try:
+                st=os.stat(path)
+            except OSError:
+                continue
+            entry=self.entries.get(path)
+            if entry==None or entry['mtime']!=st.st_mtime or entry['size']!=st.st_size:
+                entry={'mtime':st.st_mtime,'size':st.st_size,'name':None}
+                try:
+                    name=ImageFont.truetype(path).getname()
+                    entry['name']="%s (%s)"%(name[0],name[1])
+                except Exception:
+                    Logger.LOGGER.error("cannot load font from file '%s'\n",f)
+            entries[path]=entry
+        if entries!=self.entries:
+            with self.lock:
+                self.entries=entries
+                self.fonts=self._fontList(entries)
+            self.save()
+
+    def run(self):
+        while True:
+            self.event.wait()
+            self.event.clear()
+            try:
+                self.scan()
+            except Exception as ex:
+                Logger.LOGGER.error("cannot scan font directory '%s': %s\n",self.fontdir,ex)
+            finally:
+                self.scanned.set()
+
+    def refresh(self):
+        self.event.set()
+
+    def list(self):
+        # the frontend fetches the list only once, so it waits for the first scan
+        self.scanned.wait(60)
+        with self.lock:
+            return self.fonts
+
+def imageBytes(img):
+    if img.mode=='1':
+        return (img.width+7)//8*img.height
+    return img.width*img.height*len(img.getbands())
+
+# rendered text images
+# rendered text images as (image,job digest); the job digest covers the contents of the
+# font file, since the job cache keeps jobs across restarts
+TEXTCACHE=LRUCache(64<<20,lambda e: imageBytes(e[0]))
+
+class PreviewPipeline(object):
+    # the preview is computed by a chain of stages (resize, tone, dither, transform);
+    # the result of every stage is cached under the parameters it depends on, so
+    # changing a parameter recomputes only the following stages
+    def __init__(self,maxsize):
+        self.cache=LRUCache(maxsize,imageBytes)
+
+    def stage(self,key,func):
+        res=self.cache.get(key)
+        if res==None:
+            res=func()
+            self.cache.put(key,res)
+        return res
+
+    def render(self,img,digest,args):
+        # the transformation is cheap and not cached
+        keys={'resize':('resize',digest,args.size)}
+        keys['tone']=('tone',)+keys['resize'][1:]+(args.contrast,args.brightness)
+        keys['dither']=('dither',args.dither)+keys['tone'][1:]
+        def stage(name,func):
+            key=keys.get(name)
+            return func() if key==None else self.stage(key,func)
+        return EngraverData.processImage(img,args,stage)
+
+    def renderText(self,img,digest,args):
+        # the text image is already rendered in its final size
+        dithered=self.stage(('dither',args.dither,digest),lambda: EngraverData._ditherImage(img,args))
+        return EngraverData._trfImage(dithered,args)
+
+PIPELINE=PreviewPipeline(128<<20)
+# the tone and dither settings of the last previews by (image digest,size,trf); the frontend does
+# not send them when it starts engraving
+TONES=LRUCache(64)
+# rendered previews as (etag,encoded image,image)
+PREVIEWCACHE=LRUCache(64<<20,lambda e: len(e[1])+imageBytes(e[2]))
+
 def StoreImage(fd):
     global args
-    img=Image.open(fd)
-    img.load()
+    if isinstance(fd,str):
+        digest=fileDigest(fd)
+    else:
+        hsh=hashlib.sha256()
+        for chunk in iter(lambda: fd.read(1<<20),b''):
+            hsh.update(chunk)
+        digest=hsh.hexdigest()
+        fd.seek(0)
+    img=EngraverData.loadImage(fd,(args.lim,args.lim)) # no preview is larger
     img=EngraverData.preprocessImage(img,args)
-    STORAGE['image']=img
+    STORAGE['image']=(img,digest) # set together; requests run concurrently
     
 
+
+# uploaded images are decoded one after the other by this thread; requests
+# using the image wait for the last upload
+LOADER=concurrent.futures.ThreadPoolExecutor(1)
+
+def LoadImage(fd):
+    try:
+        StoreImage(fd)
+        httpd.Send({'type':'imageReady','digest':STORAGE['image'][1]})
+    except Exception as ex:
+        Logger.LOGGER.error("cannot load image: %s\n",ex)
+    finally:
+        fd.close()
+
+def WaitForImage():
+    loading=STORAGE.get('loading')
+    if loading:
+        concurrent.futures.wait([loading],timeout=60)
+
+class MultipartReader(object):
+    # streams the parts of a multipart/form-data body; the content of a part is
+    # written to the file returned by open(name,filename) or skipped if it returns None
+    CHUNK=65536
+    MAXHEADER=16384
+
+    def __init__(self,rfile,length,boundary):
+        self.rfile=rfile
+        self.remaining=length
+        self.boundary=bytes(boundary,'latin-1')
+        self.buf=b''
+
+    def _fill(self):
+        if self.remaining<=0:
+            raise ValueError('multipart data truncated')
+        chunk=self.rfile.read(min(self.CHUNK,self.remaining))
+        if not chunk:
+            raise ValueError('multipart data truncated')
+        self.remaining-=len(chunk)
+        self.buf+=chunk
+
+    def _readUntil(self,sep,limit):
+        while True:
+            idx=self.buf.find(sep)
+            if idx>=0:
+                res=self.buf[:idx]
+                self.buf=self.buf[idx+len(sep):]
+                return res
+            if len(self.buf)>limit:
+                raise ValueError('multipart header too long')
+            self._fill()
+
+    def _copyUntil(self,sep,out):
+        keep=len(sep)-1
+        while True:
+            idx=self.buf.find(sep)
+            if idx>=0:
+                if out:
+                    out.write(self.buf[:idx])
+                self.buf=self.buf[idx+len(sep):]
+                return
+            if len(self.buf)>keep:
+                if out:
+                    out.write(self.buf[:-keep])
+                self.buf=self.buf[-keep:]
+            self._fill()
+
+    def read(self,open):
+        delim=b'--'+self.boundary
+        self._readUntil(delim,self.MAXHEADER) # preamble
+        names=[]
+        while True:
+            while len(self.buf)<2:
+                self._fill()
+            if self.buf.startswith(b'--'):
+                while self.remaining>0: # skip the epilogue
+                    chunk=self.rfile.read(min(self.CHUNK,self.remaining))
+                    if not chunk:
+                        break
+                    self.remaining-=len(chunk)
+                return names
+            headers=self._readUntil(b'\r\n\r\n',self.MAXHEADER)
+            msg=email.message.Message()
+            for line in headers.decode('utf-8','replace').split('\r\n'):
+                if ':' in line:
+                    key,value=line.split(':',1)
+                    msg[key.strip()]=value.strip()
+            name=msg.get_param('name',header='content-disposition')
+            filename=msg.get_param('filename',header='content-disposition')
+            self._copyUntil(b'\r\n'+delim,open(name,filename))
+            names.append(name)
+
 class Websocket(object):
     def __init__(self,socket,registry):
         self.socket=socket
         self.registry=registry
-        self.fileno=lambda s=self: s.socket
+        self.fileno=self.socket.fileno
         self.fin = 0
         self.data = bytearray()
         self.opcode = 0
-        self.hasmask = 0
-        self.maskarray = None
-        self.length = 0
-        self.lengtharray = None
-        self.index = 0
+        self.buffer = bytearray()
         self.request = None
         self.usingssl = False
 
         self.frag_start = False
         self.frag_type = BINARY
         self.frag_buffer = None
+        self.frag_length = 0
         self.frag_decoder = codecs.getincrementaldecoder('utf-8')(errors='strict')
         self.closed = False
         self.lastupdate=0;
-        self.state = HEADERB1
-
-        # restrict the size of header and payload for security reasons
-        self.maxheader = 65536
+        self.outqueue = collections.deque()
+        self.outsize = 0
+        self.outoffset = 0
+        self.outlock = threading.Lock()
+        self.dropped = False
+
+        # restrict the size of payload and queued output for security reasons; this
+        # also limits the receive buffer, which holds only one incomplete frame
         self.maxpayload = 33554432
+        self.maxoutput = 1048576
+        self.socket.setblocking(False)
         self.registry.Register(self)
     
     def DoRead(self):
-        msg=self.socket.recv(16384)
+        try:
+            msg=self.socket.recv(65536)
+        except BlockingIOError:
+            return
         if msg:
-            for d in msg:
-                self.DecodeMessage(d)
+            self.buffer+=msg
+            self.DecodeMessages()
         else:
             self.DoClose()
                  
     def DoClose(self):
         print ('websocket closed',self.fileno())
-        self.socket.close()
         self.registry.Unregister(self)
+        self.socket.close()
 
         
-    def DoWrite(self,data):
+    def DoWrite(self,data,opcode=None,key=None):
+        # queues the message; it is sent by the event loop when the socket gets writable.
+        # A pending message with the same key is replaced by the new one.
         if isinstance(data, str):
-            opcode = TEXT
+            opcode = opcode or TEXT
             data = data.encode('utf-8')
         else:
-            opcode = BINARY
-        payload = bytearray()
+            opcode = opcode or BINARY
+        header = bytearray()
 
         b1 = 0x80|opcode
 
         length = len(data)
-        payload.append(b1)
+        header.append(b1)
 
         if length <= 125:
            b2 = length
-           payload.append(b2)
+           header.append(b2)
 
         elif length >= 126 and length <= 65535:
            b2 = 126
-           payload.append(b2)
-           payload.extend(struct.pack("!H", length))
+           header.append(b2)
+           header.extend(struct.pack("!H", length))
 
         else:
            b2 = 127
-           payload.append(b2)
-           payload.extend(struct.pack("!Q", length))
+           header.append(b2)
+           header.extend(struct.pack("!Q", length))
 
-        if length > 0:
-           payload.extend(data)
-        self.socket.send(payload)
+        with self.outlock:
+            if self.dropped:
+                return
+            if key!=None:
+                for i,msg in enumerate(self.outqueue):
+                    if msg[2]==key and (i>0 or self.outoffset==0):
+                        del self.outqueue[i]
+                        self.outsize-=len(msg[0])+len(msg[1])
+                        break
+            self.outqueue.append((bytes(header),data,key))
+            self.outsize+=len(header)+length
+            if self.outsize>self.maxoutput:
+                # the client does not read its messages; drop it instead of buffering without limit
+                self.dropped=True
+                self.outqueue.clear()
+        self.registry.WantWrite(self)
+
+    def HasOutput(self):
+        return len(self.outqueue)>0 or self.dropped
+
+    def DoFlush(self):
+        # writes the queued messages with scatter/gather calls until the socket is full
+        with self.outlock:
+            while self.outqueue:
+                bufs=[]
+                total=0
+                skip=self.outoffset
+                for msg in itertools.islice(self.outqueue,0,64):
+                    for buf in msg[0:2]:
+                        if skip>=len(buf):
+                            skip-=len(buf)
+                            continue
+                        bufs.append(memoryview(buf)[skip:])
+                        total+=len(buf)-skip
+                        skip=0
+                try:
+                    if hasattr(self.socket,'sendmsg'):
+                        sent=self.socket.sendmsg(bufs)
+                    else:
+                        sent=self.socket.send(b''.join(bufs))
+                except BlockingIOError:
+                    return
+                done=sent+self.outoffset
+                while self.outqueue and done>=len(self.outqueue[0][0])+len(self.outqueue[0][1]):
+                    msg=self.outqueue.popleft()
+                    done-=len(msg[0])+len(msg[1])
+                    self.outsize-=len(msg[0])+len(msg[1])
+                self.outoffset=done
+                if sent<total:
+                    return
 
 
     def HandlePacket(self):
@@ -188,11 +510,16 @@ class Websocket(object):
               else:
                   self.frag_buffer = bytearray()
                   self.frag_buffer.extend(self.data)
+              self.frag_length = len(self.data)
 
           else:
               if self.frag_start is False:
                   raise Exception('fragmentation protocol error')
 
+              self.frag_length += len(self.data)
+              if self.frag_length >= self.maxpayload:
+                  raise Exception('payload exceeded allowable size')
+
               if self.frag_type == TEXT:
                   utf_str = self.frag_decoder.decode(self.data, final = False)
                   if utf_str:
@@ -221,7 +548,7 @@ class Websocket(object):
               self.frag_buffer = None
 
           elif self.opcode == PING:
-              self._sendMessage(False, PONG, self.data)
+              self.DoWrite(bytes(self.data), PONG)
 
           elif self.opcode == PONG:
               pass
@@ -239,160 +566,48 @@ class Websocket(object):
               self.registry.Receive(self.data)
 
 
-    def DecodeMessage(self, byte):
-      if self.state == HEADERB1:
-         self.fin = byte & 0x80
-         self.opcode = byte & 0x0F
-         self.state = HEADERB2
-
-         self.index = 0
-         self.length = 0
-         self.lengtharray = bytearray()
-         self.data = bytearray()
-
-         rsv = byte & 0x70
-         if rsv != 0:
-            raise Exception('RSV bit must be 0')
-
-      elif self.state == HEADERB2:
-         mask = byte & 0x80
-         length = byte & 0x7F
-
-         if self.opcode == PING and length > 125:
-             raise Exception('ping packet is too large')
-
-         if mask == 128:
-            self.hasmask = True
-         else:
-            self.hasmask = False
-
-         if length <= 125:
-            self.length = length
-
-            # if we have a mask we must read it
-            if self.hasmask is True:
-               self.maskarray = bytearray()
-               self.state = MASK
-            else:
-               # if there is no mask and no payload we are done
-               if self.length <= 0:
-                  try:
-                     self.HandlePacket()
-                  finally:
-                     self.state = HEADERB1
-                     self.data = bytearray()
-
-               # we have no mask and some payload
-               else:
-                  #self.index = 0
-                  self.data = bytearray()
-                  self.state = PAYLOAD
-
-         elif length == 126:
-            self.lengtharray = bytearray()
-            self.state = LENGTHSHORT
-
-         elif length == 127:
-            self.lengtharray = bytearray()
-            self.state = LENGTHLONG
-
-      elif self.state == LENGTHSHORT:
-         self.lengtharray.append(byte)
-
-         if len(self.lengtharray) > 2:
-            raise Exception('short length exceeded allowable size')
-
-         if len(self.lengtharray) == 2:
-            self.length = struct.unpack_from('!H', self.lengtharray)[0]
-
-            if self.hasmask is True:
-               self.maskarray = bytearray()
-               self.state = MASK
-            else:
-               # if there is no mask and no payload we are done
-               if self.length <= 0:
-                   try:
-                       self.HandlePacket()
-                   finally:
-                       self.state = HEADERB1
-                       self.data = bytearray()
-
-                    # we have no mask and some payload
-               else:
-                   #self.index = 0
-                   self.data = bytearray()
-                   self.state = PAYLOAD
-
-      elif self.state == LENGTHLONG:
-          self.lengtharray.append(byte)
-
-          if len(self.lengtharray) > 8:
-              raise Exception('long length exceeded allowable size')
-
-          if len(self.lengtharray) == 8:
-              self.length = struct.unpack_from('!Q', self.lengtharray)[0]
-
-              if self.hasmask is True:
-                  self.maskarray = bytearray()
-                  self.state = MASK
-              else:
-                  # if there is no mask and no payload we are done
-                  if self.length <= 0:
-                      try:
-                          self.HandlePacket()
-                      finally:
-                          self.state = HEADERB1
-                          self.data = bytearray()
-
-                  # we have no mask and some payload
-                  else:
-                      #self.index = 0
-                      self.data = bytearray()
-                      self.state = PAYLOAD
-
-      # MASK STATE
-      elif self.state == MASK:
-          self.maskarray.append(byte)
-
-          if len(self.maskarray) > 4:
-              raise Exception('mask exceeded allowable size')
-
-          if len(self.maskarray) == 4:
-              # if there is no mask and no payload we are done
-              if self.length <= 0:
-                  try:
-                      self.HandlePacket()
-                  finally:
-                      self.state = HEADERB1
-                      self.data = bytearray()
-
-              # we have no mask and some payload
-              else:
-                  #self.index = 0
-                  self.data = bytearray()
-                  self.state = PAYLOAD
-
-      # PAYLOAD STATE
-      elif self.state == PAYLOAD:
-          if self.hasmask is True:
-              self.data.append( byte ^ self.maskarray[self.index % 4] )
-          else:
-              self.data.append( byte )
-
-          # if length exceeds allowable size then we except and remove the connection
-          if len(self.data) >= self.maxpayload:
-              raise Exception('payload exceeded allowable size')
-
-          # check if we have processed length bytes; if so we are done
-          if (self.index+1) == self.length:
-              try:
-                  self.HandlePacket()
-              finally:
-                  #self.index = 0
-                  self.state = HEADERB1
-                  self.data = bytearray()
-          else:
-              self.index += 1
+    def DecodeMessages(self):
+        # parses all complete frames in the receive buffer; an incomplete frame is left
+        # in the buffer until the next read
+        buf=self.buffer
+        while len(buf)>=2:
+            b1,b2=buf[0],buf[1]
+            if b1 & 0x70:
+                raise Exception('RSV bit must be 0')
+            opcode=b1 & 0x0F
+            length=b2 & 0x7F
+            pos=2
+            if length==126:
+                if len(buf)<4:
+                    return
+                length=struct.unpack_from('!H',buf,2)[0]
+                pos=4
+            elif length==127:
+                if len(buf)<10:
+                    return
+                length=struct.unpack_from('!Q',buf,2)[0]
+                pos=10
+            if opcode & 0x8 and length>125:
+                raise Exception('control packet is too large')
+            # if length exceeds allowable size then we except and remove the connection
+            if length>=self.maxpayload:
+                raise Exception('payload exceeded allowable size')
+            mask=None
+            if b2 & 0x80:
+                mask=bytes(buf[pos:pos+4])
+                pos+=4
+            if len(buf)<pos+length:
+                return
+            data=bytes(buf[pos:pos+length])
+            del buf[:pos+length]
+            if mask and length:
+                # unmask the whole payload with a single xor of two big numbers
+                key=(mask*(length//4+1))[:length]
+                data=(int.from_bytes(data,'little')^int.from_bytes(key,'little')).to_bytes(length,'little')
+            self.fin=b1 & 0x80
+            self.opcode=opcode
+            self.data=bytearray(data)
+            self.HandlePacket()
 
 
 
@@ -406,6 +621,8 @@ def parseTrf(trf):
         
 class GUIHandler(SimpleHTTPRequestHandler):
 
+    timeout=60 # seconds a pool thread waits for a stalled client
+
     def __init__(self,fd,addr,server):
         self.server=server
         self.hand_over=False
@@ -464,7 +681,6 @@ class GUIHandler(SimpleHTTPRequestHandler):
             self.send_header("Sec-WebSocket-Accept",self.GenSecAccept(key))
             self.send_header("Upgrade","websocket")
             self.end_headers()
-            self.server.KeepOpen()
             ws=Websocket(self.request,self.server)
         else:
             self.send_error(400,"illegal request")
@@ -476,60 +692,69 @@ class GUIHandler(SimpleHTTPRequestHandler):
 
             
     def GetFonts(self,args):
-        exp=re.compile("\.(ttf|pfb)$")
-        fonts=list(filter(lambda f: exp.search(f,re.I)!=None,os.listdir(FONTDIR)))
-        fonts.sort()
-        digest=hashlib.sha1(bytes(str(fonts),'utf-8')).hexdigest()
-        flist=[]
-        if STORAGE.get('fonthash')!=digest:
-            for f in fonts:
-                try:
-                    fname=ImageFont.truetype('%s/%s'%(FONTDIR,f)).getname()
-                    fname="%s (%s)"%(fname[0],fname[1])
-                    flist.append({'name':fname,'file':f})
-                except:
-                    Logger.LOGGER.error("cannot load font from file '%s'\n",f)
-            STORAGE['fonts']=flist
-            STORAGE['fonthash']=digest
+        # served from the index; changes of the font directory are picked up in the background
+        fonts=FONTINDEX.list()
+        FONTINDEX.refresh()
         self._JSONHeader()
-        self.output(json.dumps(STORAGE['fonts']))
-
-    def SendImage(self,img):
+        self.output(json.dumps(fonts))
+
+    def SendCachedImage(self,key,render):
+        # the preview for key is rendered once; browsers revalidate it with its etag
+        entry=PREVIEWCACHE.get(key)
+        if entry==None:
+            img=render()
+            fd = BytesIO()
+            if img.mode=='1':
+                # dithered previews: fast compression needs a third of the time for ~15% more bytes
+                img.save(fd, "png", compress_level=1)
+            else:
+                img.save(fd, "png")
+            etag='"%s"'%hashlib.sha1(bytes(repr((VERSION,key)),'utf-8')).hexdigest()
+            entry=(etag,fd.getvalue(),img)
+            PREVIEWCACHE.put(key,entry)
+        etag,data,img=entry
+        match=[t.strip() for t in self.headers.get("If-None-Match","").split(',')]
+        if etag in match or '*' in match:
+            self.send_response(304)
+            self.send_header("ETag",etag)
+            self.end_headers()
+            return
         self.send_response(200)
-        self.send_header("Pragma-directive","no-cache")
-        self.send_header("Cache-directive","no-cache")
-        self.send_header("Cache-Control","no-store, no-cache, must-revalidate")
+        self.send_header("Cache-Control","no-cache")
+        self.send_header("ETag",etag)
         self.send_header("Content-Type","image/png");
+        self.send_header("Content-Length",str(len(data)))
         self.end_headers()
-        fd = BytesIO()
-        img.save(fd, "png")
-        self.wfile.write(fd.getvalue())
+        self.wfile.write(data)
         self.wfile.flush()
 
-    
     def RenderImageFromText(self,dict):
         for p in ['text','font','width','height']:
             if  p not in dict:
                 self.send_error(404, "parameter '%s' is missing"%p)
                 return
         hsh=hashlib.sha1()
-        global args 
+        args=self.server.Args()
         args.text=dict['text'][0]
         hsh.update(bytes(args.text,'utf-8'))
         args.size=(unitValue(dict['width'][0]),unitValue(dict['height'][0]))
         hsh.update(bytes(str(args.size),'utf-8'))
         args.font="%s/%s"%(FONTDIR,dict['font'][0])
         hsh.update(bytes(args.font,'utf-8'))
+        hsh.update(bytes(str(EngraverData._fontStamp(args.font)),'utf-8')) # a replaced font file
 
         digest=hsh.hexdigest()
-        if STORAGE.get('imagehash')==digest:
-            img=STORAGE['textimage']
-        else:
-            STORAGE['imagehash']=digest
-            img=EngraverData.imageFromText(args)
-            STORAGE['textimage']=img
-        args.trf=parseTrf(dict.get('trf',[None])[0])
-        self.SendImage(EngraverData._trfImage(img.copy(),args))
+        entry=TEXTCACHE.get(digest)
+        if entry==None:
+            jobdigest=hashlib.sha256(bytes(digest+fileDigest(args.font),'utf-8')).hexdigest()
+            entry=(EngraverData.imageFromText(args),jobdigest)
+            TEXTCACHE.put(digest,entry)
+        img,jobdigest=entry
+        trf=dict.get('trf',[None])[0]
+        args.trf=parseTrf(trf)
+        args.dither=self._getDither(dict,args)
+        STORAGE['textimage']=(img,digest,args.dither,jobdigest)
+        self.SendCachedImage(('text',digest,trf,args.dither),lambda: PIPELINE.renderText(img,digest,args))
 
     def _getEnhanceValue(self,dict,key):
         res=None
@@ -537,19 +762,28 @@ class GUIHandler(SimpleHTTPRequestHandler):
         if val and abs(float(val[0]))>0.001:
             res=contrastBrightnessValue(val[0])
         return res
+
+    def _getDither(self,dict,args):
+        val=dict.get('dither',[args.dither])[0]
+        return val if val in EngraverData.DITHERS else args.dither
         
     def RenderImage(self,dict):
         for p in ['width','height']:
             if  p not in dict:
                 self.send_error(404, "parameter '%s' is missing"%p)
                 return
-        global args 
+        args=self.server.Args()
         args.size=(unitValue(dict['width'][0]),unitValue(dict['height'][0]))
-        args.trf=parseTrf(dict.get('trf',[None])[0])
+        trf=dict.get('trf',[None])[0]
+        args.trf=parseTrf(trf)
         args.contrast=self._getEnhanceValue(dict,'contrast')
         args.brightness=self._getEnhanceValue(dict,'brightness')
-        img=EngraverData.processImage(STORAGE['image'].copy(),args)
-        self.SendImage(img)
+        args.dither=self._getDither(dict,args)
+        WaitForImage()
+        img,digest=STORAGE['image']
+        TONES.put((digest,args.size,trf),(args.contrast,args.brightness,args.dither))
+        key=('image',digest,args.size,trf,args.contrast,args.brightness,args.dither,args.invert)
+        self.SendCachedImage(key,lambda: PIPELINE.render(img,digest,args))
         
     
     def do_GET(self):
@@ -578,33 +812,35 @@ class GUIHandler(SimpleHTTPRequestHandler):
 
     
     def SaveImage(self):
-        global args
-        content_length = int(self.headers['Content-Length'])
-        ctype, pdict = cgi.parse_header(self.headers['Content-Type'])
-        if ctype == 'multipart/form-data':
-            encoding='utf-8'
-            errors='replace'
-            boundary = pdict['boundary']
-            ctype = self.headers['Content-Type']
-            headers = cgi.Message()
-            headers.set_type(ctype)
-            headers['Content-Length'] = self.headers['Content-Length']
-            fs = cgi.FieldStorage(self.rfile, headers=headers, encoding=encoding, errors=errors,
-                              environ={'REQUEST_METHOD': 'POST'})
-            try:
-                image=fs['file']
-                data=fs.getlist('file')[0]
-            except:
-                image=None
-            if image!=None:
-                fd=BytesIO(data)
-                StoreImage(fd)
-                self.send_response(200)
-                self.end_headers()
-            else: 
-                self.send_error(400,"content dispostion `file0` expected\n",'utf-8')
-        else:
+        # the upload is spooled to a temporary file and acknowledged; it is decoded
+        # in the background and the clients get an 'imageReady' message afterwards.
+        # The current frontend ignores that message: its following preview request
+        # waits in WaitForImage until the image is decoded
+        msg=email.message.Message()
+        msg['content-type']=self.headers.get('Content-Type','')
+        if msg.get_content_type()!='multipart/form-data' or not msg.get_param('boundary'):
             self.send_error(400,"content type `multipart/form-data` expected\n",'utf-8')
+            return
+        spool=tempfile.SpooledTemporaryFile(max_size=8<<20)
+        try:
+            try:
+                reader=MultipartReader(self.rfile,int(self.headers['Content-Length']),msg.get_param('boundary'))
+                names=reader.read(lambda name,filename: spool if name=='file' else None)
+            except (ValueError,TypeError) as ex:
+                self.send_error(400,"invalid upload: %s\n"%ex,'utf-8')
+                return
+            if 'file' not in names:
+                self.send_error(400,"content dispostion `file` expected\n",'utf-8')
+                return
+            spool.seek(0)
+            STORAGE['loading']=LOADER.submit(LoadImage,spool)
+            spool=None # closed by the loader
+        finally:
+            if spool!=None:
+                spool.close()
+        self.send_response(200)
+        self.send_header("Content-Length","0")
+        self.end_headers()
 
     pathtofunc={
         '/ws':CreateWS,
@@ -618,92 +854,224 @@ class GUIHandler(SimpleHTTPRequestHandler):
         }
     
 
+class Waker(object):
+    # a socket pair waking up the event loop if messages are queued by other threads
+    def __init__(self):
+        self.rsock,self.wsock=socket.socketpair()
+        self.rsock.setblocking(False)
+        self.wsock.setblocking(False)
+
+    def fileno(self):
+        return self.rsock.fileno()
+
+    def DoRead(self):
+        try:
+            self.rsock.recv(4096)
+        except BlockingIOError:
+            pass
+
+    def DoWrite(self,msg,key=None):
+        pass
+
+    def DoClose(self):
+        self.rsock.close()
+        self.wsock.close()
+
+    def Wakeup(self):
+        try:
+            self.wsock.send(b'\0')
+        except BlockingIOError: # there are already pending wakeups
+            pass
+
+
 class Httpd(HTTPServer):
+    # a single threaded event loop for the websockets and the timers; http
+    # requests are handled by a thread pool and may hand over their socket
+    # to a websocket registered in the loop
 
     allow_reuse_address = True
+    PING_INTERVAL = 30
     
-    def __init__(self,bind,port):
+    def __init__(self,bind,port,workers=8):
         HTTPServer.__init__(self,(bind,port), GUIHandler)
+        self.socket.setblocking(False)
+        self.selector=selectors.DefaultSelector()
+        self.pool=concurrent.futures.ThreadPoolExecutor(workers)
         self.listeners={}
         self.intervall=0.5
-        self.msg=None
-        self.do_close=True
+        self.loopThread=None
+        self.calls=collections.deque()
+        self.timers=[]
+        self.timerSeq=itertools.count()
+        self.writers=set()
         self.messageHandler=lambda p: None
-        self.Register(self)
         self.lock=threading.Lock()
+        self.waker=Waker()
+        self.Register(self)
+        self.Register(self.waker)
+        self.CallLater(self.PING_INTERVAL,self.KeepAlive)
         
     def DoRead(self):
-        self.handle_request()
+        try:
+            request,address=self.get_request()
+        except OSError:
+            return
+        self.pool.submit(self.ProcessRequest,request,address)
+
+    def ProcessRequest(self,request,address):
+        try:
+            handler=self.RequestHandlerClass(request,address,self)
+            if handler.hand_over:
+                return
+        except Exception:
+            self.handle_error(request,address)
+        self.shutdown_request(request)
 
-    def DoWrite(self,msg):
+    def DoWrite(self,msg,key=None):
         pass
     
     def DoClose(self):
-        os.close(self.fileno())
-    
-    def KeepOpen(self):
-        self.do_close=False
-        
-    def shutdown_request(self, request):
-        if self.do_close:
-            HTTPServer.shutdown_request(self,request)
-        else:
-            print ("do close:",self.do_close,request.fileno())
-        self.do_close=True
+        self.socket.close()
+        self.pool.shutdown(wait=False)
 
+    def InLoop(self):
+        return self.loopThread in (None,threading.get_ident())
+
+    def CallSoon(self,func,*args):
+        # runs func in the event loop thread
+        self.calls.append((func,args))
+        self.waker.Wakeup()
+
+    def CallLater(self,delay,func,*args):
+        with self.lock:
+            heapq.heappush(self.timers,(time.monotonic()+delay,next(self.timerSeq),func,args))
+        self.waker.Wakeup()
+
+    def KeepAlive(self):
+        for client in list(self.listeners.values()):
+            if isinstance(client,Websocket):
+                client.DoWrite(b'',PING,key='ping')
+        self.CallLater(self.PING_INTERVAL,self.KeepAlive)
 
     def Register(self,client):
-        if client.fileno()!=None:
-            self.listeners[client.fileno()]=client
+        if not self.InLoop():
+            self.CallSoon(self.Register,client)
+            return
+        fd=client.fileno()
+        if fd!=None:
+            self.selector.register(fd,selectors.EVENT_READ,client)
+            self.listeners[fd]=client
 
     def Unregister(self,listener):
-        if type(listener)!=int:
-            listener=listener.fileno()
-        try:
-            del self.listeners[listener]
-        except:
-            pass
+        if not self.InLoop():
+            self.CallSoon(self.Unregister,listener)
+            return
+        for fd,client in list(self.listeners.items()):
+            if client is listener:
+                self.selector.unregister(fd)
+                del self.listeners[fd]
+
+    def WantWrite(self,client):
+        # called by any thread if a client has queued output
+        with self.lock:
+            self.writers.add(client)
+        self.waker.Wakeup()
 
     def SetMessageHandler(self,handler):
         self.messageHandler=handler
 
-    def HandleRead(self,fd):
-        self.listeners[fd].DoRead()
+    @staticmethod
+    def Args():
+        # requests run concurrently; each of them gets its own copy of the arguments
+        return copy.copy(args)
 
-    def HandleClose(self,fd):
-        client=self.listeners[fd]
-        client.DoClose()
+    def HandleClose(self,client):
         self.Unregister(client)
+        client.DoClose()
+
+    def _Call(self,func,args):
+        # a failing callback must not end the loop
+        try:
+            func(*args)
+        except Exception as ex:
+            print('loop callback %s failed: %s'%(getattr(func,'__name__',func),ex))
+
+    def _RunCalls(self):
+        while self.calls:
+            func,args=self.calls.popleft()
+            self._Call(func,args)
+
+    def _RunTimers(self):
+        # runs all expired timers and returns the time until the next one
+        now=time.monotonic()
+        due=[]
+        with self.lock:
+            while self.timers and self.timers[0][0]<=now:
+                due.append(heapq.heappop(self.timers))
+            timeout=self.intervall
+            if self.timers:
+                timeout=min(timeout,self.timers[0][0]-now)
+        for when,dummy,func,args in due:
+            self._Call(func,args)
+        return timeout
+
+    def _UpdateWriters(self):
+        with self.lock:
+            writers=self.writers
+            self.writers=set()
+        for client in writers:
+            fd=client.fileno()
+            if self.listeners.get(fd) is not client:
+                continue
+            if client.dropped:
+                print('dropping slow websocket client')
+                self.HandleClose(client)
+            else:
+                self.selector.modify(fd,selectors.EVENT_READ|selectors.EVENT_WRITE,client)
 
-    
     def Loop(self):
+        self.loopThread=threading.get_ident()
         while self.listeners:
-            fds=self.listeners.keys()
-            rList, dummy, xList = select(fds, [], fds, self.intervall)
-            for ready in rList:
-                if ready not in fds:
+            self._RunCalls()
+            self._UpdateWriters()
+            timeout=self._RunTimers()
+            for key,events in self.selector.select(timeout):
+                client=key.data
+                if self.listeners.get(key.fd) is not client:
                     continue
                 try:
-                    self.HandleRead(ready)
+                    if events & selectors.EVENT_WRITE:
+                        client.DoFlush()
+                        if not client.HasOutput():
+                            self.selector.modify(key.fd,selectors.EVENT_READ,client)
+                    if events & selectors.EVENT_READ:
+                        client.DoRead()
                 except Exception as n:
                     print(n)
-                    self.HandleClose(ready)
-            for failed in xList:
-                self.HandleClose(ready)
+                    self.HandleClose(client)
+
+    @staticmethod
+    def MessageKey(obj):
+        # messages superseding older ones of the same kind, which are not sent yet
+        if obj.get('type')=='status':
+            return 'status'
+        if obj.get('type')=='message' and obj.get('content','').startswith('\r'):
+            return 'progress'
+        return None
 
     def Send(self,obj):
-        self.lock.acquire()
+        # never blocks on a client; the messages are written by the event loop
         msg=json.dumps(obj)
-        for client in self.listeners.values():
-            client.DoWrite(msg)
-        self.lock.release()
+        key=self.MessageKey(obj)
+        for client in list(self.listeners.values()):
+            client.DoWrite(msg,key=key)
 
     def Receive(self,msg):
         obj=json.loads(msg)
         self.messageHandler.receive(obj)
 
 class StdoutClient(object):
-    def DoWrite(self,msg):
+    def DoWrite(self,msg,key=None):
         print(msg)
 
     def DoRead(self):
@@ -734,6 +1102,19 @@ class ExternalLogger(Logger):
         return res
 
 
+class ExternalProgress(Progress):
+    # the content of the message is understood by the progress display of the frontend
+    def __init__(self,channel):
+        Progress.__init__(self)
+        self.channel=channel
+
+    def emit(self,event):
+        prefix="sending: " if event['phase']=='sending' else ""
+        self.channel.Send({'type':'message','severity':'INFO',
+                           'content':"\r%s% 2d%% done"%(prefix,event['percent']),
+                           'progress':event})
+
+
 class Worker(threading.Thread):
     def __init__(self,engraver,channel):
         self.engraver=engraver
@@ -745,7 +1126,7 @@ class Worker(threading.Thread):
         self.centerAxis=None
         self.useCenter=False
         self.burner=None
-        self.queue=queue.Queue(1)
+        self.queue=queue.Queue()
         self.commands={
             'connect':self.connect,
             'disconnect':self.disconnect,
@@ -795,16 +1176,23 @@ class Worker(threading.Thread):
         engraver.frameStop(fx,fy,useCenter,centerAxis)
 
     def engrave(self,engraver,mode,useCenter,trf,width,height,power,depth):
-        global args
-        if mode=='image':
-            img=STORAGE['image'].copy()
-        else:
-            img=STORAGE['textimage'].copy()
+        args=Httpd.Args()
         args.size=(width,height)
         args.trf=parseTrf(trf)
         args.power=power
         args.depth=depth
-        data=EngraverData._imageToData(img,args)
+        # the job is made of the bitmap shown as preview (usually still cached)
+        if mode=='image':
+            WaitForImage()
+            img,digest=STORAGE['image']
+            args.contrast,args.brightness,args.dither=TONES.get((digest,args.size,trf or None),
+                                                                (None,None,args.dither))
+            render=lambda: PIPELINE.render(img,digest,args)
+            jobdigest=digest
+        else:
+            img,digest,args.dither,jobdigest=STORAGE['textimage']
+            render=lambda: PIPELINE.renderText(img,digest,args)
+        data=EngraverData.cached('preview:'+jobdigest,args,lambda: EngraverData._bitmapToData(render(),args))
         self.burner=BurnThread(self,engraver,data,useCenter)
         self.burner.start()
         self.engraving=True
@@ -897,14 +1285,24 @@ parser.add_argument('-b', '--browser',metavar="browser",help='use browser to ope
 parser.add_argument('-B', '--bind',metavar="bind",help='use the given address to bind to; use 0.0.0.0 for all interfaces',
                     default='127.0.0.1')
 
-parser.add_argument('-P', '--port',metavar="port",help='use the given port',
+parser.add_argument('-P', '--port',metavar="port",help='use the given port',type=int,
                     default=8008)
 
+parser.add_argument('--dither', help='the algorithm converting images and text to black and white',
+                    choices=EngraverData.DITHERS,default='floyd')
+
+parser.add_argument('--cache-dir', help='directory for caching encoded jobs',metavar=('dir'),dest='cachedir',default=CACHEDIR)
+parser.add_argument('--cache-size', help='maximum size of the job cache in MB',metavar=('MB'),dest='cachesize',type=int,default=256)
+parser.add_argument('--no-cache', help='do not use the job cache',dest='cachedir',action='store_const',const=None)
+
 parser.add_argument('-T','--transform', help=argparse.SUPPRESS,dest='trf')
 parser.add_argument('--dry-run',dest='dummy', help=argparse.SUPPRESS)
 parser.add_argument('--invert',dest='invert', help=argparse.SUPPRESS,default=False,action='store_true')
 parser.add_argument('--brightness',dest='brightness', help=argparse.SUPPRESS,default=None)
 parser.add_argument('--contrast',dest='contrast', help=argparse.SUPPRESS,default=None)
+parser.add_argument('--skip-blank',dest='skipblank', help=argparse.SUPPRESS,type=int,default=None)
+# the jobs are made of the preview bitmaps; they are neither streamed nor saved
+parser.set_defaults(stream=None,savejob=None)
 
 args = parser.parse_args()
 
@@ -919,9 +1317,12 @@ if args.browser!='-':
 httpd = Httpd(args.bind,args.port)
 httpd.Register(StdoutClient())
 Logger.set(ExternalLogger(args.verbosity,httpd))
+Progress.set(ExternalProgress(httpd))
 engraver=Engraver(args)
 worker=Worker(engraver,httpd)
 httpd.SetMessageHandler(worker)
+FONTINDEX=FontIndex(FONTDIR,args.cachedir and os.path.join(os.path.expanduser(args.cachedir),'fonts.json'))
+FONTINDEX.start()
 StoreImage('web/logo.png')
 worker.start()
 httpd.Loop()
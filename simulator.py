@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+########################################################################
+# Copyright 2019 Bernd Breitenbach
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>
+#
+########################################################################
+
+import argparse
+import os
+import pty
+import sys
+import threading
+import time
+import tty
+from select import select
+
+from engraver import Logger,Engraver,EngraverData,VERSION
+
+########################################################################
+
+class Simulator(threading.Thread):
+    # a virtual KKMoon engraver on a pseudo terminal; it speaks the protocol of
+    # engraver.py: every frame starts with a command byte followed by the total
+    # frame length (16 bit, big endian)
+    FIRMWARE=bytes([0x2,0x1,0x4])
+    ACK=bytes([0x9])
+    NAK=bytes([0x0])
+
+    CONNECT=0x0a
+    VERSION=0xff
+    HEADER=0x23
+    ROW=0x22
+    START=0x24
+    PAUSE=0x18
+    CONT=0x19
+    STOP=0x27
+
+    def __init__(self,baud=115200,latency=0.,rowtime=0.,link=None):
+        threading.Thread.__init__(self)
+        self.daemon=True
+        self.baud=baud
+        self.latency=latency
+        self.rowtime=rowtime
+        self.master,self.slave=pty.openpty()
+        tty.setraw(self.slave)
+        self.device=os.ttyname(self.slave)
+        self.link=link
+        if link:
+            if os.path.islink(link):
+                os.unlink(link)
+            os.symlink(self.device,link)
+        self.doStop=False
+        self.rows=0
+        self.errors=0
+        self.height=0
+        self.burning=False
+        self.paused=False
+        self.progress=0.
+        self.perc=-1
+        self.lastTick=0.
+        self.stats={'frames':0,'bytes':0}
+
+    def _delay(self,nbytes):
+        # serial transfer time of nbytes (8N1) plus the processing latency of the device
+        time.sleep(self.latency+nbytes*10./self.baud)
+
+    def reply(self,data):
+        self._delay(len(data))
+        os.write(self.master,data)
+
+    def handleFrame(self,frame):
+        cmd=frame[0]
+        self.stats['frames']+=1
+        self.stats['bytes']+=len(frame)
+        if cmd==self.ROW:
+            self._delay(len(frame))
+            cbyte=sum(frame[:-1])
+            if cbyte>=256:
+                cbyte=(0x100-(cbyte&0xff))&0xff
+            if cbyte!=frame[-1]:
+                self.errors+=1
+                self.reply(self.NAK)
+            else:
+                self.rows+=1
+                self.reply(self.ACK)
+        elif cmd==self.HEADER:
+            self.height=(frame[9]<<8)|frame[10]
+            self.rows=0
+            self.reply(EngraverData.HEADER_ACK)
+        elif cmd==self.VERSION:
+            self.reply(self.FIRMWARE)
+        elif cmd==self.START:
+            if not self.burning:
+                self.burning=True
+                self.paused=False
+                self.progress=0.
+                self.perc=-1
+                self.lastTick=time.time()
+        elif cmd==self.PAUSE:
+            self.paused=True
+            self.reply(self.ACK)
+        elif cmd==self.CONT:
+            self.paused=False
+            self.lastTick=time.time()
+            self.reply(self.ACK)
+        elif cmd==self.STOP:
+            self.burning=False
+            self.reply(self.ACK)
+        else: # connect, fan, home, move, frame ...
+            self.reply(self.ACK)
+
+    def burnStep(self):
+        now=time.time()
+        if not self.paused:
+            if self.rowtime>0.:
+                self.progress+=(now-self.lastTick)/(self.rowtime*max(self.rows,1))
+            else:
+                self.progress=1.
+        self.lastTick=now
+        if self.progress>=1.:
+            self.burning=False
+            self.reply(Engraver.COMPLETED)
+        elif int(self.progress*100)!=self.perc:
+            self.perc=int(self.progress*100)
+            self.reply(bytes([0x0,0x0,0x0,self.perc]))
+
+    def run(self):
+        buf=bytearray()
+        while not self.doStop:
+            ready,dummy,dummy=select([self.master],[],[],0.1 if self.burning else 0.5)
+            if ready:
+                buf+=os.read(self.master,65536)
+                while len(buf)>=3:
+                    length=(buf[1]<<8)|buf[2]
+                    if length<3:
+                        del buf[0] # resynchronize on garbage
+                        continue
+                    if len(buf)<length:
+                        break
+                    frame=bytes(buf[:length])
+                    del buf[:length]
+                    self.handleFrame(frame)
+            if self.burning:
+                self.burnStep()
+
+    def stop(self):
+        self.doStop=True
+        if self.link and os.path.islink(self.link):
+            os.unlink(self.link)
+
+########################################################################
+
+def benchmark(args):
+    sim=Simulator(args.baud,args.latency,0.,args.link)
+    sim.start()
+    Logger.set(Logger(-1))
+    eargs=argparse.Namespace(device=sim.device,speed=args.baud,lim=1575,depth=10,power=100,invert=False)
+    engraver=Engraver(eargs)
+    engraver.open()
+    engraver.connect()
+    print("%8s %8s %10s %12s %10s"%("size","rows","secs","rows/s","bytes/s"))
+    for size in args.sizes:
+        eargs.checker=(1,size)
+        data=EngraverData.checkerboard(eargs)
+        nbytes=sum(len(r) for r in data.iterRows())
+        start=time.time()
+        data.sendData(engraver)
+        secs=time.time()-start
+        while engraver.ser.read(4)!=Engraver.COMPLETED:
+            pass
+        print("%8d %8d %10.3f %12.1f %10.1f"%(size,data.rowCount(),secs,data.rowCount()/secs,nbytes/secs))
+    engraver.close()
+    sim.stop()
+
+DESCRIPTION="""
+Simulator of a KKMoon laser engraver on a pseudo terminal
+V{} (c) 2019 by Bernd Breitenbach
+This program comes with ABSOLUTELY NO WARRANTY.
+This is free software, and you are welcome to redistribute it
+under certain conditions; See COPYING for details.
+""".format(VERSION)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=DESCRIPTION,
+                                     formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+                                     epilog='''Use the printed device (or the link) with the -d option of engraver.py or gui.py''')
+    parser.add_argument('-b','--baud',metavar='baud',help='simulated speed of the serial line',type=int,default=115200)
+    parser.add_argument('-l','--latency',metavar='secs',help='simulated processing time of the device per command',type=float,default=0.)
+    parser.add_argument('-r','--row-time',metavar='secs',help='simulated burning time per row',dest='rowtime',type=float,default=0.01)
+    parser.add_argument('-L','--link',metavar='path',help='create a symbolic link to the pseudo terminal')
+    parser.add_argument('--benchmark',metavar='size',help='measure the transfer throughput for jobs of the given sizes',
+                        dest='sizes',type=int,nargs='+',default=None)
+    args=parser.parse_args()
+
+    if args.sizes:
+        benchmark(args)
+        sys.exit(0)
+    sim=Simulator(args.baud,args.latency,args.rowtime,args.link)
+    sim.start()
+    print("simulated engraver on device %s"%(args.link or sim.device))
+    print("press return to finish")
+    try:
+        sys.stdin.readline()
+    finally:
+        sim.stop()
+        print("%d frames (%d bytes) received, %d row errors"%(sim.stats['frames'],sim.stats['bytes'],sim.errors))
@@ -1272,7 +1272,7 @@ var e}))).pipe(W((function(){var i=n._extractIconWithNameFromAnySet(t,e);if(!i)t
  * Use of this source code is governed by an MIT-style license that can be
  * found in the LICENSE file at https://angular.io/license
  */
-var r,o,a}var _w=[[["mat-select-trigger"]],"*"],bw=["mat-select-trigger","*"],kw={transformPanelWrap:kh("transformPanelWrap",[Eh("* => void",Ah("@transformPanel",[Th()],{optional:!0}))]),transformPanel:kh("transformPanel",[xh("void",Sh({transform:"scaleY(0.8)",minWidth:"100%",opacity:0})),xh("showing",Sh({opacity:1,minWidth:"calc(100% + 32px)",transform:"scaleY(1)"})),xh("showing-multiple",Sh({opacity:1,minWidth:"calc(100% + 64px)",transform:"scaleY(1)"})),Eh("void => *",wh("120ms cubic-bezier(0, 0, 0.2, 1)")),Eh("* => void",wh("100ms 25ms linear",Sh({opacity:0})))])},ww=0,Cw=256,Sw=new re("mat-select-scroll-strategy"),xw=new re("MAT_SELECT_CONFIG"),Ew={provide:Sw,deps:[xg],useFactory:function(t){return function(){return t.scrollStrategies.reposition()}}},Tw=function t(e,n){y(this,t),this.source=e,this.value=n},Aw=c_(h_(u_(f_((function t(e,n,i,r,o){y(this,t),this._elementRef=e,this._defaultErrorStateMatcher=n,this._parentForm=i,this._parentFormGroup=r,this.ngControl=o}))))),Ow=new re("MatSelectTrigger"),Iw=function(){var t=function(t){f(n,t);var e=m(n);function n(t,i,r,a,s,u,c,h,f,d,p,v,m,g){var _,b;return y(this,n),(_=e.call(this,s,a,c,h,d))._viewportRuler=t,_._changeDetectorRef=i,_._ngZone=r,_._dir=u,_._parentFormField=f,_.ngControl=d,_._liveAnnouncer=m,_._panelOpen=!1,_._required=!1,_._scrollTop=0,_._multiple=!1,_._compareWith=function(t,e){return t===e},_._uid="mat-select-".concat(ww++),_._triggerAriaLabelledBy=null,_._destroy=new z,_._triggerFontSize=0,_._onChange=function(){},_._onTouched=function(){},_._valueId="mat-select-value-".concat(ww++),_._transformOrigin="top",_._panelDoneAnimatingStream=new z,_._offsetY=0,_._positions=[{originX:"start",originY:"top",overlayX:"start",overlayY:"top"},{originX:"start",originY:"bottom",overlayX:"start",overlayY:"bottom"}],_._disableOptionCentering=!1,_._focused=!1,_.controlType="mat-select",_.ariaLabel="",_.optionSelectionChanges=(b=function(){var t=_.options;return t?t.changes.pipe(my(t),yy((function(){return ct.apply(void 0,l(t.map((function(t){return t.onSelectionChange}))))}))):_._ngZone.onStable.pipe(Gy(1),yy((function(){return _.optionSelectionChanges})))},new V((function(t){var e;try{e=b()}catch(n){return void t.error(n)}return(e?et(e):mm()).subscribe(t)}))),_.openedChange=new qu,_._openedStream=_.openedChange.pipe(vp((function(t){return t})),W((function(){}))),_._closedStream=_.openedChange.pipe(vp((function(t){return!t})),W((function(){}))),_.selectionChange=new qu,_.valueChange=new qu,_.ngControl&&(_.ngControl.valueAccessor=o(_)),_._scrollStrategyFactory=v,_._scrollStrategy=_._scrollStrategyFactory(),_.tabIndex=parseInt(p)||0,_.id=_.id,g&&(null!=g.disableOptionCentering&&(_.disableOptionCentering=g.disableOptionCentering),null!=g.typeaheadDebounceInterval&&(_.typeaheadDebounceInterval=g.typeaheadDebounceInterval)),_}return _(n,[{key:"ngOnInit",value:function(){var t=this;this._selectionModel=new Dy(this.multiple),this.stateChanges.next(),this._panelDoneAnimatingStream.pipe(qm(),hy(this._destroy)).subscribe((function(){t.panelOpen?(t._scrollTop=0,t.openedChange.emit(!0)):(t.openedChange.emit(!1),t.overlayDir.offsetX=0,t._changeDetectorRef.markForCheck())})),this._viewportRuler.change().pipe(hy(this._destroy)).subscribe((function(){t._panelOpen&&(t._triggerRect=t.trigger.nativeElement.getBoundingClientRect(),t._changeDetectorRef.markForCheck())}))}},{key:"ngAfterContentInit",value:function(){var t=this;this._initKeyManager(),this._selectionModel.changed.pipe(hy(this._destroy)).subscribe((function(t){t.added.forEach((function(t){return t.select()})),t.removed.forEach((function(t){return t.deselect()}))})),this.options.changes.pipe(my(null),hy(this._destroy)).subscribe((function(){t._resetOptions(),t._initializeSelection()}))}},{key:"ngDoCheck",value:function(){var t=this._getTriggerAriaLabelledby();if(t!==this._triggerAriaLabelledBy){var e=this._elementRef.nativeElement;this._triggerAriaLabelledBy=t,t?e.setAttribute("aria-labelledby",t):e.removeAttribute("aria-labelledby")}this.ngControl&&this.updateErrorState()}},{key:"ngOnChanges",value:function(t){t.disabled&&this.stateChanges.next(),t.typeaheadDebounceInterval&&this._keyManager&&this._keyManager.withTypeAhead(this._typeaheadDebounceInterval)}},{key:"ngOnDestroy",value:function(){this._destroy.next(),this._destroy.complete(),this.stateChanges.complete()}},{key:"toggle",value:function(){this.panelOpen?this.close():this.open()}},{key:"open",value:function(){var t=this;!this.disabled&&this.options&&this.options.length&&!this._panelOpen&&(this._triggerRect=this.trigger.nativeElement.getBoundingClientRect(),this._triggerFontSize=parseInt(getComputedStyle(this.trigger.nativeElement).fontSize||"0"),this._panelOpen=!0,this._keyManager.withHorizontalOrientation(null),this._calculateOverlayPosition(),this._highlightCorrectOption(),this._changeDetectorRef.markForCheck(),this._ngZone.onStable.pipe(Gy(1)).subscribe((function(){t._triggerFontSize&&t.overlayDir.overlayRef&&t.overlayDir.overlayRef.overlayElement&&(t.overlayDir.overlayRef.overlayElement.style.fontSize="".concat(t._triggerFontSize,"px"))})))}},{key:"close",value:function(){this._panelOpen&&(this._panelOpen=!1,this._keyManager.withHorizontalOrientation(this._isRtl()?"rtl":"ltr"),this._changeDetectorRef.markForCheck(),this._onTouched())}},{key:"writeValue",value:function(t){this.value=t}},{key:"registerOnChange",value:function(t){this._onChange=t}},{key:"registerOnTouched",value:function(t){this._onTouched=t}},{key:"setDisabledState",value:function(t){this.disabled=t,this._changeDetectorRef.markForCheck(),this.stateChanges.next()}},{key:"_isRtl",value:function(){return!!this._dir&&"rtl"===this._dir.value}},{key:"_handleKeydown",value:function(t){this.disabled||(this.panelOpen?this._handleOpenKeydown(t):this._handleClosedKeydown(t))}},{key:"_handleClosedKeydown",value:function(t){var e=t.keyCode,n=40===e||38===e||37===e||39===e,i=13===e||32===e,r=this._keyManager;if(!r.isTyping()&&i&&!$y(t)||(this.multiple||t.altKey)&&n)t.preventDefault(),this.open();else if(!this.multiple){var o=this.selected;r.onKeydown(t);var a=this.selected;a&&o!==a&&this._liveAnnouncer.announce(a.viewValue,1e4)}}},{key:"_handleOpenKeydown",value:function(t){var e=this._keyManager,n=t.keyCode,i=40===n||38===n,r=e.isTyping();if(i&&t.altKey)t.preventDefault(),this.close();else if(r||13!==n&&32!==n||!e.activeItem||$y(t))if(!r&&this._multiple&&65===n&&t.ctrlKey){t.preventDefault();var o=this.options.some((function(t){return!t.disabled&&!t.selected}));this.options.forEach((function(t){t.disabled||(o?t.select():t.deselect())}))}else{var a=e.activeItemIndex;e.onKeydown(t),this._multiple&&i&&t.shiftKey&&e.activeItem&&e.activeItemIndex!==a&&e.activeItem._selectViaInteraction()}else t.preventDefault(),e.activeItem._selectViaInteraction()}},{key:"_onFocus",value:function(){this.disabled||(this._focused=!0,this.stateChanges.next())}},{key:"_onBlur",value:function(){this._focused=!1,this.disabled||this.panelOpen||(this._onTouched(),this._changeDetectorRef.markForCheck(),this.stateChanges.next())}},{key:"_onAttached",value:function(){var t=this;this.overlayDir.positionChange.pipe(Gy(1)).subscribe((function(){t._changeDetectorRef.detectChanges(),t._calculateOverlayOffsetX(),t.panel.nativeElement.scrollTop=t._scrollTop}))}},{key:"_getPanelTheme",value:function(){return this._parentFormField?"mat-".concat(this._parentFormField.color):""}},{key:"_initializeSelection",value:function(){var t=this;Promise.resolve().then((function(){t._setSelectionByValue(t.ngControl?t.ngControl.value:t._value),t.stateChanges.next()}))}},{key:"_setSelectionByValue",value:function(t){var e=this;if(this.multiple&&t)Array.isArray(t),this._selectionModel.clear(),t.forEach((function(t){return e._selectValue(t)})),this._sortValues();else{this._selectionModel.clear();var n=this._selectValue(t);n?this._keyManager.updateActiveItem(n):this.panelOpen||this._keyManager.updateActiveItem(-1)}this._changeDetectorRef.markForCheck()}},{key:"_selectValue",value:function(t){var e=this,n=this.options.find((function(n){try{return null!=n.value&&e._compareWith(n.value,t)}catch(i){return!1}}));return n&&this._selectionModel.select(n),n}},{key:"_initKeyManager",value:function(){var t=this;this._keyManager=new Mg(this.options).withTypeAhead(this._typeaheadDebounceInterval).withVerticalOrientation().withHorizontalOrientation(this._isRtl()?"rtl":"ltr").withHomeAndEnd().withAllowedModifierKeys(["shiftKey"]),this._keyManager.tabOut.pipe(hy(this._destroy)).subscribe((function(){t.panelOpen&&(!t.multiple&&t._keyManager.activeItem&&t._keyManager.activeItem._selectViaInteraction(),t.focus(),t.close())})),this._keyManager.change.pipe(hy(this._destroy)).subscribe((function(){t._panelOpen&&t.panel?t._scrollActiveOptionIntoView():t._panelOpen||t.multiple||!t._keyManager.activeItem||t._keyManager.activeItem._selectViaInteraction()}))}},{key:"_resetOptions",value:function(){var t=this,e=ct(this.options.changes,this._destroy);this.optionSelectionChanges.pipe(hy(e)).subscribe((function(e){t._onSelect(e.source,e.isUserInput),e.isUserInput&&!t.multiple&&t._panelOpen&&(t.close(),t.focus())})),ct.apply(void 0,l(this.options.map((function(t){return t._stateChanges})))).pipe(hy(e)).subscribe((function(){t._changeDetectorRef.markForCheck(),t.stateChanges.next()}))}},{key:"_onSelect",value:function(t,e){var n=this._selectionModel.isSelected(t);null!=t.value||this._multiple?(n!==t.selected&&(t.selected?this._selectionModel.select(t):this._selectionModel.deselect(t)),e&&this._keyManager.setActiveItem(t),this.multiple&&(this._sortValues(),e&&this.focus())):(t.deselect(),this._selectionModel.clear(),null!=this.value&&this._propagateChanges(t.value)),n!==this._selectionModel.isSelected(t)&&this._propagateChanges(),this.stateChanges.next()}},{key:"_sortValues",value:function(){var t=this;if(this.multiple){var e=this.options.toArray();this._selectionModel.sort((function(n,i){return t.sortComparator?t.sortComparator(n,i,e):e.indexOf(n)-e.indexOf(i)})),this.stateChanges.next()}}},{key:"_propagateChanges",value:function(t){var e;e=this.multiple?this.selected.map((function(t){return t.value})):this.selected?this.selected.value:t,this._value=e,this.valueChange.emit(e),this._onChange(e),this.selectionChange.emit(new Tw(this,e)),this._changeDetectorRef.markForCheck()}},{key:"_highlightCorrectOption",value:function(){this._keyManager&&(this.empty?this._keyManager.setFirstItemActive():this._keyManager.setActiveItem(this._selectionModel.selected[0]))}},{key:"_scrollActiveOptionIntoView",value:function(){var t,e,n,i=this._keyManager.activeItemIndex||0,r=L_(i,this.options,this.optionGroups),o=this._getItemHeight();this.panel.nativeElement.scrollTop=(e=o,(t=(i+r)*o)<(n=this.panel.nativeElement.scrollTop)?t:t+e>n+256?Math.max(0,t-256+e):n)}},{key:"focus",value:function(t){this._elementRef.nativeElement.focus(t)}},{key:"_getOptionIndex",value:function(t){return this.options.reduce((function(e,n,i){return void 0!==e?e:t===n?i:void 0}),void 0)}},{key:"_calculateOverlayPosition",value:function(){var t=this._getItemHeight(),e=this._getItemCount(),n=Math.min(e*t,Cw),i=e*t-n,r=this.empty?0:this._getOptionIndex(this._selectionModel.selected[0]);r+=L_(r,this.options,this.optionGroups);var o=n/2;this._scrollTop=this._calculateOverlayScroll(r,o,i),this._offsetY=this._calculateOverlayOffsetY(r,o,i),this._checkOverlayWithinViewport(i)}},{key:"_calculateOverlayScroll",value:function(t,e,n){var i=this._getItemHeight();return Math.min(Math.max(0,i*t-e+i/2),n)}},{key:"_getPanelAriaLabelledby",value:function(){if(this.ariaLabel)return null;var t=this._getLabelId();return this.ariaLabelledby?t+" "+this.ariaLabelledby:t}},{key:"_getAriaActiveDescendant",value:function(){return this.panelOpen&&this._keyManager&&this._keyManager.activeItem?this._keyManager.activeItem.id:null}},{key:"_getLabelId",value:function(){var t;return(null===(t=this._parentFormField)||void 0===t?void 0:t.getLabelId())||""}},{key:"_calculateOverlayOffsetX",value:function(){var t,e=this.overlayDir.overlayRef.overlayElement.getBoundingClientRect(),n=this._viewportRuler.getViewportSize(),i=this._isRtl(),r=this.multiple?56:32;if(this.multiple)t=40;else{var o=this._selectionModel.selected[0]||this.options.first;t=o&&o.group?32:16}i||(t*=-1);var a=0-(e.left+t-(i?r:0)),s=e.right+t-n.width+(i?0:r);a>0?t+=a+8:s>0&&(t-=s+8),this.overlayDir.offsetX=Math.round(t),this.overlayDir.overlayRef.updatePosition()}},{key:"_calculateOverlayOffsetY",value:function(t,e,n){var i,r=this._getItemHeight(),o=(r-this._triggerRect.height)/2,a=Math.floor(Cw/r);return this._disableOptionCentering?0:(i=0===this._scrollTop?t*r:this._scrollTop===n?(t-(this._getItemCount()-a))*r+(r-(this._getItemCount()*r-Cw)%r):e-r/2,Math.round(-1*i-o))}},{key:"_checkOverlayWithinViewport",value:function(t){var e=this._getItemHeight(),n=this._viewportRuler.getViewportSize(),i=this._triggerRect.top-8,r=n.height-this._triggerRect.bottom-8,o=Math.abs(this._offsetY),a=Math.min(this._getItemCount()*e,Cw)-o-this._triggerRect.height;a>r?this._adjustPanelUp(a,r):o>i?this._adjustPanelDown(o,i,t):this._transformOrigin=this._getOriginBasedOnOption()}},{key:"_adjustPanelUp",value:function(t,e){var n=Math.round(t-e);this._scrollTop-=n,this._offsetY-=n,this._transformOrigin=this._getOriginBasedOnOption(),this._scrollTop<=0&&(this._scrollTop=0,this._offsetY=0,this._transformOrigin="50% bottom 0px")}},{key:"_adjustPanelDown",value:function(t,e,n){var i=Math.round(t-e);if(this._scrollTop+=i,this._offsetY+=i,this._transformOrigin=this._getOriginBasedOnOption(),this._scrollTop>=n)return this._scrollTop=n,this._offsetY=0,void(this._transformOrigin="50% top 0px")}},{key:"_getOriginBasedOnOption",value:function(){var t=this._getItemHeight(),e=(t-this._triggerRect.height)/2,n=Math.abs(this._offsetY)-e+t/2;return"50% ".concat(n,"px 0px")}},{key:"_getItemCount",value:function(){return this.options.length+this.optionGroups.length}},{key:"_getItemHeight",value:function(){return 3*this._triggerFontSize}},{key:"_getTriggerAriaLabelledby",value:function(){if(this.ariaLabel)return null;var t=this._getLabelId()+" "+this._valueId;return this.ariaLabelledby&&(t+=" "+this.ariaLabelledby),t}},{key:"setDescribedByIds",value:function(t){this._ariaDescribedby=t.join(" ")}},{key:"onContainerClick",value:function(){this.focus(),this.open()}},{key:"focused",get:function(){return this._focused||this._panelOpen}},{key:"placeholder",get:function(){return this._placeholder},set:function(t){this._placeholder=t,this.stateChanges.next()}},{key:"required",get:function(){return this._required},set:function(t){this._required=Xm(t),this.stateChanges.next()}},{key:"multiple",get:function(){return this._multiple},set:function(t){this._multiple=Xm(t)}},{key:"disableOptionCentering",get:function(){return this._disableOptionCentering},set:function(t){this._disableOptionCentering=Xm(t)}},{key:"compareWith",get:function(){return this._compareWith},set:function(t){this._compareWith=t,this._selectionModel&&this._initializeSelection()}},{key:"value",get:function(){return this._value},set:function(t){t!==this._value&&(this.options&&this._setSelectionByValue(t),this._value=t)}},{key:"typeaheadDebounceInterval",get:function(){return this._typeaheadDebounceInterval},set:function(t){this._typeaheadDebounceInterval=$m(t)}},{key:"id",get:function(){return this._id},set:function(t){this._id=t||this._uid,this.stateChanges.next()}},{key:"panelOpen",get:function(){return this._panelOpen}},{key:"selected",get:function(){return this.multiple?this._selectionModel.selected:this._selectionModel.selected[0]}},{key:"triggerValue",get:function(){if(this.empty)return"";if(this._multiple){var t=this._selectionModel.selected.map((function(t){return t.viewValue}));return this._isRtl()&&t.reverse(),t.join(", ")}return this._selectionModel.selected[0].viewValue}},{key:"empty",get:function(){return!this._selectionModel||this._selectionModel.isEmpty()}},{key:"shouldLabelFloat",get:function(){return this._panelOpen||!this.empty}}]),n}(Aw);return t.\u0275fac=function(e){return new(e||t)(za(Ny),za(pa),za(Dl),za(d_),za(tu),za(Ry,8),za(nm,8),za(sm,8),za(Yk,8),za(uv,10),Ua("tabindex"),za(Sw),za(qg),za(xw,8))},t.\u0275cmp=Fe({type:t,selectors:[["mat-select"]],contentQueries:function(t,e,n){var i;1&t&&(ol(n,Ow,!0),ol(n,V_,!0),ol(n,P_,!0)),2&t&&(el(i=ul())&&(e.customTrigger=i.first),el(i=ul())&&(e.options=i),el(i=ul())&&(e.optionGroups=i))},viewQuery:function(t,e){var n;1&t&&(il(fw,!0),il(dw,!0),il(Og,!0)),2&t&&(el(n=ul())&&(e.trigger=n.first),el(n=ul())&&(e.panel=n.first),el(n=ul())&&(e.overlayDir=n.first))},hostAttrs:["role","combobox","aria-autocomplete","none","aria-haspopup","true",1,"mat-select"],hostVars:20,hostBindings:function(t,e){1&t&&Ja("keydown",(function(t){return e._handleKeydown(t)}))("focus",(function(){return e._onFocus()}))("blur",(function(){return e._onBlur()})),2&t&&(La("id",e.id)("tabindex",e.tabIndex)("aria-controls",e.panelOpen?e.id+"-panel":null)("aria-expanded",e.panelOpen)("aria-label",e.ariaLabel||null)("aria-required",e.required.toString())("aria-disabled",e.disabled.toString())("aria-invalid",e.errorState)("aria-describedby",e._ariaDescribedby||null)("aria-activedescendant",e._getAriaActiveDescendant()),_s("mat-select-disabled",e.disabled)("mat-select-invalid",e.errorState)("mat-select-required",e.required)("mat-select-empty",e.empty)("mat-select-multiple",e.multiple))},inputs:{disabled:"disabled",disableRipple:"disableRipple",tabIndex:"tabIndex",ariaLabel:["aria-label","ariaLabel"],id:"id",disableOptionCentering:"disableOptionCentering",typeaheadDebounceInterval:"typeaheadDebounceInterval",placeholder:"placeholder",required:"required",multiple:"multiple",compareWith:"compareWith",value:"value",panelClass:"panelClass",ariaLabelledby:["aria-labelledby","ariaLabelledby"],errorStateMatcher:"errorStateMatcher",sortComparator:"sortComparator"},outputs:{openedChange:"openedChange",_openedStream:"opened",_closedStream:"closed",selectionChange:"selectionChange",valueChange:"valueChange"},exportAs:["matSelect"],features:[Qs([{provide:Lk,useExisting:t},{provide:N_,useExisting:t}]),Ms,tn],ngContentSelectors:bw,decls:9,vars:10,consts:[["cdk-overlay-origin","",1,"mat-select-trigger",3,"click"],["origin","cdkOverlayOrigin","trigger",""],[1,"mat-select-value",3,"ngSwitch"],["class","mat-select-placeholder",4,"ngSwitchCase"],["class","mat-select-value-text",3,"ngSwitch",4,"ngSwitchCase"],[1,"mat-select-arrow-wrapper"],[1,"mat-select-arrow"],["cdk-connected-overlay","","cdkConnectedOverlayLockPosition","","cdkConnectedOverlayHasBackdrop","","cdkConnectedOverlayBackdropClass","cdk-overlay-transparent-backdrop",3,"cdkConnectedOverlayScrollStrategy","cdkConnectedOverlayOrigin","cdkConnectedOverlayOpen","cdkConnectedOverlayPositions","cdkConnectedOverlayMinWidth","cdkConnectedOverlayOffsetY","backdropClick","attach","detach"],[1,"mat-select-placeholder"],[1,"mat-select-value-text",3,"ngSwitch"],[4,"ngSwitchDefault"],[4,"ngSwitchCase"],[1,"mat-select-panel-wrap"],["role","listbox","tabindex","-1",3,"ngClass","keydown"],["panel",""]],template:function(t,e){if(1&t&&(ss(_w),Ka(0,"div",0,1),Ja("click",(function(){return e.toggle()})),Ka(3,"div",2),Ba(4,pw,2,1,"span",3),Ba(5,yw,3,2,"span",4),Ga(),Ka(6,"div",5),Za(7,"div",6),Ga(),Ga(),Ba(8,gw,4,14,"ng-template",7),Ja("backdropClick",(function(){return e.close()}))("attach",(function(){return e._onAttached()}))("detach",(function(){return e.close()}))),2&t){var n=Ha(1);Lr(3),qa("ngSwitch",e.empty),La("id",e._valueId),Lr(1),qa("ngSwitchCase",!0),Lr(1),qa("ngSwitchCase",!1),Lr(3),qa("cdkConnectedOverlayScrollStrategy",e._scrollStrategy)("cdkConnectedOverlayOrigin",n)("cdkConnectedOverlayOpen",e.panelOpen)("cdkConnectedOverlayPositions",e._positions)("cdkConnectedOverlayMinWidth",null==e._triggerRect?null:e._triggerRect.width)("cdkConnectedOverlayOffsetY",e._offsetY)}},directives:[Ag,Mc,Vc,Og,Lc,Tc],styles:[".mat-select{display:inline-block;width:100%;outline:none}.mat-select-trigger{display:inline-table;cursor:pointer;position:relative;box-sizing:border-box}.mat-select-disabled .mat-select-trigger{-webkit-user-select:none;-moz-user-select:none;-ms-user-select:none;user-select:none;cursor:default}.mat-select-value{display:table-cell;max-width:0;width:100%;overflow:hidden;text-overflow:ellipsis;white-space:nowrap}.mat-select-value-text{white-space:nowrap;overflow:hidden;text-overflow:ellipsis}.mat-select-arrow-wrapper{display:table-cell;vertical-align:middle}.mat-form-field-appearance-fill .mat-select-arrow-wrapper{transform:translateY(-50%)}.mat-form-field-appearance-outline .mat-select-arrow-wrapper{transform:translateY(-25%)}.mat-form-field-appearance-standard.mat-form-field-has-label .mat-select:not(.mat-select-empty) .mat-select-arrow-wrapper{transform:translateY(-50%)}.mat-form-field-appearance-standard .mat-select.mat-select-empty .mat-select-arrow-wrapper{transition:transform 400ms cubic-bezier(0.25, 0.8, 0.25, 1)}._mat-animation-noopable.mat-form-field-appearance-standard .mat-select.mat-select-empty .mat-select-arrow-wrapper{transition:none}.mat-select-arrow{width:0;height:0;border-left:5px solid transparent;border-right:5px solid transparent;border-top:5px solid;margin:0 4px}.mat-select-panel-wrap{flex-basis:100%}.mat-select-panel{min-width:112px;max-width:280px;overflow:auto;-webkit-overflow-scrolling:touch;padding-top:0;padding-bottom:0;max-height:256px;min-width:100%;border-radius:4px}.cdk-high-contrast-active .mat-select-panel{outline:solid 1px}.mat-select-panel .mat-optgroup-label,.mat-select-panel .mat-option{font-size:inherit;line-height:3em;height:3em}.mat-form-field-type-mat-select:not(.mat-form-field-disabled) .mat-form-field-flex{cursor:pointer}.mat-form-field-type-mat-select .mat-form-field-label{width:calc(100% - 18px)}.mat-select-placeholder{transition:color 400ms 133.3333333333ms cubic-bezier(0.25, 0.8, 0.25, 1)}._mat-animation-noopable .mat-select-placeholder{transition:none}.mat-form-field-hide-placeholder .mat-select-placeholder{color:transparent;-webkit-text-fill-color:transparent;transition:none;display:block}\n"],encapsulation:2,data:{animation:[kw.transformPanelWrap,kw.transformPanel]},changeDetection:0}),t}(),Rw=function(){var t=function t(){y(this,t)};return t.\u0275mod=Le({type:t}),t.\u0275inj=It({factory:function(e){return new(e||t)},providers:[Ew],imports:[[jc,Rg,j_,s_],My,$k,j_,s_]}),t}(),Pw=["scrolllog"];function Dw(t,e){if(1&t){var n=Xa();Ka(0,"button",53),Ja("click",(function(){return Sn(n),os().connect()})),Ka(1,"mat-icon"),Is(2,"power"),Ga(),Ga()}2&t&&qa("disabled",os().locked)}function Fw(t,e){if(1&t){var n=Xa();Ka(0,"button",54),Ja("click",(function(){return Sn(n),os().disconnect()})),Ka(1,"mat-icon"),Is(2,"power"),Ga(),Ka(3,"mat-icon",55),Is(4,"block"),Ga(),Ga()}2&t&&qa("disabled",os().disabled)}function Nw(t,e){if(1&t){var n=Xa();Ka(0,"button",56),Ja("click",(function(){return Sn(n),os().fan(!0)})),Ka(1,"mat-icon"),Is(2,"toys"),Ga(),Ga()}2&t&&qa("disabled",os().totalDisabled)}function Mw(t,e){if(1&t){var n=Xa();Ka(0,"button",57),Ja("click",(function(){return Sn(n),os().fan(!1)})),Ka(1,"mat-icon"),Is(2,"toys"),Ga(),Ka(3,"mat-icon",55),Is(4,"block"),Ga(),Ga()}2&t&&qa("disabled",os().totalDisabled)}function Vw(t,e){if(1&t){var n=Xa();Ka(0,"button",58),Ja("click",(function(){return Sn(n),os().startEngrave()})),Ka(1,"mat-icon"),Is(2,"flash_on"),Ga(),Ga()}2&t&&qa("disabled",os().totalDisabled)}function Lw(t,e){if(1&t){var n=Xa();Ka(0,"button",59),Ja("click",(function(){return Sn(n),os().stopEngrave()})),Ka(1,"mat-icon"),Is(2,"flash_on"),Ga(),Ka(3,"mat-icon",55),Is(4,"block"),Ga(),Ga()}2&t&&qa("disabled",!os().status.engraving)}function jw(t,e){if(1&t){var n=Xa();Ka(0,"div",60),Ka(1,"mat-form-field",61),Ka(2,"input",62),Ja("ngModelChange",(function(t){return Sn(n),os().contrast=t}))("ngModelChange",(function(t){return Sn(n),os().contrastUpdate.next(t)})),Ga(),Ka(3,"mat-hint",63),Is(4,"Contrast"),Ga(),Ga(),Za(5,"div",47),Ka(6,"mat-form-field",61),Ka(7,"input",64),Ja("ngModelChange",(function(t){return Sn(n),os().brightness=t}))("ngModelChange",(function(t){return Sn(n),os().brightnessUpdate.next(t)})),Ga(),Ka(8,"mat-hint",63),Is(9,"Brightness"),Ga(),Ga(),Za(10,"div",47),Ga()}if(2&t){var i=os();Lr(2),qa("ngModel",i.contrast),Lr(5),qa("ngModel",i.brightness)}}function Bw(t,e){if(1&t){var n=Xa();Ka(0,"div",65),Ka(1,"image-upload",66),Ja("completed",(function(){return Sn(n),os().updateImage()})),Ga(),Ga()}if(2&t){var i=os();Lr(1),qa("disabled",i.disabled)("uploadURL","/image")}}function Hw(t,e){if(1&t){var n=Xa();Ka(0,"button",73),Ja("click",(function(){return Sn(n),os(2).text=""})),Ka(1,"mat-icon"),Is(2,"close"),Ga(),Ga()}}function zw(t,e){if(1&t&&(Ka(0,"mat-option",74),Is(1),Ga()),2&t){var n=e.$implicit;qa("value",n.file),Lr(1),Ps(" ",n.name," ")}}function Uw(t,e){if(1&t){var n=Xa();Ka(0,"div",60),Ka(1,"mat-form-field",67),Ka(2,"textarea",68),Ja("ngModelChange",(function(t){return Sn(n),os().text=t}))("ngModelChange",(function(t){return Sn(n),os().textUpdate.next(t)})),Ga(),Ba(3,Hw,3,0,"button",69),Ga(),Za(4,"div",47),Ka(5,"mat-form-field",70),Ka(6,"mat-select",71),Ja("valueChange",(function(t){return Sn(n),os().selectedFont=t}))("selectionChange",(function(t){return Sn(n),os().fontChanged(t)})),Ba(7,zw,2,2,"mat-option",72),Ga(),Ga(),Ga()}if(2&t){var i=os();Lr(2),qa("disabled",i.disabled)("ngModel",i.text),Lr(1),qa("ngIf",i.text),Lr(3),qa("disabled",i.disabled)("value",i.selectedFont),Lr(1),qa("ngForOf",i.fonts)}}function qw(t,e){if(1&t&&(Ka(0,"span"),Is(1),Za(2,"br"),Ga()),2&t){var n=e.$implicit;Lr(1),Rs(n)}}var Ww=function(){function t(t,e){this.service=t,this.bottomSheet=e,this.version="",this.locked=!1,this.disabled=!0,this.totalDisabled=!0,this.status=new Mm,this.log=[],this.moveDistance=1,this.power=100,this.depth=10,this.contrast=0,this.brightness=0,this.mode="image",this.text="Hello world!",this.useCenter=!1,this.xyCenter=[],this.xyCenterSaved="",this.widthUpdate=new z,this.heightUpdate=new z,this.textUpdate=new z,this.contrastUpdate=new z,this.brightnessUpdate=new z,this.rotationArray=["","ccw","turn","cw"],this.rotation=0,this.mirrorArray=["","tb","lr","tb lr"],this.mirror=0,this.fonts=[],this.selectedFont="",this.progressPat=/^\r(sending:)? *(1?[0-9]?[0-9])% done$/,this.pxPerMm=500/25.4,this.debounceTime=750,this.width=250,this.height=250}return t.prototype.ngAfterViewInit=function(){var t=this;this.widthUpdate.pipe(Bm(this.debounceTime),qm()).subscribe((function(e){return t.updateImage()})),this.heightUpdate.pipe(Bm(this.debounceTime),qm()).subscribe((function(e){return t.updateImage()})),this.textUpdate.pipe(Bm(this.debounceTime),qm()).subscribe((function(e){return t.updateImage()})),this.contrastUpdate.pipe(Bm(this.debounceTime),qm()).subscribe((function(e){return t.updateImage()})),this.brightnessUpdate.pipe(Bm(this.debounceTime),qm()).subscribe((function(e){return t.updateImage()})),this.scrollContainer=this.scrollFrame.nativeElement,this.updateImage(),this.connect()},t.prototype.scrollToBottom=function(){this.scrollContainer.scroll({top:this.scrollContainer.scrollHeight,left:0,behavior:"smooth"})},t.prototype.updateFontList=function(t){""==this.selectedFont&&t.length>0&&(this.selectedFont=t[0].file),this.fonts=t},t.prototype.ngOnInit=function(){var t=this;this.mode="image",this.service.receive((function(e){return t.messageHandler(e)}),(function(e){return t.statusHandler(e)}),(function(e){return t.commandHandler(e)})),this.retrieveStatus(),this.service.fonts().then((function(e){return t.updateFontList(e)}))},t.prototype.commandHandler=function(t){},t.prototype.statusHandler=function(t){this.version=t.version,this.locked=!1,this.status=t,this.disabled=t.engraving||t.framing,this.totalDisabled=!t.connected||this.disabled,this.disabled||this.imageDisplay.displayProgress(null,null)},t.prototype.messageHandler=function(t){var e=this,n=this.progressPat.exec(t.content);n?this.imageDisplay.displayProgress(+n[2]/100,n[1]?"transfer":"engrave"):(this.log.push("["+t.severity+"] "+t.content),setTimeout((function(){return e.scrollToBottom()}),10))},t.prototype.send=function(t){this.locked=!0,this.disabled=!0,this.service.send(t)},t.prototype.textSelected=function(){this.updateImage()},t.prototype.imageSelected=function(){this.updateImage()},t.prototype.updateImage=function(){var t;t="image"==this.mode?"/image?width="+this.width+"&height="+this.height+"&trf="+this.transformation()+"&contrast="+this.contrast+"&brightness="+this.brightness:"/textimage?text="+encodeURIComponent(this.text)+"&width="+this.width+"&height="+this.height+"&font="+this.selectedFont+"&trf="+this.transformation(),console.log("src="+t),this.imageDisplay.loadImage(t)},t.prototype.fontChanged=function(){this.updateImage()},t.prototype.transformation=function(){return(this.rotationArray[this.rotation]+" "+this.mirrorArray[this.mirror]).trim()},t.prototype.rotateClicked=function(t){this.rotation=(this.rotation+t+4)%4,this.updateImage()},t.prototype.mirrorClicked=function(t){this.mirror^=t,this.updateImage()},t.prototype.click=function(t){console.log(t)},t.prototype.retrieveStatus=function(){this.send({cmd:"status"})},t.prototype.fan=function(t){this.send({cmd:"fan",args:{on:t}})},t.prototype.home=function(){this.send({cmd:"home"})},t.prototype.connect=function(){this.send({cmd:"connect"})},t.prototype.disconnect=function(){this.send({cmd:"disconnect"})},t.prototype.moveRight=function(){this.send({cmd:"move",args:{dx:Math.round(this.moveDistance*this.pxPerMm),dy:0}})},t.prototype.moveLeft=function(){this.send({cmd:"move",args:{dx:Math.round(-this.moveDistance*this.pxPerMm),dy:0}})},t.prototype.moveDown=function(){this.send({cmd:"move",args:{dx:0,dy:Math.round(this.moveDistance*this.pxPerMm)}})},t.prototype.moveUp=function(){this.send({cmd:"move",args:{dx:0,dy:Math.round(-this.moveDistance*this.pxPerMm)}})},t.prototype.frame=function(){var t={fx:this.imageDisplay.imageWidth,fy:this.imageDisplay.imageHeight,useCenter:this.useCenter,centerAxis:this.xyCenterSaved};console.log(t),null!=this.xyCenter[0]?(this.xyCenterSaved=this.xyCenter[0],this.send({cmd:"frameStart",args:t})):(this.send({cmd:"frameStop",args:t}),this.xyCenterSaved=null)},t.prototype.startEngrave=function(){this.fan(!0);var t={cmd:"engrave",args:{mode:this.mode,useCenter:this.useCenter,trf:this.transformation(),width:this.width,height:this.height,power:this.power,depth:this.depth}};this.send(t)},t.prototype.stopEngrave=function(){this.send({cmd:"stopEngraving",args:{}})},t.\u0275fac=function(e){return new(e||t)(za(Lm),za(fb))},t.\u0275cmp=Fe({type:t,selectors:[["app-root"]],viewQuery:function(t,e){var n;1&t&&(il(Pw,!0),il(Ym,!0)),2&t&&(el(n=ul())&&(e.scrollFrame=n.first),el(n=ul())&&(e.imageDisplay=n.first))},inputs:{debounceTime:"debounceTime"},decls:128,vars:53,consts:[[1,"flow"],[1,"block","padded"],[2,"padding","8px"],["mat-raised-button","","class","icon-button","title","Connect to engraver",3,"disabled","click",4,"ngIf"],["mat-raised-button","","class","icon-button","title","Disconnect from engraver",3,"disabled","click",4,"ngIf"],["mat-raised-button","","class","icon-button","title","Switch fan on",3,"disabled","click",4,"ngIf"],["mat-raised-button","","class","icon-button","title","Switch fan off",3,"disabled","click",4,"ngIf"],[2,"width","360px","height","170px"],["cols","6","rows","3",3,"gutterSize"],["mat-raised-button","","title","Move to origin",1,"icon-button",3,"disabled","click"],["mat-raised-button","",1,"icon-button",3,"disabled","title","click"],[1,"b-left"],["multiple","",3,"ngModel","ngModelChange","change"],["title","Preview y-axis",1,"icon-button",3,"disabled","value"],["title","Preview x-axis",1,"icon-button",3,"disabled","value"],[2,"transform","rotate(90deg)"],["title","Preview frame",1,"icon-button",3,"disabled","value"],[1,"size-sm"],["matInput","","type","number","min","0.1","max","10","step","0.1","title","Distance to move on click",1,"distance",3,"ngModel","ngModelChange"],["align","end"],["colspan","2",1,"b-left","b-top"],[1,"size-m"],["matInput","","type","number","min","1","max","100","step","1","title","Laser power (1-100)",1,"distance",3,"ngModel","ngModelChange"],["align","start"],[1,"b-top"],["mat-raised-button","","class","icon-button","title","Start engraving",3,"disabled","click",4,"ngIf"],["mat-raised-button","","class","icon-button","title","Stop engraving",3,"disabled","click",4,"ngIf"],["colspan","2",1,"b-left"],["matInput","","type","number","min","1","max","100","step","1","title","Engraving Depth (1-100)",1,"distance",3,"ngModel","ngModelChange"],[1,"separator","padded"],[2,"display","flex"],[2,"width","92px","height","186px"],["cols","1","rows","4","rowHeight","2:1",3,"gutterSize"],[3,"ngModel","ngModelChange"],["title","Image","value","image",1,"icon-button",3,"disabled","change"],["title","Text","value","text",1,"icon-button",3,"disabled","change"],["title","Use top-left as reference",1,"icon-button",3,"disabled","value"],[2,"transform","scale(-1,1)"],["title","Use center as reference",1,"icon-button",3,"disabled","value"],["mat-raised-button","","title","Rotate ccw",1,"icon-button",3,"disabled","click"],["mat-raised-button","","title","Rotate cw",1,"icon-button",3,"disabled","click"],["mat-raised-button","","title","Mirror vertical",1,"icon-button",3,"disabled","click"],["mat-raised-button","","title","Mirror horizontal",1,"icon-button",3,"disabled","click"],["class","inline",4,"ngIf"],["class","upload inline",4,"ngIf"],[1,"inline","spacing"],[3,"label","pxPerMm","value","valueChange"],[1,"spacer"],[1,"spacing"],[3,"center"],["id","log"],["scrolllog",""],[4,"ngFor","ngForOf"],["mat-raised-button","","title","Connect to engraver",1,"icon-button",3,"disabled","click"],["mat-raised-button","","title","Disconnect from engraver",1,"icon-button",3,"disabled","click"],[1,"over"],["mat-raised-button","","title","Switch fan on",1,"icon-button",3,"disabled","click"],["mat-raised-button","","title","Switch fan off",1,"icon-button",3,"disabled","click"],["mat-raised-button","","title","Start engraving",1,"icon-button",3,"disabled","click"],["mat-raised-button","","title","Stop engraving",1,"icon-button",3,"disabled","click"],[1,"inline"],[1,"numeric-field"],["matInput","","ngDefaultControl","","type","number","min","-10","max","10","step","0.1","title","Contrast between -10 and 10","ngDefaultControl","",1,"numericinput",3,"ngModel","ngModelChange"],["align","start",1,"numerichint"],["matInput","","ngDefaultControl","","type","number","min","-10","max","10","step","0.1","title","Brightness between -10 and 10","ngDefaultControl","",1,"numericinput",3,"ngModel","ngModelChange"],[1,"upload","inline"],[3,"disabled","uploadURL","completed"],[1,"nopadding",2,"width","480px"],["matInput","",1,"text-input",3,"disabled","ngModel","ngModelChange"],["mat-button","","matSuffix","","mat-icon-button","","aria-label","Clear",3,"click",4,"ngIf"],[1,"nopadding",2,"width","320px"],[3,"disabled","value","valueChange","selectionChange"],[3,"value",4,"ngFor","ngForOf"],["mat-button","","matSuffix","","mat-icon-button","","aria-label","Clear",3,"click"],[3,"value"]],template:function(t,e){1&t&&(Ka(0,"mat-card"),Ka(1,"mat-card-header"),Ka(2,"mat-card-title"),Is(3),Ga(),Ga(),Ka(4,"mat-card-content"),Ka(5,"div",0),Ka(6,"div",1),Ka(7,"div",2),Ba(8,Dw,3,1,"button",3),Ba(9,Fw,5,1,"button",4),Ba(10,Nw,3,1,"button",5),Ba(11,Mw,5,1,"button",6),Ga(),Ka(12,"div",7),Ka(13,"div"),Ka(14,"mat-grid-list",8),Ka(15,"mat-grid-tile"),Ka(16,"button",9),Ja("click",(function(){return e.home()})),Ka(17,"mat-icon"),Is(18,"home"),Ga(),Ga(),Ga(),Ka(19,"mat-grid-tile"),Ka(20,"button",10),Ja("click",(function(){return e.moveUp()})),Ka(21,"mat-icon"),Is(22,"expand_less"),Ga(),Ga(),Ga(),Za(23,"mat-grid-tile"),Ka(24,"mat-grid-tile",11),Ka(25,"mat-button-toggle-group",12),Ja("ngModelChange",(function(t){return e.xyCenter=t}))("change",(function(){return e.frame()})),Ka(26,"mat-button-toggle",13),Ka(27,"mat-icon"),Is(28,"settings_ethernet"),Ga(),Ga(),Ga(),Ga(),Ka(29,"mat-grid-tile"),Ka(30,"mat-button-toggle-group",12),Ja("ngModelChange",(function(t){return e.xyCenter=t}))("change",(function(){return e.frame()})),Ka(31,"mat-button-toggle",14),Ka(32,"mat-icon",15),Is(33,"settings_ethernet"),Ga(),Ga(),Ga(),Ga(),Ka(34,"mat-grid-tile"),Ka(35,"mat-button-toggle-group",12),Ja("ngModelChange",(function(t){return e.xyCenter=t}))("change",(function(){return e.frame()})),Ka(36,"mat-button-toggle",16),Ka(37,"mat-icon"),Is(38,"crop_din"),Ga(),Ga(),Ga(),Ga(),Ka(39,"mat-grid-tile"),Ka(40,"button",10),Ja("click",(function(){return e.moveLeft()})),Ka(41,"mat-icon"),Is(42,"chevron_left"),Ga(),Ga(),Ga(),Ka(43,"mat-grid-tile"),Ka(44,"mat-form-field",17),Ka(45,"input",18),Ja("ngModelChange",(function(t){return e.moveDistance=t})),Ga(),Ka(46,"mat-hint",19),Is(47,"mm "),Ga(),Ga(),Ga(),Ka(48,"mat-grid-tile"),Ka(49,"button",10),Ja("click",(function(){return e.moveRight()})),Ka(50,"mat-icon"),Is(51,"chevron_right"),Ga(),Ga(),Ga(),Ka(52,"mat-grid-tile",20),Ka(53,"mat-form-field",21),Ka(54,"input",22),Ja("ngModelChange",(function(t){return e.power=t})),Ga(),Ka(55,"mat-hint",23),Is(56,"Laser Power "),Ga(),Ga(),Ga(),Ka(57,"mat-grid-tile",24),Ba(58,Vw,3,1,"button",25),Ba(59,Lw,5,1,"button",26),Ga(),Za(60,"mat-grid-tile"),Ka(61,"mat-grid-tile"),Ka(62,"button",10),Ja("click",(function(){return e.moveDown()})),Ka(63,"mat-icon"),Is(64,"expand_more"),Ga(),Ga(),Ga(),Za(65,"mat-grid-tile"),Ka(66,"mat-grid-tile",27),Ka(67,"mat-form-field",21),Ka(68,"input",28),Ja("ngModelChange",(function(t){return e.depth=t})),Ga(),Ka(69,"mat-hint",23),Is(70,"Depth"),Ga(),Ga(),Ga(),Za(71,"mat-grid-tile"),Ga(),Ga(),Ga(),Ga(),Ka(72,"div",29),Ka(73,"div",30),Ka(74,"div",31),Ka(75,"mat-grid-list",32),Ka(76,"mat-grid-tile"),Ka(77,"mat-button-toggle-group",33),Ja("ngModelChange",(function(t){return e.mode=t})),Ka(78,"mat-button-toggle",34),Ja("change",(function(){return e.imageSelected()})),Ka(79,"mat-icon"),Is(80,"image"),Ga(),Ga(),Ka(81,"mat-button-toggle",35),Ja("change",(function(){return e.textSelected()})),Ka(82,"mat-icon"),Is(83,"title"),Ga(),Ga(),Ga(),Ga(),Ka(84,"mat-grid-tile"),Ka(85,"mat-button-toggle-group",33),Ja("ngModelChange",(function(t){return e.useCenter=t})),Ka(86,"mat-button-toggle",36),Ka(87,"mat-icon",37),Is(88,"open_in_new"),Ga(),Ga(),Ka(89,"mat-button-toggle",38),Ka(90,"mat-icon"),Is(91,"filter_center_focus"),Ga(),Ga(),Ga(),Ga(),Ka(92,"mat-grid-tile"),Ka(93,"button",39),Ja("click",(function(){return e.rotateClicked(1)})),Ka(94,"mat-icon"),Is(95,"rotate_left"),Ga(),Ga(),Ka(96,"button",40),Ja("click",(function(){return e.rotateClicked(-1)})),Ka(97,"mat-icon"),Is(98,"rotate_right"),Ga(),Ga(),Ga(),Ka(99,"mat-grid-tile"),Ka(100,"button",41),Ja("click",(function(){return e.mirrorClicked(1)})),Ka(101,"mat-icon"),Is(102,"swap_vert"),Ga(),Ga(),Ka(103,"button",42),Ja("click",(function(){return e.mirrorClicked(2)})),Ka(104,"mat-icon"),Is(105,"swap_horiz"),Ga(),Ga(),Ga(),Ga(),Ga(),Ka(106,"div"),Ba(107,jw,11,2,"div",43),Ba(108,Bw,2,2,"div",44),Ba(109,Uw,8,6,"div",43),Ga(),Ga(),Ka(110,"div"),Ka(111,"div",45),Ka(112,"size-input",46),Ja("valueChange",(function(t){return e.width=t}))("valueChange",(function(t){return e.widthUpdate.next(t)})),Ga(),Ga(),Za(113,"div",47),Ka(114,"div",45),Ka(115,"size-input",46),Ja("valueChange",(function(t){return e.height=t}))("valueChange",(function(t){return e.heightUpdate.next(t)})),Ga(),Ga(),Ga(),Ga(),Ga(),Ga(),Ga(),Ka(116,"mat-card"),Ka(117,"mat-card-content"),Ka(118,"div",48),Za(119,"image-display",49),Ga(),Ga(),Ga(),Ka(120,"mat-card"),Ka(121,"mat-card-header"),Ka(122,"mat-card-title"),Is(123,"Messages"),Ga(),Ga(),Ka(124,"mat-card-content"),Ka(125,"div",50,51),Ba(127,qw,3,1,"span",52),Ga(),Ga(),Ga()),2&t&&(Lr(3),Ps("KKEngraver ",e.version,""),Lr(5),qa("ngIf",!e.status.connected),Lr(1),qa("ngIf",e.status.connected),Lr(1),qa("ngIf",!e.status.fanOn),Lr(1),qa("ngIf",e.status.fanOn),Lr(3),qa("gutterSize",0),Lr(2),qa("disabled",e.totalDisabled),Lr(4),cs("title","Move y-axis -",e.moveDistance," mm"),qa("disabled",e.totalDisabled),Lr(5),qa("ngModel",e.xyCenter),Lr(1),qa("disabled",e.totalDisabled&&"y"!=e.xyCenterSaved)("value","y"),Lr(4),qa("ngModel",e.xyCenter),Lr(1),qa("disabled",e.totalDisabled&&"x"!=e.xyCenterSaved)("value","x"),Lr(4),qa("ngModel",e.xyCenter),Lr(1),qa("disabled",e.totalDisabled&&""!=e.xyCenterSaved)("value",""),Lr(4),cs("title","Move x-axis -",e.moveDistance," mm"),qa("disabled",e.totalDisabled),Lr(5),qa("ngModel",e.moveDistance),Lr(4),cs("title","Move x-axis ",e.moveDistance," mm"),qa("disabled",e.totalDisabled),Lr(5),qa("ngModel",e.power),Lr(4),qa("ngIf",!e.status.engraving),Lr(1),qa("ngIf",e.status.engraving),Lr(3),cs("title","y-axis ",e.moveDistance," mm"),qa("disabled",e.totalDisabled),Lr(6),qa("ngModel",e.depth),Lr(7),qa("gutterSize",0),Lr(2),qa("ngModel",e.mode),Lr(1),qa("disabled",e.disabled),Lr(3),qa("disabled",e.disabled),Lr(4),qa("ngModel",e.useCenter),Lr(1),qa("disabled",e.disabled)("value",!1),Lr(3),qa("disabled",e.disabled)("value",!0),Lr(4),qa("disabled",e.disabled),Lr(3),qa("disabled",e.disabled),Lr(4),qa("disabled",e.disabled),Lr(3),qa("disabled",e.disabled),Lr(4),qa("ngIf","image"==e.mode),Lr(1),qa("ngIf","image"==e.mode),Lr(1),qa("ngIf","text"==e.mode),Lr(3),qa("label","max. Width")("pxPerMm",e.pxPerMm)("value",e.width),Lr(3),qa("label","max. Height")("pxPerMm",e.pxPerMm)("value",e.height),Lr(4),qa("center",e.useCenter),Lr(8),qa("ngForOf",e.log))},directives:[_b,bb,gb,yb,Rc,Nb,xb,Hb,ak,vk,cv,om,yk,Xk,aw,Cv,rv,Hk,uw,Ym,Oc,hw,Iw,Kk,V_],styles:[""]}),t}(),Kw=function(){var t=function t(){y(this,t)};return t.\u0275mod=Le({type:t}),t.\u0275inj=It({factory:function(e){return new(e||t)},imports:[[s_],s_]}),t}(),Gw=function(){var t=function t(){y(this,t)};return t.\u0275mod=Le({type:t}),t.\u0275inj=It({factory:function(e){return new(e||t)},imports:[[jc,s_],s_]}),t}(),Zw=function(){function t(){}return t.\u0275mod=Le({type:t,bootstrap:[Ww]}),t.\u0275inj=It({factory:function(e){return new(e||t)},providers:[Lm,{provide:C_,useValue:{disabled:!0}}],imports:[[yh,fp,zb,kb,Kw,Mb,sk,gk,Gw,sw,lb,lm,Rw,Yp]]}),t}();
+var r,o,a}var _w=[[["mat-select-trigger"]],"*"],bw=["mat-select-trigger","*"],kw={transformPanelWrap:kh("transformPanelWrap",[Eh("* => void",Ah("@transformPanel",[Th()],{optional:!0}))]),transformPanel:kh("transformPanel",[xh("void",Sh({transform:"scaleY(0.8)",minWidth:"100%",opacity:0})),xh("showing",Sh({opacity:1,minWidth:"calc(100% + 32px)",transform:"scaleY(1)"})),xh("showing-multiple",Sh({opacity:1,minWidth:"calc(100% + 64px)",transform:"scaleY(1)"})),Eh("void => *",wh("120ms cubic-bezier(0, 0, 0.2, 1)")),Eh("* => void",wh("100ms 25ms linear",Sh({opacity:0})))])},ww=0,Cw=256,Sw=new re("mat-select-scroll-strategy"),xw=new re("MAT_SELECT_CONFIG"),Ew={provide:Sw,deps:[xg],useFactory:function(t){return function(){return t.scrollStrategies.reposition()}}},Tw=function t(e,n){y(this,t),this.source=e,this.value=n},Aw=c_(h_(u_(f_((function t(e,n,i,r,o){y(this,t),this._elementRef=e,this._defaultErrorStateMatcher=n,this._parentForm=i,this._parentFormGroup=r,this.ngControl=o}))))),Ow=new re("MatSelectTrigger"),Iw=function(){var t=function(t){f(n,t);var e=m(n);function n(t,i,r,a,s,u,c,h,f,d,p,v,m,g){var _,b;return y(this,n),(_=e.call(this,s,a,c,h,d))._viewportRuler=t,_._changeDetectorRef=i,_._ngZone=r,_._dir=u,_._parentFormField=f,_.ngControl=d,_._liveAnnouncer=m,_._panelOpen=!1,_._required=!1,_._scrollTop=0,_._multiple=!1,_._compareWith=function(t,e){return t===e},_._uid="mat-select-".concat(ww++),_._triggerAriaLabelledBy=null,_._destroy=new z,_._triggerFontSize=0,_._onChange=function(){},_._onTouched=function(){},_._valueId="mat-select-value-".concat(ww++),_._transformOrigin="top",_._panelDoneAnimatingStream=new z,_._offsetY=0,_._positions=[{originX:"start",originY:"top",overlayX:"start",overlayY:"top"},{originX:"start",originY:"bottom",overlayX:"start",overlayY:"bottom"}],_._disableOptionCentering=!1,_._focused=!1,_.controlType="mat-select",_.ariaLabel="",_.optionSelectionChanges=(b=function(){var t=_.options;return t?t.changes.pipe(my(t),yy((function(){return ct.apply(void 0,l(t.map((function(t){return t.onSelectionChange}))))}))):_._ngZone.onStable.pipe(Gy(1),yy((function(){return _.optionSelectionChanges})))},new V((function(t){var e;try{e=b()}catch(n){return void t.error(n)}return(e?et(e):mm()).subscribe(t)}))),_.openedChange=new qu,_._openedStream=_.openedChange.pipe(vp((function(t){return t})),W((function(){}))),_._closedStream=_.openedChange.pipe(vp((function(t){return!t})),W((function(){}))),_.selectionChange=new qu,_.valueChange=new qu,_.ngControl&&(_.ngControl.valueAccessor=o(_)),_._scrollStrategyFactory=v,_._scrollStrategy=_._scrollStrategyFactory(),_.tabIndex=parseInt(p)||0,_.id=_.id,g&&(null!=g.disableOptionCentering&&(_.disableOptionCentering=g.disableOptionCentering),null!=g.typeaheadDebounceInterval&&(_.typeaheadDebounceInterval=g.typeaheadDebounceInterval)),_}return _(n,[{key:"ngOnInit",value:function(){var t=this;this._selectionModel=new Dy(this.multiple),this.stateChanges.next(),this._panelDoneAnimatingStream.pipe(qm(),hy(this._destroy)).subscribe((function(){t.panelOpen?(t._scrollTop=0,t.openedChange.emit(!0)):(t.openedChange.emit(!1),t.overlayDir.offsetX=0,t._changeDetectorRef.markForCheck())})),this._viewportRuler.change().pipe(hy(this._destroy)).subscribe((function(){t._panelOpen&&(t._triggerRect=t.trigger.nativeElement.getBoundingClientRect(),t._changeDetectorRef.markForCheck())}))}},{key:"ngAfterContentInit",value:function(){var t=this;this._initKeyManager(),this._selectionModel.changed.pipe(hy(this._destroy)).subscribe((function(t){t.added.forEach((function(t){return t.select()})),t.removed.forEach((function(t){return t.deselect()}))})),this.options.changes.pipe(my(null),hy(this._destroy)).subscribe((function(){t._resetOptions(),t._initializeSelection()}))}},{key:"ngDoCheck",value:function(){var t=this._getTriggerAriaLabelledby();if(t!==this._triggerAriaLabelledBy){var e=this._elementRef.nativeElement;this._triggerAriaLabelledBy=t,t?e.setAttribute("aria-labelledby",t):e.removeAttribute("aria-labelledby")}this.ngControl&&this.updateErrorState()}},{key:"ngOnChanges",value:function(t){t.disabled&&this.stateChanges.next(),t.typeaheadDebounceInterval&&this._keyManager&&this._keyManager.withTypeAhead(this._typeaheadDebounceInterval)}},{key:"ngOnDestroy",value:function(){this._destroy.next(),this._destroy.complete(),this.stateChanges.complete()}},{key:"toggle",value:function(){this.panelOpen?this.close():this.open()}},{key:"open",value:function(){var t=this;!this.disabled&&this.options&&this.options.length&&!this._panelOpen&&(this._triggerRect=this.trigger.nativeElement.getBoundingClientRect(),this._triggerFontSize=parseInt(getComputedStyle(this.trigger.nativeElement).fontSize||"0"),this._panelOpen=!0,this._keyManager.withHorizontalOrientation(null),this._calculateOverlayPosition(),this._highlightCorrectOption(),this._changeDetectorRef.markForCheck(),this._ngZone.onStable.pipe(Gy(1)).subscribe((function(){t._triggerFontSize&&t.overlayDir.overlayRef&&t.overlayDir.overlayRef.overlayElement&&(t.overlayDir.overlayRef.overlayElement.style.fontSize="".concat(t._triggerFontSize,"px"))})))}},{key:"close",value:function(){this._panelOpen&&(this._panelOpen=!1,this._keyManager.withHorizontalOrientation(this._isRtl()?"rtl":"ltr"),this._changeDetectorRef.markForCheck(),this._onTouched())}},{key:"writeValue",value:function(t){this.value=t}},{key:"registerOnChange",value:function(t){this._onChange=t}},{key:"registerOnTouched",value:function(t){this._onTouched=t}},{key:"setDisabledState",value:function(t){this.disabled=t,this._changeDetectorRef.markForCheck(),this.stateChanges.next()}},{key:"_isRtl",value:function(){return!!this._dir&&"rtl"===this._dir.value}},{key:"_handleKeydown",value:function(t){this.disabled||(this.panelOpen?this._handleOpenKeydown(t):this._handleClosedKeydown(t))}},{key:"_handleClosedKeydown",value:function(t){var e=t.keyCode,n=40===e||38===e||37===e||39===e,i=13===e||32===e,r=this._keyManager;if(!r.isTyping()&&i&&!$y(t)||(this.multiple||t.altKey)&&n)t.preventDefault(),this.open();else if(!this.multiple){var o=this.selected;r.onKeydown(t);var a=this.selected;a&&o!==a&&this._liveAnnouncer.announce(a.viewValue,1e4)}}},{key:"_handleOpenKeydown",value:function(t){var e=this._keyManager,n=t.keyCode,i=40===n||38===n,r=e.isTyping();if(i&&t.altKey)t.preventDefault(),this.close();else if(r||13!==n&&32!==n||!e.activeItem||$y(t))if(!r&&this._multiple&&65===n&&t.ctrlKey){t.preventDefault();var o=this.options.some((function(t){return!t.disabled&&!t.selected}));this.options.forEach((function(t){t.disabled||(o?t.select():t.deselect())}))}else{var a=e.activeItemIndex;e.onKeydown(t),this._multiple&&i&&t.shiftKey&&e.activeItem&&e.activeItemIndex!==a&&e.activeItem._selectViaInteraction()}else t.preventDefault(),e.activeItem._selectViaInteraction()}},{key:"_onFocus",value:function(){this.disabled||(this._focused=!0,this.stateChanges.next())}},{key:"_onBlur",value:function(){this._focused=!1,this.disabled||this.panelOpen||(this._onTouched(),this._changeDetectorRef.markForCheck(),this.stateChanges.next())}},{key:"_onAttached",value:function(){var t=this;this.overlayDir.positionChange.pipe(Gy(1)).subscribe((function(){t._changeDetectorRef.detectChanges(),t._calculateOverlayOffsetX(),t.panel.nativeElement.scrollTop=t._scrollTop}))}},{key:"_getPanelTheme",value:function(){return this._parentFormField?"mat-".concat(this._parentFormField.color):""}},{key:"_initializeSelection",value:function(){var t=this;Promise.resolve().then((function(){t._setSelectionByValue(t.ngControl?t.ngControl.value:t._value),t.stateChanges.next()}))}},{key:"_setSelectionByValue",value:function(t){var e=this;if(this.multiple&&t)Array.isArray(t),this._selectionModel.clear(),t.forEach((function(t){return e._selectValue(t)})),this._sortValues();else{this._selectionModel.clear();var n=this._selectValue(t);n?this._keyManager.updateActiveItem(n):this.panelOpen||this._keyManager.updateActiveItem(-1)}this._changeDetectorRef.markForCheck()}},{key:"_selectValue",value:function(t){var e=this,n=this.options.find((function(n){try{return null!=n.value&&e._compareWith(n.value,t)}catch(i){return!1}}));return n&&this._selectionModel.select(n),n}},{key:"_initKeyManager",value:function(){var t=this;this._keyManager=new Mg(this.options).withTypeAhead(this._typeaheadDebounceInterval).withVerticalOrientation().withHorizontalOrientation(this._isRtl()?"rtl":"ltr").withHomeAndEnd().withAllowedModifierKeys(["shiftKey"]),this._keyManager.tabOut.pipe(hy(this._destroy)).subscribe((function(){t.panelOpen&&(!t.multiple&&t._keyManager.activeItem&&t._keyManager.activeItem._selectViaInteraction(),t.focus(),t.close())})),this._keyManager.change.pipe(hy(this._destroy)).subscribe((function(){t._panelOpen&&t.panel?t._scrollActiveOptionIntoView():t._panelOpen||t.multiple||!t._keyManager.activeItem||t._keyManager.activeItem._selectViaInteraction()}))}},{key:"_resetOptions",value:function(){var t=this,e=ct(this.options.changes,this._destroy);this.optionSelectionChanges.pipe(hy(e)).subscribe((function(e){t._onSelect(e.source,e.isUserInput),e.isUserInput&&!t.multiple&&t._panelOpen&&(t.close(),t.focus())})),ct.apply(void 0,l(this.options.map((function(t){return t._stateChanges})))).pipe(hy(e)).subscribe((function(){t._changeDetectorRef.markForCheck(),t.stateChanges.next()}))}},{key:"_onSelect",value:function(t,e){var n=this._selectionModel.isSelected(t);null!=t.value||this._multiple?(n!==t.selected&&(t.selected?this._selectionModel.select(t):this._selectionModel.deselect(t)),e&&this._keyManager.setActiveItem(t),this.multiple&&(this._sortValues(),e&&this.focus())):(t.deselect(),this._selectionModel.clear(),null!=this.value&&this._propagateChanges(t.value)),n!==this._selectionModel.isSelected(t)&&this._propagateChanges(),this.stateChanges.next()}},{key:"_sortValues",value:function(){var t=this;if(this.multiple){var e=this.options.toArray();this._selectionModel.sort((function(n,i){return t.sortComparator?t.sortComparator(n,i,e):e.indexOf(n)-e.indexOf(i)})),this.stateChanges.next()}}},{key:"_propagateChanges",value:function(t){var e;e=this.multiple?this.selected.map((function(t){return t.value})):this.selected?this.selected.value:t,this._value=e,this.valueChange.emit(e),this._onChange(e),this.selectionChange.emit(new Tw(this,e)),this._changeDetectorRef.markForCheck()}},{key:"_highlightCorrectOption",value:function(){this._keyManager&&(this.empty?this._keyManager.setFirstItemActive():this._keyManager.setActiveItem(this._selectionModel.selected[0]))}},{key:"_scrollActiveOptionIntoView",value:function(){var t,e,n,i=this._keyManager.activeItemIndex||0,r=L_(i,this.options,this.optionGroups),o=this._getItemHeight();this.panel.nativeElement.scrollTop=(e=o,(t=(i+r)*o)<(n=this.panel.nativeElement.scrollTop)?t:t+e>n+256?Math.max(0,t-256+e):n)}},{key:"focus",value:function(t){this._elementRef.nativeElement.focus(t)}},{key:"_getOptionIndex",value:function(t){return this.options.reduce((function(e,n,i){return void 0!==e?e:t===n?i:void 0}),void 0)}},{key:"_calculateOverlayPosition",value:function(){var t=this._getItemHeight(),e=this._getItemCount(),n=Math.min(e*t,Cw),i=e*t-n,r=this.empty?0:this._getOptionIndex(this._selectionModel.selected[0]);r+=L_(r,this.options,this.optionGroups);var o=n/2;this._scrollTop=this._calculateOverlayScroll(r,o,i),this._offsetY=this._calculateOverlayOffsetY(r,o,i),this._checkOverlayWithinViewport(i)}},{key:"_calculateOverlayScroll",value:function(t,e,n){var i=this._getItemHeight();return Math.min(Math.max(0,i*t-e+i/2),n)}},{key:"_getPanelAriaLabelledby",value:function(){if(this.ariaLabel)return null;var t=this._getLabelId();return this.ariaLabelledby?t+" "+this.ariaLabelledby:t}},{key:"_getAriaActiveDescendant",value:function(){return this.panelOpen&&this._keyManager&&this._keyManager.activeItem?this._keyManager.activeItem.id:null}},{key:"_getLabelId",value:function(){var t;return(null===(t=this._parentFormField)||void 0===t?void 0:t.getLabelId())||""}},{key:"_calculateOverlayOffsetX",value:function(){var t,e=this.overlayDir.overlayRef.overlayElement.getBoundingClientRect(),n=this._viewportRuler.getViewportSize(),i=this._isRtl(),r=this.multiple?56:32;if(this.multiple)t=40;else{var o=this._selectionModel.selected[0]||this.options.first;t=o&&o.group?32:16}i||(t*=-1);var a=0-(e.left+t-(i?r:0)),s=e.right+t-n.width+(i?0:r);a>0?t+=a+8:s>0&&(t-=s+8),this.overlayDir.offsetX=Math.round(t),this.overlayDir.overlayRef.updatePosition()}},{key:"_calculateOverlayOffsetY",value:function(t,e,n){var i,r=this._getItemHeight(),o=(r-this._triggerRect.height)/2,a=Math.floor(Cw/r);return this._disableOptionCentering?0:(i=0===this._scrollTop?t*r:this._scrollTop===n?(t-(this._getItemCount()-a))*r+(r-(this._getItemCount()*r-Cw)%r):e-r/2,Math.round(-1*i-o))}},{key:"_checkOverlayWithinViewport",value:function(t){var e=this._getItemHeight(),n=this._viewportRuler.getViewportSize(),i=this._triggerRect.top-8,r=n.height-this._triggerRect.bottom-8,o=Math.abs(this._offsetY),a=Math.min(this._getItemCount()*e,Cw)-o-this._triggerRect.height;a>r?this._adjustPanelUp(a,r):o>i?this._adjustPanelDown(o,i,t):this._transformOrigin=this._getOriginBasedOnOption()}},{key:"_adjustPanelUp",value:function(t,e){var n=Math.round(t-e);this._scrollTop-=n,this._offsetY-=n,this._transformOrigin=this._getOriginBasedOnOption(),this._scrollTop<=0&&(this._scrollTop=0,this._offsetY=0,this._transformOrigin="50% bottom 0px")}},{key:"_adjustPanelDown",value:function(t,e,n){var i=Math.round(t-e);if(this._scrollTop+=i,this._offsetY+=i,this._transformOrigin=this._getOriginBasedOnOption(),this._scrollTop>=n)return this._scrollTop=n,this._offsetY=0,void(this._transformOrigin="50% top 0px")}},{key:"_getOriginBasedOnOption",value:function(){var t=this._getItemHeight(),e=(t-this._triggerRect.height)/2,n=Math.abs(this._offsetY)-e+t/2;return"50% ".concat(n,"px 0px")}},{key:"_getItemCount",value:function(){return this.options.length+this.optionGroups.length}},{key:"_getItemHeight",value:function(){return 3*this._triggerFontSize}},{key:"_getTriggerAriaLabelledby",value:function(){if(this.ariaLabel)return null;var t=this._getLabelId()+" "+this._valueId;return this.ariaLabelledby&&(t+=" "+this.ariaLabelledby),t}},{key:"setDescribedByIds",value:function(t){this._ariaDescribedby=t.join(" ")}},{key:"onContainerClick",value:function(){this.focus(),this.open()}},{key:"focused",get:function(){return this._focused||this._panelOpen}},{key:"placeholder",get:function(){return this._placeholder},set:function(t){this._placeholder=t,this.stateChanges.next()}},{key:"required",get:function(){return this._required},set:function(t){this._required=Xm(t),this.stateChanges.next()}},{key:"multiple",get:function(){return this._multiple},set:function(t){this._multiple=Xm(t)}},{key:"disableOptionCentering",get:function(){return this._disableOptionCentering},set:function(t){this._disableOptionCentering=Xm(t)}},{key:"compareWith",get:function(){return this._compareWith},set:function(t){this._compareWith=t,this._selectionModel&&this._initializeSelection()}},{key:"value",get:function(){return this._value},set:function(t){t!==this._value&&(this.options&&this._setSelectionByValue(t),this._value=t)}},{key:"typeaheadDebounceInterval",get:function(){return this._typeaheadDebounceInterval},set:function(t){this._typeaheadDebounceInterval=$m(t)}},{key:"id",get:function(){return this._id},set:function(t){this._id=t||this._uid,this.stateChanges.next()}},{key:"panelOpen",get:function(){return this._panelOpen}},{key:"selected",get:function(){return this.multiple?this._selectionModel.selected:this._selectionModel.selected[0]}},{key:"triggerValue",get:function(){if(this.empty)return"";if(this._multiple){var t=this._selectionModel.selected.map((function(t){return t.viewValue}));return this._isRtl()&&t.reverse(),t.join(", ")}return this._selectionModel.selected[0].viewValue}},{key:"empty",get:function(){return!this._selectionModel||this._selectionModel.isEmpty()}},{key:"shouldLabelFloat",get:function(){return this._panelOpen||!this.empty}}]),n}(Aw);return t.\u0275fac=function(e){return new(e||t)(za(Ny),za(pa),za(Dl),za(d_),za(tu),za(Ry,8),za(nm,8),za(sm,8),za(Yk,8),za(uv,10),Ua("tabindex"),za(Sw),za(qg),za(xw,8))},t.\u0275cmp=Fe({type:t,selectors:[["mat-select"]],contentQueries:function(t,e,n){var i;1&t&&(ol(n,Ow,!0),ol(n,V_,!0),ol(n,P_,!0)),2&t&&(el(i=ul())&&(e.customTrigger=i.first),el(i=ul())&&(e.options=i),el(i=ul())&&(e.optionGroups=i))},viewQuery:function(t,e){var n;1&t&&(il(fw,!0),il(dw,!0),il(Og,!0)),2&t&&(el(n=ul())&&(e.trigger=n.first),el(n=ul())&&(e.panel=n.first),el(n=ul())&&(e.overlayDir=n.first))},hostAttrs:["role","combobox","aria-autocomplete","none","aria-haspopup","true",1,"mat-select"],hostVars:20,hostBindings:function(t,e){1&t&&Ja("keydown",(function(t){return e._handleKeydown(t)}))("focus",(function(){return e._onFocus()}))("blur",(function(){return e._onBlur()})),2&t&&(La("id",e.id)("tabindex",e.tabIndex)("aria-controls",e.panelOpen?e.id+"-panel":null)("aria-expanded",e.panelOpen)("aria-label",e.ariaLabel||null)("aria-required",e.required.toString())("aria-disabled",e.disabled.toString())("aria-invalid",e.errorState)("aria-describedby",e._ariaDescribedby||null)("aria-activedescendant",e._getAriaActiveDescendant()),_s("mat-select-disabled",e.disabled)("mat-select-invalid",e.errorState)("mat-select-required",e.required)("mat-select-empty",e.empty)("mat-select-multiple",e.multiple))},inputs:{disabled:"disabled",disableRipple:"disableRipple",tabIndex:"tabIndex",ariaLabel:["aria-label","ariaLabel"],id:"id",disableOptionCentering:"disableOptionCentering",typeaheadDebounceInterval:"typeaheadDebounceInterval",placeholder:"placeholder",required:"required",multiple:"multiple",compareWith:"compareWith",value:"value",panelClass:"panelClass",ariaLabelledby:["aria-labelledby","ariaLabelledby"],errorStateMatcher:"errorStateMatcher",sortComparator:"sortComparator"},outputs:{openedChange:"openedChange",_openedStream:"opened",_closedStream:"closed",selectionChange:"selectionChange",valueChange:"valueChange"},exportAs:["matSelect"],features:[Qs([{provide:Lk,useExisting:t},{provide:N_,useExisting:t}]),Ms,tn],ngContentSelectors:bw,decls:9,vars:10,consts:[["cdk-overlay-origin","",1,"mat-select-trigger",3,"click"],["origin","cdkOverlayOrigin","trigger",""],[1,"mat-select-value",3,"ngSwitch"],["class","mat-select-placeholder",4,"ngSwitchCase"],["class","mat-select-value-text",3,"ngSwitch",4,"ngSwitchCase"],[1,"mat-select-arrow-wrapper"],[1,"mat-select-arrow"],["cdk-connected-overlay","","cdkConnectedOverlayLockPosition","","cdkConnectedOverlayHasBackdrop","","cdkConnectedOverlayBackdropClass","cdk-overlay-transparent-backdrop",3,"cdkConnectedOverlayScrollStrategy","cdkConnectedOverlayOrigin","cdkConnectedOverlayOpen","cdkConnectedOverlayPositions","cdkConnectedOverlayMinWidth","cdkConnectedOverlayOffsetY","backdropClick","attach","detach"],[1,"mat-select-placeholder"],[1,"mat-select-value-text",3,"ngSwitch"],[4,"ngSwitchDefault"],[4,"ngSwitchCase"],[1,"mat-select-panel-wrap"],["role","listbox","tabindex","-1",3,"ngClass","keydown"],["panel",""]],template:function(t,e){if(1&t&&(ss(_w),Ka(0,"div",0,1),Ja("click",(function(){return e.toggle()})),Ka(3,"div",2),Ba(4,pw,2,1,"span",3),Ba(5,yw,3,2,"span",4),Ga(),Ka(6,"div",5),Za(7,"div",6),Ga(),Ga(),Ba(8,gw,4,14,"ng-template",7),Ja("backdropClick",(function(){return e.close()}))("attach",(function(){return e._onAttached()}))("detach",(function(){return e.close()}))),2&t){var n=Ha(1);Lr(3),qa("ngSwitch",e.empty),La("id",e._valueId),Lr(1),qa("ngSwitchCase",!0),Lr(1),qa("ngSwitchCase",!1),Lr(3),qa("cdkConnectedOverlayScrollStrategy",e._scrollStrategy)("cdkConnectedOverlayOrigin",n)("cdkConnectedOverlayOpen",e.panelOpen)("cdkConnectedOverlayPositions",e._positions)("cdkConnectedOverlayMinWidth",null==e._triggerRect?null:e._triggerRect.width)("cdkConnectedOverlayOffsetY",e._offsetY)}},directives:[Ag,Mc,Vc,Og,Lc,Tc],styles:[".mat-select{display:inline-block;width:100%;outline:none}.mat-select-trigger{display:inline-table;cursor:pointer;position:relative;box-sizing:border-box}.mat-select-disabled .mat-select-trigger{-webkit-user-select:none;-moz-user-select:none;-ms-user-select:none;user-select:none;cursor:default}.mat-select-value{display:table-cell;max-width:0;width:100%;overflow:hidden;text-overflow:ellipsis;white-space:nowrap}.mat-select-value-text{white-space:nowrap;overflow:hidden;text-overflow:ellipsis}.mat-select-arrow-wrapper{display:table-cell;vertical-align:middle}.mat-form-field-appearance-fill .mat-select-arrow-wrapper{transform:translateY(-50%)}.mat-form-field-appearance-outline .mat-select-arrow-wrapper{transform:translateY(-25%)}.mat-form-field-appearance-standard.mat-form-field-has-label .mat-select:not(.mat-select-empty) .mat-select-arrow-wrapper{transform:translateY(-50%)}.mat-form-field-appearance-standard .mat-select.mat-select-empty .mat-select-arrow-wrapper{transition:transform 400ms cubic-bezier(0.25, 0.8, 0.25, 1)}._mat-animation-noopable.mat-form-field-appearance-standard .mat-select.mat-select-empty .mat-select-arrow-wrapper{transition:none}.mat-select-arrow{width:0;height:0;border-left:5px solid transparent;border-right:5px solid transparent;border-top:5px solid;margin:0 4px}.mat-select-panel-wrap{flex-basis:100%}.mat-select-panel{min-width:112px;max-width:280px;overflow:auto;-webkit-overflow-scrolling:touch;padding-top:0;padding-bottom:0;max-height:256px;min-width:100%;border-radius:4px}.cdk-high-contrast-active .mat-select-panel{outline:solid 1px}.mat-select-panel .mat-optgroup-label,.mat-select-panel .mat-option{font-size:inherit;line-height:3em;height:3em}.mat-form-field-type-mat-select:not(.mat-form-field-disabled) .mat-form-field-flex{cursor:pointer}.mat-form-field-type-mat-select .mat-form-field-label{width:calc(100% - 18px)}.mat-select-placeholder{transition:color 400ms 133.3333333333ms cubic-bezier(0.25, 0.8, 0.25, 1)}._mat-animation-noopable .mat-select-placeholder{transition:none}.mat-form-field-hide-placeholder .mat-select-placeholder{color:transparent;-webkit-text-fill-color:transparent;transition:none;display:block}\n"],encapsulation:2,data:{animation:[kw.transformPanelWrap,kw.transformPanel]},changeDetection:0}),t}(),Rw=function(){var t=function t(){y(this,t)};return t.\u0275mod=Le({type:t}),t.\u0275inj=It({factory:function(e){return new(e||t)},providers:[Ew],imports:[[jc,Rg,j_,s_],My,$k,j_,s_]}),t}(),Pw=["scrolllog"];function Dw(t,e){if(1&t){var n=Xa();Ka(0,"button",53),Ja("click",(function(){return Sn(n),os().connect()})),Ka(1,"mat-icon"),Is(2,"power"),Ga(),Ga()}2&t&&qa("disabled",os().locked)}function Fw(t,e){if(1&t){var n=Xa();Ka(0,"button",54),Ja("click",(function(){return Sn(n),os().disconnect()})),Ka(1,"mat-icon"),Is(2,"power"),Ga(),Ka(3,"mat-icon",55),Is(4,"block"),Ga(),Ga()}2&t&&qa("disabled",os().disabled)}function Nw(t,e){if(1&t){var n=Xa();Ka(0,"button",56),Ja("click",(function(){return Sn(n),os().fan(!0)})),Ka(1,"mat-icon"),Is(2,"toys"),Ga(),Ga()}2&t&&qa("disabled",os().totalDisabled)}function Mw(t,e){if(1&t){var n=Xa();Ka(0,"button",57),Ja("click",(function(){return Sn(n),os().fan(!1)})),Ka(1,"mat-icon"),Is(2,"toys"),Ga(),Ka(3,"mat-icon",55),Is(4,"block"),Ga(),Ga()}2&t&&qa("disabled",os().totalDisabled)}function Vw(t,e){if(1&t){var n=Xa();Ka(0,"button",58),Ja("click",(function(){return Sn(n),os().startEngrave()})),Ka(1,"mat-icon"),Is(2,"flash_on"),Ga(),Ga()}2&t&&qa("disabled",os().totalDisabled)}function Lw(t,e){if(1&t){var n=Xa();Ka(0,"button",59),Ja("click",(function(){return Sn(n),os().stopEngrave()})),Ka(1,"mat-icon"),Is(2,"flash_on"),Ga(),Ka(3,"mat-icon",55),Is(4,"block"),Ga(),Ga()}2&t&&qa("disabled",!os().status.engraving)}function jw(t,e){if(1&t){var n=Xa();Ka(0,"div",60),Ka(1,"mat-form-field",61),Ka(2,"input",62),Ja("ngModelChange",(function(t){return Sn(n),os().contrast=t}))("ngModelChange",(function(t){return Sn(n),os().contrastUpdate.next(t)})),Ga(),Ka(3,"mat-hint",63),Is(4,"Contrast"),Ga(),Ga(),Za(5,"div",47),Ka(6,"mat-form-field",61),Ka(7,"input",64),Ja("ngModelChange",(function(t){return Sn(n),os().brightness=t}))("ngModelChange",(function(t){return Sn(n),os().brightnessUpdate.next(t)})),Ga(),Ka(8,"mat-hint",63),Is(9,"Brightness"),Ga(),Ga(),Za(10,"div",47),Ka(11,"mat-form-field",75),Ka(12,"mat-select",76),Ja("valueChange",(function(t){return Sn(n),os().dither=t}))("selectionChange",(function(t){return Sn(n),os().ditherChanged(t)})),Ba(13,Yw,2,2,"mat-option",72),Ga(),Ga(),Za(14,"div",47),Ga()}if(2&t){var i=os();Lr(2),qa("ngModel",i.contrast),Lr(5),qa("ngModel",i.brightness),Lr(5),qa("disabled",i.disabled)("value",i.dither),Lr(1),qa("ngForOf",i.dithers)}}function Yw(t,e){if(1&t&&(Ka(0,"mat-option",74),Is(1),Ga()),2&t){var n=e.$implicit;qa("value",n.value),Lr(1),Ps(" ",n.name," ")}}function Bw(t,e){if(1&t){var n=Xa();Ka(0,"div",65),Ka(1,"image-upload",66),Ja("completed",(function(){return Sn(n),os().updateImage()})),Ga(),Ga()}if(2&t){var i=os();Lr(1),qa("disabled",i.disabled)("uploadURL","/image")}}function Hw(t,e){if(1&t){var n=Xa();Ka(0,"button",73),Ja("click",(function(){return Sn(n),os(2).text=""})),Ka(1,"mat-icon"),Is(2,"close"),Ga(),Ga()}}function zw(t,e){if(1&t&&(Ka(0,"mat-option",74),Is(1),Ga()),2&t){var n=e.$implicit;qa("value",n.file),Lr(1),Ps(" ",n.name," ")}}function Uw(t,e){if(1&t){var n=Xa();Ka(0,"div",60),Ka(1,"mat-form-field",67),Ka(2,"textarea",68),Ja("ngModelChange",(function(t){return Sn(n),os().text=t}))("ngModelChange",(function(t){return Sn(n),os().textUpdate.next(t)})),Ga(),Ba(3,Hw,3,0,"button",69),Ga(),Za(4,"div",47),Ka(5,"mat-form-field",70),Ka(6,"mat-select",71),Ja("valueChange",(function(t){return Sn(n),os().selectedFont=t}))("selectionChange",(function(t){return Sn(n),os().fontChanged(t)})),Ba(7,zw,2,2,"mat-option",72),Ga(),Ga(),Ga()}if(2&t){var i=os();Lr(2),qa("disabled",i.disabled)("ngModel",i.text),Lr(1),qa("ngIf",i.text),Lr(3),qa("disabled",i.disabled)("value",i.selectedFont),Lr(1),qa("ngForOf",i.fonts)}}function qw(t,e){if(1&t&&(Ka(0,"span"),Is(1),Za(2,"br"),Ga()),2&t){var n=e.$implicit;Lr(1),Rs(n)}}var Ww=function(){function t(t,e){this.service=t,this.bottomSheet=e,this.version="",this.locked=!1,this.disabled=!0,this.totalDisabled=!0,this.status=new Mm,this.log=[],this.moveDistance=1,this.power=100,this.depth=10,this.contrast=0,this.brightness=0,this.mode="image",this.text="Hello world!",this.useCenter=!1,this.xyCenter=[],this.xyCenterSaved="",this.widthUpdate=new z,this.heightUpdate=new z,this.textUpdate=new z,this.contrastUpdate=new z,this.brightnessUpdate=new z,this.rotationArray=["","ccw","turn","cw"],this.rotation=0,this.mirrorArray=["","tb","lr","tb lr"],this.mirror=0,this.fonts=[],this.selectedFont="",this.dithers=[{value:"floyd",name:"Floyd-Steinberg"},{value:"bayer",name:"Bayer"},{value:"bluenoise",name:"Blue noise"},{value:"threshold",name:"Threshold"}],this.dither="floyd",this.progressPat=/^\r(sending:)? *(1?[0-9]?[0-9])% done$/,this.pxPerMm=500/25.4,this.debounceTime=750,this.width=250,this.height=250}return t.prototype.ngAfterViewInit=function(){var t=this;this.widthUpdate.pipe(Bm(this.debounceTime),qm()).subscribe((function(e){return t.updateImage()})),this.heightUpdate.pipe(Bm(this.debounceTime),qm()).subscribe((function(e){return t.updateImage()})),this.textUpdate.pipe(Bm(this.debounceTime),qm()).subscribe((function(e){return t.updateImage()})),this.contrastUpdate.pipe(Bm(this.debounceTime),qm()).subscribe((function(e){return t.updateImage()})),this.brightnessUpdate.pipe(Bm(this.debounceTime),qm()).subscribe((function(e){return t.updateImage()})),this.scrollContainer=this.scrollFrame.nativeElement,this.updateImage(),this.connect()},t.prototype.scrollToBottom=function(){this.scrollContainer.scroll({top:this.scrollContainer.scrollHeight,left:0,behavior:"smooth"})},t.prototype.updateFontList=function(t){""==this.selectedFont&&t.length>0&&(this.selectedFont=t[0].file),this.fonts=t},t.prototype.ngOnInit=function(){var t=this;this.mode="image",this.service.receive((function(e){return t.messageHandler(e)}),(function(e){return t.statusHandler(e)}),(function(e){return t.commandHandler(e)})),this.retrieveStatus(),this.service.fonts().then((function(e){return t.updateFontList(e)}))},t.prototype.commandHandler=function(t){},t.prototype.statusHandler=function(t){this.version=t.version,this.locked=!1,this.status=t,this.disabled=t.engraving||t.framing,this.totalDisabled=!t.connected||this.disabled,this.disabled||this.imageDisplay.displayProgress(null,null)},t.prototype.messageHandler=function(t){var e=this,n=this.progressPat.exec(t.content);n?this.imageDisplay.displayProgress(+n[2]/100,n[1]?"transfer":"engrave"):(this.log.push("["+t.severity+"] "+t.content),setTimeout((function(){return e.scrollToBottom()}),10))},t.prototype.send=function(t){this.locked=!0,this.disabled=!0,this.service.send(t)},t.prototype.textSelected=function(){this.updateImage()},t.prototype.imageSelected=function(){this.updateImage()},t.prototype.updateImage=function(){var t;t="image"==this.mode?"/image?width="+this.width+"&height="+this.height+"&trf="+this.transformation()+"&contrast="+this.contrast+"&brightness="+this.brightness+"&dither="+this.dither:"/textimage?text="+encodeURIComponent(this.text)+"&width="+this.width+"&height="+this.height+"&font="+this.selectedFont+"&trf="+this.transformation()+"&dither="+this.dither,console.log("src="+t),this.imageDisplay.loadImage(t)},t.prototype.fontChanged=function(){this.updateImage()},t.prototype.ditherChanged=function(){this.updateImage()},t.prototype.transformation=function(){return(this.rotationArray[this.rotation]+" "+this.mirrorArray[this.mirror]).trim()},t.prototype.rotateClicked=function(t){this.rotation=(this.rotation+t+4)%4,this.updateImage()},t.prototype.mirrorClicked=function(t){this.mirror^=t,this.updateImage()},t.prototype.click=function(t){console.log(t)},t.prototype.retrieveStatus=function(){this.send({cmd:"status"})},t.prototype.fan=function(t){this.send({cmd:"fan",args:{on:t}})},t.prototype.home=function(){this.send({cmd:"home"})},t.prototype.connect=function(){this.send({cmd:"connect"})},t.prototype.disconnect=function(){this.send({cmd:"disconnect"})},t.prototype.moveRight=function(){this.send({cmd:"move",args:{dx:Math.round(this.moveDistance*this.pxPerMm),dy:0}})},t.prototype.moveLeft=function(){this.send({cmd:"move",args:{dx:Math.round(-this.moveDistance*this.pxPerMm),dy:0}})},t.prototype.moveDown=function(){this.send({cmd:"move",args:{dx:0,dy:Math.round(this.moveDistance*this.pxPerMm)}})},t.prototype.moveUp=function(){this.send({cmd:"move",args:{dx:0,dy:Math.round(-this.moveDistance*this.pxPerMm)}})},t.prototype.frame=function(){var t={fx:this.imageDisplay.imageWidth,fy:this.imageDisplay.imageHeight,useCenter:this.useCenter,centerAxis:this.xyCenterSaved};console.log(t),null!=this.xyCenter[0]?(this.xyCenterSaved=this.xyCenter[0],this.send({cmd:"frameStart",args:t})):(this.send({cmd:"frameStop",args:t}),this.xyCenterSaved=null)},t.prototype.startEngrave=function(){this.fan(!0);var t={cmd:"engrave",args:{mode:this.mode,useCenter:this.useCenter,trf:this.transformation(),width:this.width,height:this.height,power:this.power,depth:this.depth}};this.send(t)},t.prototype.stopEngrave=function(){this.send({cmd:"stopEngraving",args:{}})},t.\u0275fac=function(e){return new(e||t)(za(Lm),za(fb))},t.\u0275cmp=Fe({type:t,selectors:[["app-root"]],viewQuery:function(t,e){var n;1&t&&(il(Pw,!0),il(Ym,!0)),2&t&&(el(n=ul())&&(e.scrollFrame=n.first),el(n=ul())&&(e.imageDisplay=n.first))},inputs:{debounceTime:"debounceTime"},decls:128,vars:53,consts:[[1,"flow"],[1,"block","padded"],[2,"padding","8px"],["mat-raised-button","","class","icon-button","title","Connect to engraver",3,"disabled","click",4,"ngIf"],["mat-raised-button","","class","icon-button","title","Disconnect from engraver",3,"disabled","click",4,"ngIf"],["mat-raised-button","","class","icon-button","title","Switch fan on",3,"disabled","click",4,"ngIf"],["mat-raised-button","","class","icon-button","title","Switch fan off",3,"disabled","click",4,"ngIf"],[2,"width","360px","height","170px"],["cols","6","rows","3",3,"gutterSize"],["mat-raised-button","","title","Move to origin",1,"icon-button",3,"disabled","click"],["mat-raised-button","",1,"icon-button",3,"disabled","title","click"],[1,"b-left"],["multiple","",3,"ngModel","ngModelChange","change"],["title","Preview y-axis",1,"icon-button",3,"disabled","value"],["title","Preview x-axis",1,"icon-button",3,"disabled","value"],[2,"transform","rotate(90deg)"],["title","Preview frame",1,"icon-button",3,"disabled","value"],[1,"size-sm"],["matInput","","type","number","min","0.1","max","10","step","0.1","title","Distance to move on click",1,"distance",3,"ngModel","ngModelChange"],["align","end"],["colspan","2",1,"b-left","b-top"],[1,"size-m"],["matInput","","type","number","min","1","max","100","step","1","title","Laser power (1-100)",1,"distance",3,"ngModel","ngModelChange"],["align","start"],[1,"b-top"],["mat-raised-button","","class","icon-button","title","Start engraving",3,"disabled","click",4,"ngIf"],["mat-raised-button","","class","icon-button","title","Stop engraving",3,"disabled","click",4,"ngIf"],["colspan","2",1,"b-left"],["matInput","","type","number","min","1","max","100","step","1","title","Engraving Depth (1-100)",1,"distance",3,"ngModel","ngModelChange"],[1,"separator","padded"],[2,"display","flex"],[2,"width","92px","height","186px"],["cols","1","rows","4","rowHeight","2:1",3,"gutterSize"],[3,"ngModel","ngModelChange"],["title","Image","value","image",1,"icon-button",3,"disabled","change"],["title","Text","value","text",1,"icon-button",3,"disabled","change"],["title","Use top-left as reference",1,"icon-button",3,"disabled","value"],[2,"transform","scale(-1,1)"],["title","Use center as reference",1,"icon-button",3,"disabled","value"],["mat-raised-button","","title","Rotate ccw",1,"icon-button",3,"disabled","click"],["mat-raised-button","","title","Rotate cw",1,"icon-button",3,"disabled","click"],["mat-raised-button","","title","Mirror vertical",1,"icon-button",3,"disabled","click"],["mat-raised-button","","title","Mirror horizontal",1,"icon-button",3,"disabled","click"],["class","inline",4,"ngIf"],["class","upload inline",4,"ngIf"],[1,"inline","spacing"],[3,"label","pxPerMm","value","valueChange"],[1,"spacer"],[1,"spacing"],[3,"center"],["id","log"],["scrolllog",""],[4,"ngFor","ngForOf"],["mat-raised-button","","title","Connect to engraver",1,"icon-button",3,"disabled","click"],["mat-raised-button","","title","Disconnect from engraver",1,"icon-button",3,"disabled","click"],[1,"over"],["mat-raised-button","","title","Switch fan on",1,"icon-button",3,"disabled","click"],["mat-raised-button","","title","Switch fan off",1,"icon-button",3,"disabled","click"],["mat-raised-button","","title","Start engraving",1,"icon-button",3,"disabled","click"],["mat-raised-button","","title","Stop engraving",1,"icon-button",3,"disabled","click"],[1,"inline"],[1,"numeric-field"],["matInput","","ngDefaultControl","","type","number","min","-10","max","10","step","0.1","title","Contrast between -10 and 10","ngDefaultControl","",1,"numericinput",3,"ngModel","ngModelChange"],["align","start",1,"numerichint"],["matInput","","ngDefaultControl","","type","number","min","-10","max","10","step","0.1","title","Brightness between -10 and 10","ngDefaultControl","",1,"numericinput",3,"ngModel","ngModelChange"],[1,"upload","inline"],[3,"disabled","uploadURL","completed"],[1,"nopadding",2,"width","480px"],["matInput","",1,"text-input",3,"disabled","ngModel","ngModelChange"],["mat-button","","matSuffix","","mat-icon-button","","aria-label","Clear",3,"click",4,"ngIf"],[1,"nopadding",2,"width","320px"],[3,"disabled","value","valueChange","selectionChange"],[3,"value",4,"ngFor","ngForOf"],["mat-button","","matSuffix","","mat-icon-button","","aria-label","Clear",3,"click"],[3,"value"],[1,"nopadding",2,"width","200px"],["title","Dithering algorithm",3,"disabled","value","valueChange","selectionChange"]],template:function(t,e){1&t&&(Ka(0,"mat-card"),Ka(1,"mat-card-header"),Ka(2,"mat-card-title"),Is(3),Ga(),Ga(),Ka(4,"mat-card-content"),Ka(5,"div",0),Ka(6,"div",1),Ka(7,"div",2),Ba(8,Dw,3,1,"button",3),Ba(9,Fw,5,1,"button",4),Ba(10,Nw,3,1,"button",5),Ba(11,Mw,5,1,"button",6),Ga(),Ka(12,"div",7),Ka(13,"div"),Ka(14,"mat-grid-list",8),Ka(15,"mat-grid-tile"),Ka(16,"button",9),Ja("click",(function(){return e.home()})),Ka(17,"mat-icon"),Is(18,"home"),Ga(),Ga(),Ga(),Ka(19,"mat-grid-tile"),Ka(20,"button",10),Ja("click",(function(){return e.moveUp()})),Ka(21,"mat-icon"),Is(22,"expand_less"),Ga(),Ga(),Ga(),Za(23,"mat-grid-tile"),Ka(24,"mat-grid-tile",11),Ka(25,"mat-button-toggle-group",12),Ja("ngModelChange",(function(t){return e.xyCenter=t}))("change",(function(){return e.frame()})),Ka(26,"mat-button-toggle",13),Ka(27,"mat-icon"),Is(28,"settings_ethernet"),Ga(),Ga(),Ga(),Ga(),Ka(29,"mat-grid-tile"),Ka(30,"mat-button-toggle-group",12),Ja("ngModelChange",(function(t){return e.xyCenter=t}))("change",(function(){return e.frame()})),Ka(31,"mat-button-toggle",14),Ka(32,"mat-icon",15),Is(33,"settings_ethernet"),Ga(),Ga(),Ga(),Ga(),Ka(34,"mat-grid-tile"),Ka(35,"mat-button-toggle-group",12),Ja("ngModelChange",(function(t){return e.xyCenter=t}))("change",(function(){return e.frame()})),Ka(36,"mat-button-toggle",16),Ka(37,"mat-icon"),Is(38,"crop_din"),Ga(),Ga(),Ga(),Ga(),Ka(39,"mat-grid-tile"),Ka(40,"button",10),Ja("click",(function(){return e.moveLeft()})),Ka(41,"mat-icon"),Is(42,"chevron_left"),Ga(),Ga(),Ga(),Ka(43,"mat-grid-tile"),Ka(44,"mat-form-field",17),Ka(45,"input",18),Ja("ngModelChange",(function(t){return e.moveDistance=t})),Ga(),Ka(46,"mat-hint",19),Is(47,"mm "),Ga(),Ga(),Ga(),Ka(48,"mat-grid-tile"),Ka(49,"button",10),Ja("click",(function(){return e.moveRight()})),Ka(50,"mat-icon"),Is(51,"chevron_right"),Ga(),Ga(),Ga(),Ka(52,"mat-grid-tile",20),Ka(53,"mat-form-field",21),Ka(54,"input",22),Ja("ngModelChange",(function(t){return e.power=t})),Ga(),Ka(55,"mat-hint",23),Is(56,"Laser Power "),Ga(),Ga(),Ga(),Ka(57,"mat-grid-tile",24),Ba(58,Vw,3,1,"button",25),Ba(59,Lw,5,1,"button",26),Ga(),Za(60,"mat-grid-tile"),Ka(61,"mat-grid-tile"),Ka(62,"button",10),Ja("click",(function(){return e.moveDown()})),Ka(63,"mat-icon"),Is(64,"expand_more"),Ga(),Ga(),Ga(),Za(65,"mat-grid-tile"),Ka(66,"mat-grid-tile",27),Ka(67,"mat-form-field",21),Ka(68,"input",28),Ja("ngModelChange",(function(t){return e.depth=t})),Ga(),Ka(69,"mat-hint",23),Is(70,"Depth"),Ga(),Ga(),Ga(),Za(71,"mat-grid-tile"),Ga(),Ga(),Ga(),Ga(),Ka(72,"div",29),Ka(73,"div",30),Ka(74,"div",31),Ka(75,"mat-grid-list",32),Ka(76,"mat-grid-tile"),Ka(77,"mat-button-toggle-group",33),Ja("ngModelChange",(function(t){return e.mode=t})),Ka(78,"mat-button-toggle",34),Ja("change",(function(){return e.imageSelected()})),Ka(79,"mat-icon"),Is(80,"image"),Ga(),Ga(),Ka(81,"mat-button-toggle",35),Ja("change",(function(){return e.textSelected()})),Ka(82,"mat-icon"),Is(83,"title"),Ga(),Ga(),Ga(),Ga(),Ka(84,"mat-grid-tile"),Ka(85,"mat-button-toggle-group",33),Ja("ngModelChange",(function(t){return e.useCenter=t})),Ka(86,"mat-button-toggle",36),Ka(87,"mat-icon",37),Is(88,"open_in_new"),Ga(),Ga(),Ka(89,"mat-button-toggle",38),Ka(90,"mat-icon"),Is(91,"filter_center_focus"),Ga(),Ga(),Ga(),Ga(),Ka(92,"mat-grid-tile"),Ka(93,"button",39),Ja("click",(function(){return e.rotateClicked(1)})),Ka(94,"mat-icon"),Is(95,"rotate_left"),Ga(),Ga(),Ka(96,"button",40),Ja("click",(function(){return e.rotateClicked(-1)})),Ka(97,"mat-icon"),Is(98,"rotate_right"),Ga(),Ga(),Ga(),Ka(99,"mat-grid-tile"),Ka(100,"button",41),Ja("click",(function(){return e.mirrorClicked(1)})),Ka(101,"mat-icon"),Is(102,"swap_vert"),Ga(),Ga(),Ka(103,"button",42),Ja("click",(function(){return e.mirrorClicked(2)})),Ka(104,"mat-icon"),Is(105,"swap_horiz"),Ga(),Ga(),Ga(),Ga(),Ga(),Ka(106,"div"),Ba(107,jw,15,5,"div",43),Ba(108,Bw,2,2,"div",44),Ba(109,Uw,8,6,"div",43),Ga(),Ga(),Ka(110,"div"),Ka(111,"div",45),Ka(112,"size-input",46),Ja("valueChange",(function(t){return e.width=t}))("valueChange",(function(t){return e.widthUpdate.next(t)})),Ga(),Ga(),Za(113,"div",47),Ka(114,"div",45),Ka(115,"size-input",46),Ja("valueChange",(function(t){return e.height=t}))("valueChange",(function(t){return e.heightUpdate.next(t)})),Ga(),Ga(),Ga(),Ga(),Ga(),Ga(),Ga(),Ka(116,"mat-card"),Ka(117,"mat-card-content"),Ka(118,"div",48),Za(119,"image-display",49),Ga(),Ga(),Ga(),Ka(120,"mat-card"),Ka(121,"mat-card-header"),Ka(122,"mat-card-title"),Is(123,"Messages"),Ga(),Ga(),Ka(124,"mat-card-content"),Ka(125,"div",50,51),Ba(127,qw,3,1,"span",52),Ga(),Ga(),Ga()),2&t&&(Lr(3),Ps("KKEngraver ",e.version,""),Lr(5),qa("ngIf",!e.status.connected),Lr(1),qa("ngIf",e.status.connected),Lr(1),qa("ngIf",!e.status.fanOn),Lr(1),qa("ngIf",e.status.fanOn),Lr(3),qa("gutterSize",0),Lr(2),qa("disabled",e.totalDisabled),Lr(4),cs("title","Move y-axis -",e.moveDistance," mm"),qa("disabled",e.totalDisabled),Lr(5),qa("ngModel",e.xyCenter),Lr(1),qa("disabled",e.totalDisabled&&"y"!=e.xyCenterSaved)("value","y"),Lr(4),qa("ngModel",e.xyCenter),Lr(1),qa("disabled",e.totalDisabled&&"x"!=e.xyCenterSaved)("value","x"),Lr(4),qa("ngModel",e.xyCenter),Lr(1),qa("disabled",e.totalDisabled&&""!=e.xyCenterSaved)("value",""),Lr(4),cs("title","Move x-axis -",e.moveDistance," mm"),qa("disabled",e.totalDisabled),Lr(5),qa("ngModel",e.moveDistance),Lr(4),cs("title","Move x-axis ",e.moveDistance," mm"),qa("disabled",e.totalDisabled),Lr(5),qa("ngModel",e.power),Lr(4),qa("ngIf",!e.status.engraving),Lr(1),qa("ngIf",e.status.engraving),Lr(3),cs("title","y-axis ",e.moveDistance," mm"),qa("disabled",e.totalDisabled),Lr(6),qa("ngModel",e.depth),Lr(7),qa("gutterSize",0),Lr(2),qa("ngModel",e.mode),Lr(1),qa("disabled",e.disabled),Lr(3),qa("disabled",e.disabled),Lr(4),qa("ngModel",e.useCenter),Lr(1),qa("disabled",e.disabled)("value",!1),Lr(3),qa("disabled",e.disabled)("value",!0),Lr(4),qa("disabled",e.disabled),Lr(3),qa("disabled",e.disabled),Lr(4),qa("disabled",e.disabled),Lr(3),qa("disabled",e.disabled),Lr(4),qa("ngIf","image"==e.mode),Lr(1),qa("ngIf","image"==e.mode),Lr(1),qa("ngIf","text"==e.mode),Lr(3),qa("label","max. Width")("pxPerMm",e.pxPerMm)("value",e.width),Lr(3),qa("label","max. Height")("pxPerMm",e.pxPerMm)("value",e.height),Lr(4),qa("center",e.useCenter),Lr(8),qa("ngForOf",e.log))},directives:[_b,bb,gb,yb,Rc,Nb,xb,Hb,ak,vk,cv,om,yk,Xk,aw,Cv,rv,Hk,uw,Ym,Oc,hw,Iw,Kk,V_],styles:[""]}),t}(),Kw=function(){var t=function t(){y(this,t)};return t.\u0275mod=Le({type:t}),t.\u0275inj=It({factory:function(e){return new(e||t)},imports:[[s_],s_]}),t}(),Gw=function(){var t=function t(){y(this,t)};return t.\u0275mod=Le({type:t}),t.\u0275inj=It({factory:function(e){return new(e||t)},imports:[[jc,s_],s_]}),t}(),Zw=function(){function t(){}return t.\u0275mod=Le({type:t,bootstrap:[Ww]}),t.\u0275inj=It({factory:function(e){return new(e||t)},providers:[Lm,{provide:C_,useValue:{disabled:!0}}],imports:[[yh,fp,zb,kb,Kw,Mb,sk,gk,Gw,sw,lb,lm,Rw,Yp]]}),t}();
 /**
  * @license
  * Copyright Google LLC All Rights Reserved.